@@ -36,6 +36,8 @@ export async function GET(
     // URL에서 language 파라미터 추출
     const { searchParams } = new URL(request.url);
     const language = searchParams.get('language') || 'ko';
+    // include=translations 이면 모든 언어의 번역을 함께 반환 (레시피 수정 시 증분 번역용)
+    const includeTranslations = searchParams.get('include') === 'translations';
 
     if (isNaN(recipeIdNum)) {
       return NextResponse.json({ error: "Invalid recipe ID" }, { status: 400 });
@@ -133,6 +135,14 @@ export async function GET(
       }
     }
 
+    if (includeTranslations) {
+      const translations = await db
+        .select()
+        .from(recipeTranslations)
+        .where(eq(recipeTranslations.recipeId, recipeIdNum));
+      return NextResponse.json({ ...response, translations });
+    }
+
     return NextResponse.json(response);
   } catch (error) {
     console.error("[RECIPE_GET]", error);
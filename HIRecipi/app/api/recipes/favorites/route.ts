@@ -3,7 +3,7 @@ import { NextResponse, NextRequest } from 'next/server';
 import { db } from '@/db';
 import { recipes, recipeFavorites, recipeTranslations } from '@/db/schema';
 import { desc, eq, and, sql } from 'drizzle-orm';
-import { getUserId } from '../../refrigerators/utils';
+import { getUserId, MAX_PAGE_SIZE } from '../../refrigerators/utils';
 
 const PAGE_SIZE = 12;
 
@@ -18,7 +18,9 @@ export async function GET(request: NextRequest) {
     // Get page from query params
     const { searchParams } = new URL(request.url);
     const page = parseInt(searchParams.get('page') || '1');
-    const offset = (page - 1) * PAGE_SIZE;
+    // limit 으로 페이지 크기를 줄이거나 늘릴 수 있습니다. (AI 백엔드 목록 도구)
+    const pageSize = Math.min(Math.max(parseInt(searchParams.get('limit') || '') || PAGE_SIZE, 1), MAX_PAGE_SIZE);
+    const offset = (page - 1) * pageSize;
 
     // 즐겨찾기한 레시피 목록 조회
     const favoriteRecipes = await db
@@ -39,7 +41,7 @@ export async function GET(request: NextRequest) {
         )
       )
       .orderBy(desc(recipes.createdAt))
-      .limit(PAGE_SIZE)
+      .limit(pageSize)
       .offset(offset);
 
     // 각 레시피의 번역 정보 조회
@@ -79,9 +81,9 @@ export async function GET(request: NextRequest) {
       recipes: recipesWithTranslations,
       pagination: {
         total: count,
-        pageSize: PAGE_SIZE,
+        pageSize,
         currentPage: page,
-        totalPages: Math.ceil(count / PAGE_SIZE),
+        totalPages: Math.ceil(count / pageSize),
       },
     });
   } catch (error) {
@@ -5,6 +5,7 @@ import { recipes, recipeTags, recipeTranslations, tags, tagTranslations, recipes
 import { desc, eq, sql, and, inArray } from 'drizzle-orm';
 import { z } from 'zod';
 import OpenAI from 'openai';
+import { getListPage } from '../refrigerators/utils';
 
 const INTERNAL_API_KEY = process.env.INTERNAL_API_KEY;
 
@@ -61,6 +62,8 @@ export async function GET(request: NextRequest) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
     }
 
+    const listPage = getListPage(new URL(request.url).searchParams);
+
     const userRecipes = await db.query.recipes.findMany({
       where: eq(recipes.ownerId, userId),
       with: {
@@ -76,8 +79,19 @@ export async function GET(request: NextRequest) {
         }
       },
       orderBy: [desc(recipes.createdAt)],
+      // 다음 페이지가 있는지 확인하기 위해 하나 더 조회
+      ...(listPage && { limit: listPage.limit + 1, offset: listPage.offset }),
     });
 
+    // limit 을 지정하면 한 페이지와 다음 페이지 커서를 반환
+    if (listPage) {
+      const hasMore = userRecipes.length > listPage.limit;
+      return NextResponse.json({
+        recipes: userRecipes.slice(0, listPage.limit),
+        nextCursor: hasMore ? String(listPage.offset + listPage.limit) : null,
+      });
+    }
+
     return NextResponse.json(userRecipes);
   } catch (error) {
     console.error("[RECIPES_GET]", error);
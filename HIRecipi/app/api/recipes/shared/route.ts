@@ -3,7 +3,7 @@ import { NextResponse, NextRequest } from 'next/server';
 import { db } from '@/db';
 import { recipes, recipeFavorites, recipeTranslations } from '@/db/schema';
 import { desc, eq, sql, and } from 'drizzle-orm';
-import { getUserId } from '../../refrigerators/utils';
+import { getUserId, MAX_PAGE_SIZE } from '../../refrigerators/utils';
 import { Language } from '@/types';
 
 const PAGE_SIZE = 12;
@@ -19,8 +19,10 @@ export async function GET(request: NextRequest) {
     // Get page and language from query params
     const { searchParams } = new URL(request.url);
     const page = parseInt(searchParams.get('page') || '1');
+    // limit 으로 페이지 크기를 줄이거나 늘릴 수 있습니다. (AI 백엔드 목록 도구)
+    const pageSize = Math.min(Math.max(parseInt(searchParams.get('limit') || '') || PAGE_SIZE, 1), MAX_PAGE_SIZE);
     const language = (searchParams.get('language') || 'en') as Language;
-    const offset = (page - 1) * PAGE_SIZE;
+    const offset = (page - 1) * pageSize;
 
     // 공유된 레시피 목록 조회 (번역 포함)
     const result = await db
@@ -57,7 +59,7 @@ export async function GET(request: NextRequest) {
       )
       .where(eq(recipes.isPublic, true))
       .orderBy(desc(recipes.createdAt))
-      .limit(PAGE_SIZE)
+      .limit(pageSize)
       .offset(offset);
 
     // 번역이 없는 레시피에 대해 다른 언어의 번역 찾기
@@ -118,9 +120,9 @@ export async function GET(request: NextRequest) {
       recipes: recipesWithTranslations,
       pagination: {
         total: count,
-        pageSize: PAGE_SIZE,
+        pageSize,
         currentPage: page,
-        totalPages: Math.ceil(count / PAGE_SIZE),
+        totalPages: Math.ceil(count / pageSize),
       },
     });
   } catch (error) {
@@ -3,7 +3,7 @@ import { db } from '@/db';
 import { refrigerators, refrigeratorMembers, refrigeratorIngredients, users } from '@/db/schema';
 import { eq, sql } from 'drizzle-orm';
 import { z } from 'zod';
-import { getUserId } from './utils';
+import { getUserId, getListPage } from './utils';
 import { currentUser } from '@clerk/nextjs/server';
 
 
@@ -15,6 +15,8 @@ export async function GET(request: NextRequest) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
     }
 
+    const listPage = getListPage(new URL(request.url).searchParams);
+
     // 냉장고 목록 조회 (멤버 수와 재료 수를 포함)
     const refrigeratorList = await db.query.refrigerators.findMany({
       where: eq(refrigerators.ownerId, userId),
@@ -23,6 +25,8 @@ export async function GET(request: NextRequest) {
         ingredients: true,
       },
       orderBy: [sql`${refrigerators.updatedAt} DESC`],
+      // 다음 페이지가 있는지 확인하기 위해 하나 더 조회
+      ...(listPage && { limit: listPage.limit + 1, offset: listPage.offset }),
     });
 
     // 응답 데이터 가공
@@ -39,6 +43,15 @@ export async function GET(request: NextRequest) {
       updatedAt: refrigerator.updatedAt,
     }));
 
+    // limit 을 지정하면 한 페이지와 다음 페이지 커서를 반환
+    if (listPage) {
+      const hasMore = formattedRefrigerators.length > listPage.limit;
+      return NextResponse.json({
+        refrigerators: formattedRefrigerators.slice(0, listPage.limit),
+        nextCursor: hasMore ? String(listPage.offset + listPage.limit) : null,
+      });
+    }
+
     return NextResponse.json(formattedRefrigerators);
   } catch (error) {
     console.error("[REFRIGERATORS_GET]", error);
@@ -17,4 +17,18 @@ export async function getUserId(request: NextRequest): Promise<string | null> {
   // 2. 일반 사용자 인증
   const { userId } = await getAuth(request);
   return userId;
-} 
\ No newline at end of file
+} 
+
+// 목록 조회 한 페이지 최대 크기
+export const MAX_PAGE_SIZE = 50;
+
+// 목록 조회 페이지 파라미터 (limit 이 없으면 null: 전체 조회)
+// cursor 는 이전 응답의 nextCursor 값입니다.
+export function getListPage(searchParams: URLSearchParams): { limit: number; offset: number } | null {
+  const limit = parseInt(searchParams.get('limit') || '');
+  if (isNaN(limit) || limit < 1) {
+    return null;
+  }
+  const offset = parseInt(searchParams.get('cursor') || '0');
+  return { limit: Math.min(limit, MAX_PAGE_SIZE), offset: isNaN(offset) || offset < 0 ? 0 : offset };
+}
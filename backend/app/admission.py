@@ -0,0 +1,224 @@
+"""
+API 요청 수용 제어(admission control)와 부하 차단입니다.
+
+엔드포인트 분류(chat, recipe)마다
+- 동시에 처리하는 요청 수(max_inflight)에 상한을 두고,
+- 넘치는 요청은 길이 제한이 있는 대기열에서 queue_timeout 까지만 기다리게 하며,
+- 대기열이 가득 찼거나 시간이 지나면 429 + Retry-After 로 바로 거절합니다.
+대기열은 사용자별로 나뉘어 있고 빈 자리가 나면 사용자를 돌아가며(round-robin) 하나씩 들여보냅니다.
+또한 사용자 한 명이 동시에 쓸 수 있는 자리(max_per_user)를 제한해, 요청을 몰아 보내는
+사용자가 다른 사용자를 굶기지 않게 합니다.
+
+트래픽이 몰릴 때 모든 요청이 함께 느려지는 대신, 일부를 빨리 거절해 나머지의 응답 시간을 지킵니다.
+
+환경 변수 (<CLASS> 는 CHAT, RECIPE)
+- ADMISSION_<CLASS>_MAX_INFLIGHT: 동시 처리 상한 (기본 chat 32, recipe 16)
+- ADMISSION_<CLASS>_MAX_QUEUE: 대기열 길이 상한 (기본 chat 64, recipe 32)
+- ADMISSION_<CLASS>_QUEUE_TIMEOUT: 대기 시간 상한 (초, 기본 chat 5, recipe 10)
+- ADMISSION_<CLASS>_MAX_PER_USER: 사용자별 동시 처리 상한 (기본 chat 4, recipe 2)
+- ADMISSION_<CLASS>_MAX_QUEUE_PER_USER: 사용자별 대기 상한 (기본 chat 8, recipe 4)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from starlette.requests import Request
+
+from .deadlines import STAGE_ADMISSION_QUEUE, Deadline
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트 분류별 기본값: (max_inflight, max_queue, queue_timeout, max_per_user, max_queue_per_user)
+_DEFAULTS = {
+    "chat": (32, 64, 5.0, 4, 8),
+    "recipe": (16, 32, 10.0, 2, 4),
+}
+
+
+class AdmissionRejected(Exception):
+    """요청을 받아들일 수 없을 때 발생하는 예외 (429)"""
+
+    def __init__(self, message: str, endpoint: str, reason: str, retry_after: float):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def client_key(request: Request) -> str:
+    """사용자 식별 키 (x-user-id 헤더 → 프록시가 붙인 클라이언트 IP → 연결 IP 순)"""
+    user_id = request.headers.get("x-user-id")
+    if user_id:
+        return f"user:{user_id}"
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class AdmissionQueue:
+    """엔드포인트 분류 하나의 동시 처리 슬롯과 사용자별 공정 대기열 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(
+        self,
+        name: str,
+        max_inflight: int,
+        max_queue: int,
+        queue_timeout: float,
+        max_per_user: int,
+        max_queue_per_user: int,
+    ):
+        self.name = name
+        self.max_inflight = max(1, max_inflight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.max_per_user = max(1, max_per_user)
+        self.max_queue_per_user = max(0, max_queue_per_user)
+        self.inflight = 0
+        self.queued = 0
+        self._user_inflight: Counter = Counter()
+        # 사용자별 대기 중인 future (삽입 순서가 round-robin 순서)
+        self._waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        # 요청 처리 시간 지수 이동 평균 (Retry-After 추정용)
+        self._service_time = 1.0
+
+    @classmethod
+    def from_env(cls, name: str) -> "AdmissionQueue":
+        max_inflight, max_queue, queue_timeout, max_per_user, max_queue_per_user = _DEFAULTS[name]
+        prefix = f"ADMISSION_{name.upper()}_"
+        return cls(
+            name,
+            max_inflight=int(os.getenv(prefix + "MAX_INFLIGHT", str(max_inflight))),
+            max_queue=int(os.getenv(prefix + "MAX_QUEUE", str(max_queue))),
+            queue_timeout=float(os.getenv(prefix + "QUEUE_TIMEOUT", str(queue_timeout))),
+            max_per_user=int(os.getenv(prefix + "MAX_PER_USER", str(max_per_user))),
+            max_queue_per_user=int(os.getenv(prefix + "MAX_QUEUE_PER_USER", str(max_queue_per_user))),
+        )
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("admission_inflight", self.inflight, endpoint=self.name)
+        metrics.set_gauge("admission_queue_depth", self.queued, endpoint=self.name)
+        metrics.set_gauge("admission_queue_users", len(self._waiting), endpoint=self.name)
+
+    def retry_after(self) -> float:
+        """지금 대기열이 모두 처리될 때까지의 추정 시간 (초)"""
+        return max(1.0, self._service_time * (self.queued + 1) / self.max_inflight)
+
+    def _reject(self, reason: str, message: str) -> AdmissionRejected:
+        metrics.increment("admission_rejected_total", endpoint=self.name, reason=reason)
+        logger.warning(f"[{self.name}] 요청 거절 ({reason}): 처리 중 {self.inflight}, 대기 {self.queued}")
+        return AdmissionRejected(message, self.name, reason, self.retry_after())
+
+    def _can_start(self, user: str) -> bool:
+        return self.inflight < self.max_inflight and self._user_inflight[user] < self.max_per_user
+
+    def _start(self, user: str) -> None:
+        self.inflight += 1
+        self._user_inflight[user] += 1
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 대기 중인 사용자에게 돌아가며 배정합니다."""
+        while self.inflight < self.max_inflight and self._waiting:
+            for user in list(self._waiting):
+                if self._user_inflight[user] < self.max_per_user:
+                    break
+            else:
+                return  # 대기 중인 사용자가 모두 사용자별 상한에 걸려 있음
+            waiters = self._waiting.pop(user)
+            future = waiters.popleft()
+            self.queued -= 1
+            if waiters:
+                self._waiting[user] = waiters  # 다음 차례는 맨 뒤로
+            self._start(user)
+            future.set_result(None)
+
+    def _remove_waiter(self, user: str, future: asyncio.Future) -> None:
+        waiters = self._waiting.get(user)
+        if waiters is not None and future in waiters:
+            waiters.remove(future)
+            self.queued -= 1
+            if not waiters:
+                del self._waiting[user]
+
+    def _release(self, user: str, started: float) -> None:
+        self.inflight -= 1
+        self._user_inflight[user] -= 1
+        if self._user_inflight[user] <= 0:
+            del self._user_inflight[user]
+        self._service_time = 0.8 * self._service_time + 0.2 * (time.monotonic() - started)
+        self._dispatch()
+        self._update_gauges()
+
+    async def _wait_turn(self, user: str, deadline: Optional[Deadline]) -> float:
+        """대기열에서 차례를 기다리고 기다린 시간을 반환합니다."""
+        if self.queued >= self.max_queue:
+            raise self._reject("queue_full", "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+        if len(self._waiting.get(user, ())) >= self.max_queue_per_user:
+            raise self._reject("user_queue_full", "처리 중인 요청이 많습니다. 이전 요청이 끝난 뒤 다시 시도해주세요.")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(user, deque()).append(future)
+        self.queued += 1
+        self._update_gauges()
+        timeout = self.queue_timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        started = time.monotonic()
+        try:
+            done, _ = await asyncio.wait({future}, timeout=timeout)
+        except BaseException:
+            # 대기 중 취소: 이미 배정된 슬롯이면 돌려줍니다.
+            if future.done() and not future.cancelled():
+                self._release(user, time.monotonic())
+            else:
+                self._remove_waiter(user, future)
+                future.cancel()
+                self._update_gauges()
+            raise
+        waited = time.monotonic() - started
+        metrics.observe("admission_queue_wait_seconds", waited, endpoint=self.name)
+        if not done:
+            self._remove_waiter(user, future)
+            future.cancel()
+            self._update_gauges()
+            if deadline is not None and deadline.expired:
+                deadline.check(STAGE_ADMISSION_QUEUE)
+            raise self._reject("queue_timeout", f"요청이 많아 {waited:.0f}초 안에 처리를 시작하지 못했습니다. 잠시 후 다시 시도해주세요.")
+        return waited
+
+    @asynccontextmanager
+    async def slot(self, user: str, deadline: Optional[Deadline] = None) -> AsyncIterator[None]:
+        """동시 처리 슬롯 하나를 잡고 블록을 실행합니다."""
+        if self._can_start(user) and not self._waiting.get(user):
+            self._start(user)
+            metrics.increment("admission_admitted_total", endpoint=self.name, queued="false")
+        else:
+            await self._wait_turn(user, deadline)
+            metrics.increment("admission_admitted_total", endpoint=self.name, queued="true")
+        self._update_gauges()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(user, started)
+
+
+class AdmissionController:
+    """엔드포인트 분류별 AdmissionQueue 모음"""
+
+    def __init__(self, queues: Dict[str, AdmissionQueue]):
+        self.queues = queues
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls({name: AdmissionQueue.from_env(name) for name in _DEFAULTS})
+
+    def admit(self, endpoint: str, user: str, deadline: Optional[Deadline] = None):
+        return self.queues[endpoint].slot(user, deadline)
+
@@ -0,0 +1,190 @@
+"""
+대화 체크포인트 저장소 (MemorySaver 대체)입니다.
+
+기본 MemorySaver 는 슈퍼스텝마다 바뀐 채널 값을 통째로 직렬화하므로, messages 채널은
+슈퍼스텝마다 전체 대화 기록의 사본이 하나씩 쌓입니다. CompactingMemorySaver 는
+- 메시지 목록을 메시지 단위로 나눠 내용 해시로 한 번만 저장하고, 체크포인트에는 해시 목록만 남깁니다.
+- compact() 로 스레드마다 최근 K 개 체크포인트(와 interrupt 대기 중인 체크포인트)만 남기고
+  나머지 체크포인트, 쓰기 기록, 채널 값, 더 이상 참조되지 않는 메시지를 정리합니다.
+run_compaction() 은 이 작업을 주기적으로 실행하는 백그라운드 작업입니다.
+
+환경 변수
+- CHECKPOINT_KEEP_LAST: 스레드마다 남길 최근 체크포인트 수 (기본 5)
+- CHECKPOINT_COMPACTION_INTERVAL: 백그라운드 정리 주기 (초, 기본 60, 0 이면 사용 안 함)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Set, Tuple
+
+from langchain_core.messages import BaseMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 메시지 해시 목록으로 저장된 값의 직렬화 타입
+MESSAGE_REFS_TYPE = "message_refs"
+# interrupt() 로 멈춘 체크포인트에 기록되는 쓰기 채널 (langgraph 내부 상수)
+_INTERRUPT_CHANNEL = "__interrupt__"
+
+
+def _is_message_list(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(m, BaseMessage) for m in value)
+
+
+def _typed_size(data: Tuple[str, bytes]) -> int:
+    return len(data[1]) if data else 0
+
+
+class MessageDedupSerializer(JsonPlusSerializer):
+    """메시지 목록을 메시지 단위로 내용 주소화해 저장하는 직렬화기"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # 해시 → 직렬화된 메시지
+        self.messages: Dict[str, Tuple[str, bytes]] = {}
+
+    def _intern(self, message: BaseMessage) -> str:
+        data = super().dumps_typed(message)
+        key = hashlib.sha256(data[0].encode() + b"\0" + data[1]).hexdigest()[:32]
+        self.messages.setdefault(key, data)
+        return key
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        if _is_message_list(obj):
+            return MESSAGE_REFS_TYPE, "\n".join(self._intern(m) for m in obj).encode()
+        return super().dumps_typed(obj)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        load = super().loads_typed
+        if data[0] == MESSAGE_REFS_TYPE:
+            return [load(self.messages[key]) for key in data[1].decode().split("\n")]
+        return load(data)
+
+    @staticmethod
+    def refs(data: Tuple[str, bytes]) -> List[str]:
+        return data[1].decode().split("\n") if data and data[0] == MESSAGE_REFS_TYPE else []
+
+
+class CompactingMemorySaver(InMemorySaver):
+    """메시지를 공유 저장하고 오래된 체크포인트를 정리하는 메모리 체크포인트 저장소"""
+
+    def __init__(self, keep_last: int = 5):
+        super().__init__(serde=MessageDedupSerializer())
+        self.keep_last = max(1, keep_last)
+        # 저장과 정리가 겹치지 않도록 (정리 도중 새로 저장된 메시지를 지우지 않게) 보호합니다.
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls) -> "CompactingMemorySaver":
+        return cls(keep_last=int(os.getenv("CHECKPOINT_KEEP_LAST", "5")))
+
+    @property
+    def message_store(self) -> Dict[str, Tuple[str, bytes]]:
+        return self.serde.messages
+
+    def get_tuple(self, config):
+        with self._lock:
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._lock:
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with self._lock:
+            return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            super().delete_thread(thread_id)
+
+    def stats(self) -> Dict[str, int]:
+        """저장소 크기 (바이트는 직렬화된 크기 기준)"""
+        with self._lock:
+            checkpoints = [entry for thread in self.storage.values() for ns in thread.values() for entry in ns.values()]
+            return {
+                "threads": len(self.storage),
+                "checkpoints": len(checkpoints),
+                "checkpoint_bytes": sum(_typed_size(c) + _typed_size(m) for c, m, _ in checkpoints),
+                "blob_bytes": sum(_typed_size(b) for b in self.blobs.values()),
+                "write_bytes": sum(_typed_size(w[2]) for ws in self.writes.values() for w in ws.values()),
+                "messages": len(self.message_store),
+                "message_bytes": sum(_typed_size(m) for m in self.message_store.values()),
+            }
+
+    def _keep_ids(self, thread_id: str, checkpoint_ns: str, checkpoint_ids: List[str]) -> Set[str]:
+        # 체크포인트 ID 는 시간순으로 정렬됩니다 (uuid6).
+        keep = set(sorted(checkpoint_ids)[-self.keep_last:])
+        for checkpoint_id in checkpoint_ids:
+            writes = self.writes.get((thread_id, checkpoint_ns, checkpoint_id), {})
+            if any(w[1] == _INTERRUPT_CHANNEL for w in writes.values()):
+                keep.add(checkpoint_id)
+        return keep
+
+    def compact(self) -> Dict[str, int]:
+        """오래된 체크포인트를 정리하고 회수한 바이트 수를 종류별로 반환합니다."""
+        reclaimed = {"checkpoints": 0, "writes": 0, "blobs": 0, "messages": 0}
+        removed = 0
+        with self._lock:
+            live_blobs: Set[Tuple[str, str, str, Any]] = set()
+            for thread_id, namespaces in self.storage.items():
+                for checkpoint_ns, checkpoints in namespaces.items():
+                    keep = self._keep_ids(thread_id, checkpoint_ns, list(checkpoints))
+                    for checkpoint_id in [cid for cid in checkpoints if cid not in keep]:
+                        checkpoint, metadata, _ = checkpoints.pop(checkpoint_id)
+                        reclaimed["checkpoints"] += _typed_size(checkpoint) + _typed_size(metadata)
+                        writes = self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), {})
+                        reclaimed["writes"] += sum(_typed_size(w[2]) for w in writes.values())
+                        removed += 1
+                    for checkpoint, _, _ in checkpoints.values():
+                        versions = self.serde.loads_typed(checkpoint).get("channel_versions", {})
+                        live_blobs.update((thread_id, checkpoint_ns, channel, version) for channel, version in versions.items())
+
+            # 남은 체크포인트가 참조하지 않는 채널 값 정리 (delete_thread 로 지워진 스레드 포함)
+            for key in [key for key in self.blobs if key not in live_blobs]:
+                reclaimed["blobs"] += _typed_size(self.blobs.pop(key))
+
+            # 남은 채널 값과 쓰기 기록이 참조하지 않는 메시지 정리
+            live_messages: Set[str] = set()
+            for blob in self.blobs.values():
+                live_messages.update(MessageDedupSerializer.refs(blob))
+            for writes in self.writes.values():
+                for write in writes.values():
+                    live_messages.update(MessageDedupSerializer.refs(write[2]))
+            for key in [key for key in self.message_store if key not in live_messages]:
+                reclaimed["messages"] += _typed_size(self.message_store.pop(key))
+
+        for kind, size in reclaimed.items():
+            if size:
+                metrics.increment("checkpoint_compaction_reclaimed_bytes_total", size, kind=kind)
+        metrics.increment("checkpoint_compaction_runs_total")
+        metrics.increment("checkpoint_compaction_removed_total", removed)
+        stats = self.stats()
+        metrics.set_gauge("checkpoint_store_checkpoints", stats["checkpoints"])
+        metrics.set_gauge("checkpoint_store_messages", stats["messages"])
+        metrics.set_gauge(
+            "checkpoint_store_bytes",
+            stats["checkpoint_bytes"] + stats["blob_bytes"] + stats["write_bytes"] + stats["message_bytes"],
+        )
+        if removed:
+            logger.info(f"체크포인트 정리: {removed}개 삭제, {sum(reclaimed.values())} 바이트 회수")
+        return reclaimed
+
+    async def run_compaction(self, interval: float) -> None:
+        """interval 초마다 compact() 를 실행하는 백그라운드 작업 (취소될 때까지)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.compact)
+            except Exception as e:
+                logger.error(f"체크포인트 정리 실패: {e}", exc_info=True)
+
+
+CHECKPOINT_COMPACTION_INTERVAL = float(os.getenv("CHECKPOINT_COMPACTION_INTERVAL", "60"))
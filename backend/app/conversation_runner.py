@@ -10,6 +10,9 @@ from langchain_core.messages import (
 )
 import json
 
+from .deadlines import STAGE_GRAPH, DeadlineError, RequestCancelled, deadline_from_config, find_deadline_error
+from .graph.planning import find_plan_call, plan_approval_tools
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,7 @@ def run_conversation(
     """
     if printed_ids is None:
         printed_ids = set()
+    deadline = deadline_from_config(config)
 
     logger.info("=== 대화 실행 시작 ===")
     logger.info(f"입력 메시지: {message}")
@@ -104,6 +108,9 @@ def run_conversation(
             
             # 스트림 처리를 위해 이벤트를 하나씩 처리
             for ev in events_gen:
+                # 슈퍼스텝마다 마감 시간/취소 확인
+                if deadline is not None:
+                    deadline.check(STAGE_GRAPH)
                 if isinstance(ev, str):
                     logger.debug(f"[Debug str event] {ev}")
                     continue
@@ -129,6 +136,12 @@ def run_conversation(
             metadata = getattr(snap_after, 'metadata', {})
             writes = metadata.get('writes', {})
             
+            # writes가 없는 버전의 langgraph에서는 마지막 메시지에서 tool_calls 확인
+            if not writes:
+                last_messages = snap_after.values.get("messages", [])
+                if last_messages:
+                    writes = {"pending": last_messages[-1]}
+
             # writes에서 tool_calls 확인
             for assistant_data in writes.values():
                 if isinstance(assistant_data, dict) and 'messages' in assistant_data:
@@ -141,10 +154,16 @@ def run_conversation(
                 tool_calls = getattr(message, 'tool_calls', None)
                 if tool_calls:
                     logger.info(f"도구 승인 요청: {tool_calls}")
+                    approval_message = "다음 작업을 실행할까요?"
+                    # 계획 승인 모드: 계획의 모든 단계를 한 번에 승인받습니다.
+                    plan_call = find_plan_call(tool_calls)
+                    if plan_call is not None:
+                        tool_calls = plan_approval_tools(tool_calls)
+                        approval_message = f"{plan_call['args'].get('summary') or '다음 계획'}\n총 {len(tool_calls)}단계를 한 번에 실행할까요?"
                     return {
                         "type": "tool_approval",
                         "tools": tool_calls,
-                        "message": "다음 작업을 실행할까요?",
+                        "message": approval_message,
                         "responses": responses,  # 모든 중간 응답을 포함
                         "thread_id": config["configurable"]["thread_id"]
                     }
@@ -159,6 +178,13 @@ def run_conversation(
         }
 
     except Exception as e:
+        # 마감 시간 초과/취소: 체크포인트를 정리한 뒤 호출자에게 그대로 전달
+        deadline_error = find_deadline_error(e)
+        if deadline_error is not None:
+            logger.warning(f"대화 실행 중단 ({deadline_error.stage}): {deadline_error}")
+            _settle_interrupted_turn(graph, config, deadline_error)
+            raise deadline_error
+
         logger.error(f"오류 발생: {e}", exc_info=True)
         
         # OpenAI API 에러 처리
@@ -186,6 +212,45 @@ def run_conversation(
         }
 
 
+def _settle_interrupted_turn(graph: StateGraph, config: dict, error: DeadlineError) -> None:
+    """
+    중단된 턴의 체크포인트를 정리합니다.
+
+    그래프는 마지막으로 끝난 슈퍼스텝에서 멈추므로, 응답 없는 tool_calls 가 남거나 다음 노드가
+    대기 중일 수 있습니다. 실행되지 않은 도구 호출에 ToolMessage 를 채우고 중단 안내 메시지를
+    현재 어시스턴트 노드 이름으로 기록해, 다음 턴이 깨끗한 상태에서 시작하도록 합니다.
+    """
+    try:
+        snapshot = graph.get_state(config)
+        if not (snapshot and snapshot.next):
+            return
+
+        messages = snapshot.values.get("messages", [])
+        answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+        pending_calls = []
+        for m in reversed(messages):
+            if isinstance(m, AIMessage):
+                pending_calls = [tc for tc in (m.tool_calls or []) if tc["id"] not in answered]
+                break
+
+        if isinstance(error, RequestCancelled):
+            reason = "요청이 취소되어"
+        else:
+            reason = "처리 시간이 초과되어"
+        updates = [
+            ToolMessage(tool_call_id=tc["id"], name=tc["name"], content=f"{reason} 도구를 실행하지 않았습니다.")
+            for tc in pending_calls
+        ]
+        updates.append(AIMessage(content=f"{reason} 작업을 중단했습니다. 다시 요청해주세요."))
+
+        dialog_state = snapshot.values.get("dialog_state") or []
+        node = dialog_state[-1] if dialog_state else "primary_assistant"
+        graph.update_state(config, {"messages": updates}, as_node=node)
+        logger.info(f"중단된 턴 정리 완료 (node={node}, 미실행 도구 {len(pending_calls)}개)")
+    except Exception as e:
+        logger.error(f"중단된 턴 정리 실패: {e}", exc_info=True)
+
+
 def _extract_responses(ev: dict) -> List[Dict[str, Any]]:
     responses = []
     # 중복 메시지 추적을 위한 세트
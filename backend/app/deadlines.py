@@ -0,0 +1,139 @@
+"""
+요청 단위 마감 시간(deadline)과 취소 신호입니다.
+
+채팅 요청마다 Deadline 을 만들어 RunnableConfig(configurable["deadline"])와 컨텍스트 변수로 전달합니다.
+- LLM 호출: 전송 계층이 남은 시간으로 httpx 타임아웃을 줄이고, 시간이 없으면 호출하지 않습니다.
+- 도구 HTTP 호출: make_request 가 남은 시간으로 requests 타임아웃을 정합니다.
+- 그래프 슈퍼스텝: 어시스턴트 노드 진입과 run_conversation 의 스트림 이벤트마다 확인합니다.
+- 대화 스레드 대기열: 같은 thread_id 의 앞선 요청을 기다리는 동안에도 확인합니다.
+
+클라이언트 연결이 끊기면 cancel() 을 호출해 같은 지점들에서 실행을 멈춥니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from .metrics import metrics
+
+# 중단 지점 이름
+STAGE_GRAPH = "graph"
+STAGE_LLM = "llm"
+STAGE_LLM_QUEUE = "llm_queue"
+STAGE_TOOL = "tool"
+STAGE_THREAD_QUEUE = "thread_queue"
+STAGE_ADMISSION_QUEUE = "admission_queue"
+
+
+class DeadlineError(Exception):
+    """마감 시간 초과나 취소로 요청 처리를 중단할 때 발생하는 예외의 기반 클래스"""
+
+    def __init__(self, message: str, stage: str, timeout: float):
+        super().__init__(message)
+        self.stage = stage
+        self.timeout = timeout
+
+
+class DeadlineExceeded(DeadlineError):
+    """요청 마감 시간 초과"""
+
+
+class RequestCancelled(DeadlineError):
+    """클라이언트 연결 종료 등으로 요청이 취소됨"""
+
+
+class Deadline:
+    """요청 마감 시각과 취소 상태"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self.cancel_reason: Optional[str] = None
+        # 처음 중단된 단계 (응답과 메트릭에 사용)
+        self.stage: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Deadline(timeout={self.timeout}, remaining={self.remaining():.2f}, cancelled={self.cancelled})"
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self, reason: str = "client_disconnected") -> None:
+        self.cancel_reason = self.cancel_reason or reason
+        self._cancelled.set()
+
+    def _stop(self, stage: str, outcome: str) -> str:
+        with self._lock:
+            if self.stage is None:
+                self.stage = stage
+                metrics.increment("request_deadline_total", stage=stage, outcome=outcome)
+            return self.stage
+
+    def check(self, stage: str) -> None:
+        """취소되었거나 시간이 지났으면 예외를 발생시킵니다."""
+        if self.cancelled:
+            stage = self._stop(stage, "cancelled")
+            raise RequestCancelled(f"요청이 취소되었습니다 ({self.cancel_reason}, {stage})", stage, self.timeout)
+        if self.expired:
+            stage = self._stop(stage, "exceeded")
+            raise DeadlineExceeded(f"요청 처리 시간({self.timeout:g}초)을 초과했습니다 ({stage})", stage, self.timeout)
+
+    def timeout_for(self, stage: str, default: Optional[float] = None) -> float:
+        """stage 작업에 쓸 타임아웃 (기본 타임아웃과 남은 시간 중 작은 값)"""
+        self.check(stage)
+        remaining = self.remaining()
+        return remaining if default is None else min(default, remaining)
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """블록 안의 LLM/도구 호출에 deadline 을 적용합니다."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def deadline_from_config(config: Optional[Dict[str, Any]]) -> Optional[Deadline]:
+    return ((config or {}).get("configurable") or {}).get("deadline")
+
+
+def check_deadline(stage: str) -> None:
+    """현재 컨텍스트에 deadline 이 있으면 확인합니다."""
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def find_deadline_error(exc: BaseException) -> Optional[DeadlineError]:
+    """
+    예외 체인에서 DeadlineError 를 찾습니다.
+    OpenAI SDK 는 전송 계층 예외를 APIConnectionError 로 감싸서 다시 던집니다.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, DeadlineError):
+            return exc
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return None
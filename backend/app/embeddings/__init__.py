@@ -0,0 +1,9 @@
+"""
+embeddings 패키지는 의미 기반 검색/캐시에 쓰이는 텍스트 임베딩 생성기와
+캐시/마이크로 배칭을 갖춘 임베딩 서비스를 제공합니다.
+"""
+
+from .embedders import HashingEmbedder, create_embedder, DEFAULT_EMBEDDING_MODEL
+from .cache import EmbeddingCache, content_key
+from .batcher import EmbeddingBatcher
+from .service import EmbeddingService, get_embedding_service, close_embedding_service
@@ -0,0 +1,73 @@
+"""
+동시에 들어온 임베딩 요청을 한 번의 제공자 호출로 묶는 마이크로 배처입니다.
+
+첫 요청 후 max_wait 초 동안 (또는 max_batch_size 개가 찰 때까지) 모은 텍스트를
+중복 제거 후 한 번에 임베딩합니다. 하나의 이벤트 루프 안에서만 사용해야 합니다.
+"""
+
+import asyncio
+import logging
+from typing import Callable, List, Optional, Set, Tuple
+
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+EmbedFunction = Callable[[List[str]], List[List[float]]]
+
+
+class EmbeddingBatcher:
+    """asyncio 기반 임베딩 마이크로 배처"""
+
+    def __init__(self, embed_fn: EmbedFunction, max_batch_size: int = 128, max_wait: float = 0.01):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # 실행 중인 배치 태스크 (가비지 컬렉션 방지)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        metrics.observe("embedding_batch_size", len(unique_texts))
+        try:
+            # 동기 임베더는 공유 httpx 동기 클라이언트를 쓰므로 스레드에서 실행합니다.
+            vectors = await asyncio.to_thread(self.embed_fn, unique_texts)
+        except Exception as e:
+            logger.error(f"임베딩 배치 실패 ({len(unique_texts)}개): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
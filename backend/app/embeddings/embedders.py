@@ -0,0 +1,73 @@
+"""
+텍스트 임베딩 생성기입니다.
+
+EMBEDDER 환경 변수로 구현을 선택합니다.
+- openai (기본값): OpenAI 임베딩 API (EMBEDDING_MODEL, 기본 text-embedding-3-small).
+  LLM 과 같은 httpx 클라이언트(커넥션 풀, 재시도, 스케줄러)를 사용합니다.
+- hashing: 문자 n-gram 해싱 임베더. 네트워크 없이 동작하므로 오프라인 테스트/부하 테스트용입니다.
+"""
+
+import math
+import os
+import re
+import zlib
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class HashingEmbedder(Embeddings):
+    """
+    문자 n-gram 을 고정 차원으로 해싱한 L2 정규화 벡터를 만듭니다.
+    프로세스가 달라도 같은 벡터가 나오도록 crc32 를 사용합니다.
+    """
+
+    def __init__(self, dimensions: int = 512, ngram_range: tuple = (2, 4)):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.model = f"hashing-{dimensions}"
+
+    def _embed(self, text: str) -> List[float]:
+        normalized = f" {_WHITESPACE.sub(' ', text.lower()).strip()} "
+        vector = [0.0] * self.dimensions
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(normalized) - n + 1):
+                digest = zlib.crc32(normalized[i:i + n].encode("utf-8"))
+                # 최상위 비트로 부호를 정해 해시 충돌의 편향을 줄입니다.
+                vector[digest % self.dimensions] += -1.0 if digest & 0x80000000 else 1.0
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def create_embedder() -> Embeddings:
+    """환경 변수 설정에 맞는 임베더를 생성합니다."""
+    backend = os.getenv("EMBEDDER", "openai").lower()
+    if backend == "hashing":
+        return HashingEmbedder(dimensions=int(os.getenv("HASHING_EMBEDDER_DIMENSIONS", "512")))
+    if backend != "openai":
+        raise ValueError(f"Unknown EMBEDDER: {backend}")
+
+    from langchain_openai import OpenAIEmbeddings
+
+    from ..llm import get_http_clients
+
+    http_client, http_async_client = get_http_clients()
+    return OpenAIEmbeddings(
+        model=DEFAULT_EMBEDDING_MODEL,
+        # 재시도는 공유 httpx 클라이언트의 RetryingTransport 에서 처리합니다.
+        max_retries=0,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
@@ -0,0 +1,221 @@
+"""
+recipes 테이블 전체의 임베딩을 다시 계산하는 CLI 입니다.
+
+    python -m app.embeddings.reembed [--database URL] [--batch-size 100] [--only-missing] [--restart] [--dry-run]
+
+- --database: postgresql://... (기본값 DATABASE_URL) 또는 sqlite:///경로 (SQLiteRecipeVectorStore 스키마)
+- id 순으로 배치 처리하며, 배치마다 마지막 id 를 진행 파일(--progress)에 기록합니다.
+  중단 후 다시 실행하면 이어서 처리하고, 처음부터 하려면 --restart 를 사용합니다.
+- 임베딩 텍스트는 Next.js 와 같은 형식입니다. (번역마다 "제목 설명 내용" 을 공백으로 이어 붙임)
+- 내용이 바뀌지 않은 레시피는 임베딩 캐시에서 가져오므로 제공자를 호출하지 않습니다.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+Row = Tuple[int, str]
+
+
+class PostgresRecipeSource:
+    """PostgreSQL(pgvector) 레시피 테이블"""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._conn = None
+
+    async def open(self) -> None:
+        import asyncpg
+
+        self._conn = await asyncpg.connect(self.dsn)
+
+    async def fetch_batch(self, after_id: int, limit: int, only_missing: bool) -> List[Row]:
+        rows = await self._conn.fetch(
+            f"""
+            SELECT r.id,
+                   string_agg(rt.title || ' ' || coalesce(rt.description, '') || ' ' || rt.content, ' ' ORDER BY rt.id) AS text
+            FROM recipes r
+            JOIN recipe_translations rt ON rt.recipe_id = r.id
+            WHERE r.id > $1 {"AND (r.embedding IS NULL OR vector_norm(r.embedding) = 0)" if only_missing else ""}
+            GROUP BY r.id
+            ORDER BY r.id
+            LIMIT $2
+            """,
+            after_id,
+            limit,
+        )
+        return [(row["id"], row["text"]) for row in rows]
+
+    async def write(self, embeddings: List[Tuple[int, List[float]]]) -> None:
+        await self._conn.executemany(
+            "UPDATE recipes SET embedding = $2::text::vector, updated_at = now() WHERE id = $1",
+            [(recipe_id, "[" + ",".join(f"{v:.7g}" for v in vector) + "]") for recipe_id, vector in embeddings],
+        )
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+
+
+class SQLiteRecipeSource:
+    """SQLiteRecipeVectorStore 와 같은 스키마의 SQLite 파일 (오프라인 테스트용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    async def open(self) -> None:
+        self._conn = sqlite3.connect(self.path)
+
+    async def fetch_batch(self, after_id: int, limit: int, only_missing: bool) -> List[Row]:
+        rows = self._conn.execute(
+            f"""
+            SELECT r.id, group_concat(rt.title || ' ' || coalesce(rt.description, '') || ' ' || rt.content, ' ')
+            FROM recipes r
+            JOIN (SELECT * FROM recipe_translations ORDER BY rowid) rt ON rt.recipe_id = r.id
+            WHERE r.id > ? {"AND r.embedding IS NULL" if only_missing else ""}
+            GROUP BY r.id
+            ORDER BY r.id
+            LIMIT ?
+            """,
+            (after_id, limit),
+        ).fetchall()
+        return [(recipe_id, text) for recipe_id, text in rows]
+
+    async def write(self, embeddings: List[Tuple[int, List[float]]]) -> None:
+        self._conn.executemany(
+            "UPDATE recipes SET embedding = ? WHERE id = ?",
+            [(np.asarray(vector, dtype=np.float32).tobytes(), recipe_id) for recipe_id, vector in embeddings],
+        )
+        self._conn.commit()
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+
+def create_source(database: str):
+    if database.startswith("sqlite:///"):
+        return SQLiteRecipeSource(database[len("sqlite:///"):])
+    if database.startswith(("postgres://", "postgresql://")):
+        return PostgresRecipeSource(database)
+    raise ValueError(f"지원하지 않는 데이터베이스 URL: {database}")
+
+
+def load_progress(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_progress(path: str, progress: Dict[str, Any]) -> None:
+    # 중간에 죽어도 진행 파일이 깨지지 않도록 임시 파일에 쓰고 교체합니다.
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(progress, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+async def reembed(
+    source,
+    service: EmbeddingService,
+    progress_path: str,
+    batch_size: int = 100,
+    only_missing: bool = False,
+    restart: bool = False,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    progress = {} if restart else load_progress(progress_path)
+    if progress.get("completed"):
+        logger.info("이전 실행이 이미 완료되었습니다. 다시 하려면 --restart 를 사용하세요.")
+        return progress
+    if progress.get("model") not in (None, service.model):
+        raise ValueError(f"진행 파일의 모델({progress['model']})이 현재 모델({service.model})과 다릅니다. --restart 를 사용하세요.")
+
+    progress = {
+        "model": service.model,
+        "only_missing": only_missing,
+        "last_id": progress.get("last_id", 0),
+        "processed": progress.get("processed", 0),
+        "cache_hits": progress.get("cache_hits", 0),
+        "completed": False,
+    }
+    if progress["last_id"]:
+        logger.info(f"id {progress['last_id']} 이후부터 이어서 처리합니다.")
+
+    started = time.perf_counter()
+    await source.open()
+    try:
+        while True:
+            # only_missing 이면 처리한 행이 조건에서 빠지므로 last_id 커서만으로 충분합니다.
+            rows = await source.fetch_batch(progress["last_id"], batch_size, only_missing)
+            if not rows:
+                break
+
+            vectors, hits = await asyncio.to_thread(service.embed, [text for _, text in rows])
+            if not dry_run:
+                await source.write([(recipe_id, vector) for (recipe_id, _), vector in zip(rows, vectors)])
+
+            progress["last_id"] = rows[-1][0]
+            progress["processed"] += len(rows)
+            progress["cache_hits"] += hits
+            if not dry_run:
+                save_progress(progress_path, progress)
+            logger.info(f"{progress['processed']}개 처리 (마지막 id {progress['last_id']}, 캐시 적중 {hits}/{len(rows)})")
+    finally:
+        await source.close()
+
+    progress["completed"] = True
+    progress["elapsed_s"] = round(time.perf_counter() - started, 3)
+    if not dry_run:
+        save_progress(progress_path, progress)
+    return progress
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="recipes 테이블 임베딩 일괄 재계산")
+    parser.add_argument("--database", default=os.getenv("DATABASE_URL"), help="postgresql://... 또는 sqlite:///경로")
+    parser.add_argument("--batch-size", type=int, default=100)
+    # 마이그레이션 기본값이 0 벡터이므로 NULL 과 0 벡터를 모두 '없음' 으로 봅니다.
+    parser.add_argument("--only-missing", action="store_true", help="embedding 이 없거나 0 벡터인 레시피만 처리")
+    parser.add_argument("--progress", default="reembed_progress.json", help="진행 상황 파일 경로")
+    parser.add_argument("--restart", action="store_true", help="진행 파일을 무시하고 처음부터 처리")
+    parser.add_argument("--dry-run", action="store_true", help="임베딩만 계산하고 저장하지 않음")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.database:
+        parser.error("--database 또는 DATABASE_URL 이 필요합니다.")
+
+    service = EmbeddingService.from_env()
+    try:
+        result = asyncio.run(reembed(
+            create_source(args.database),
+            service,
+            args.progress,
+            batch_size=args.batch_size,
+            only_missing=args.only_missing,
+            restart=args.restart,
+            dry_run=args.dry_run,
+        ))
+    finally:
+        service.close()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+임베딩 서비스입니다. 캐시 조회 → 캐시에 없는 텍스트만 마이크로 배치로 임베딩 → 캐시 저장 순으로 처리합니다.
+
+환경 변수
+- EMBEDDING_CACHE_PATH: 디스크 캐시 SQLite 파일 (기본 embeddings.sqlite3, 빈 값이면 메모리만 사용)
+- EMBEDDING_CACHE_MEMORY_SIZE: 메모리 캐시 항목 수 (기본 10000)
+- EMBEDDING_BATCH_SIZE: 제공자 호출당 최대 텍스트 수 (기본 128)
+- EMBEDDING_BATCH_WAIT_MS: 배치를 모으는 최대 대기 시간 (기본 10ms)
+"""
+
+import asyncio
+import os
+import threading
+from typing import List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from .batcher import EmbeddingBatcher
+from .cache import EmbeddingCache, content_key
+from .embedders import create_embedder
+
+
+def embedder_model_name(embedder: Embeddings) -> str:
+    return getattr(embedder, "model", None) or type(embedder).__name__
+
+
+class EmbeddingService:
+    """캐시 + 마이크로 배칭 임베딩 서비스"""
+
+    def __init__(self, embedder: Embeddings, cache: EmbeddingCache, max_batch_size: int = 128, max_wait: float = 0.01):
+        self.embedder = embedder
+        self.cache = cache
+        self.model = embedder_model_name(embedder)
+        self.max_batch_size = max_batch_size
+        self.batcher = EmbeddingBatcher(embedder.embed_documents, max_batch_size=max_batch_size, max_wait=max_wait)
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingService":
+        return cls(
+            embedder=create_embedder(),
+            cache=EmbeddingCache(
+                path=os.getenv("EMBEDDING_CACHE_PATH", "embeddings.sqlite3") or None,
+                memory_size=int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "10000")),
+            ),
+            max_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "128")),
+            max_wait=float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "10")) / 1000,
+        )
+
+    def _missing(self, texts: List[str], keys: List[str], cached: dict) -> List[str]:
+        return list(dict.fromkeys(text for text, key in zip(texts, keys) if key not in cached))
+
+    async def aembed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """(임베딩 목록, 캐시 적중 수)를 반환합니다. 동시 요청은 한 번의 제공자 호출로 묶입니다."""
+        keys = [content_key(self.model, text) for text in texts]
+        cached = await asyncio.to_thread(self.cache.get_many, keys)
+        hits = sum(1 for key in keys if key in cached)
+
+        missing = self._missing(texts, keys, cached)
+        if missing:
+            vectors = await self.batcher.embed(missing)
+            computed = {content_key(self.model, text): vector for text, vector in zip(missing, vectors)}
+            await asyncio.to_thread(self.cache.put_many, computed)
+            cached.update(computed)
+        return [cached[key] for key in keys], hits
+
+    def embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """동기 버전 (CLI/배치 작업용). max_batch_size 단위로 나눠 호출합니다."""
+        keys = [content_key(self.model, text) for text in texts]
+        cached = self.cache.get_many(keys)
+        hits = sum(1 for key in keys if key in cached)
+
+        missing = self._missing(texts, keys, cached)
+        for start in range(0, len(missing), self.max_batch_size):
+            chunk = missing[start:start + self.max_batch_size]
+            computed = {
+                content_key(self.model, text): vector
+                for text, vector in zip(chunk, self.embedder.embed_documents(chunk))
+            }
+            self.cache.put_many(computed)
+            cached.update(computed)
+        return [cached[key] for key in keys], hits
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """공유 임베딩 서비스 (첫 사용 때 생성)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = EmbeddingService.from_env()
+        return _service
+
+
+def close_embedding_service() -> None:
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.close()
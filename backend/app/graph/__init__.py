@@ -9,10 +9,20 @@ from .models import (
     ToRecipeAssistant,
     ToRefrigeratorAssistant,
     CompleteOrEscalate,
-    Assistant
+    PlanStep,
+    SubmitPlan,
+    Assistant,
+    EmptyOutputRetryPolicy
 )
 from .helpers import update_dialog_stack, create_entry_node, pop_dialog_state, handle_tool_error
-from .node_factory import create_tool_node_with_fallback, create_sub_assistant
+from .node_factory import (
+    create_tool_node_with_fallback,
+    create_sub_assistant,
+    create_route_assistant,
+    create_route_primary_assistant
+)
+from .planning import PLAN_MODE_ENABLED, PlanExecutor, plan_approval_tools, validate_plan
+from .semantic_cache import SemanticCache, SemanticCacheNode, create_semantic_cache
 
 # 서브 어시스턴트 설정 관리 모듈 임포트
 from .sub_assistants import SUB_ASSISTANTS, register_sub_assistants 
\ No newline at end of file
@@ -5,6 +5,8 @@ LangGraph 그래프에서 사용되는 헬퍼 함수들을 정의합니다.
 from typing import Dict, Optional, List
 from langchain_core.messages import ToolMessage
 
+from ..deadlines import DeadlineError
+
 
 def update_dialog_stack(left: list[str], right: Optional[str]) -> list[str]:
     """dialog_state 스택 push/pop 헬퍼"""
@@ -55,6 +57,9 @@ def pop_dialog_state(state: Dict) -> dict:
 def handle_tool_error(state):
     """도구 실행 중 오류 발생 시 처리 함수"""
     error = state.get("error")
+    # 마감 시간 초과/취소는 도구 오류 메시지로 바꾸지 않고 그대로 전달합니다.
+    if isinstance(error, DeadlineError):
+        raise error
     tool_calls = state["messages"][-1].tool_calls
     # Generate a single "ToolMessage" telling there's an error
     return {
@@ -2,10 +2,27 @@
 LangGraph 그래프에서 사용되는 모델 클래스들을 정의합니다.
 """
 
-from typing import List, Type, Dict
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Type
 from pydantic import BaseModel, Field
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable, RunnableConfig
 
+from ..deadlines import STAGE_GRAPH, deadline_from_config
+from ..llm.tokens import (
+    DEFAULT_TOKEN_BUDGET,
+    TokenBudget,
+    count_message_tokens,
+    count_tool_tokens,
+    current_token_usage,
+)
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
 
 class SubAssistantConfig:
     """서브 어시스턴트 설정 클래스"""
@@ -45,21 +62,172 @@ class CompleteOrEscalate(BaseModel):
     reason: str
 
 
+class PlanStep(BaseModel):
+    """실행 계획의 한 단계 (민감한 도구 호출 하나)"""
+    id: str = Field(..., description="단계 ID (예: s1)")
+    tool: str = Field(..., description="호출할 도구 이름")
+    args: Dict[str, Any] = Field(default_factory=dict, description='도구 인자. 이전 단계 결과의 ID는 "$s1.id" 또는 "$s2.id.<이름>" 으로 참조')
+    depends_on: List[str] = Field(default_factory=list, description="먼저 끝나야 하는 단계 ID 목록")
+
+
+class SubmitPlan(BaseModel):
+    """
+    여러 개의 민감한 작업(생성/수정/삭제)을 순서가 있는 계획으로 묶어 한 번에 사용자 승인을 받는 도구.
+    승인되면 의존 관계가 없는 단계는 동시에 실행됩니다.
+    """
+    summary: str = Field(..., description="사용자에게 보여줄 계획 요약")
+    steps: List[PlanStep]
+
+
+def _is_empty_output(result) -> bool:
+    """도구 호출도 없고 내용도 비어 있는 응답인지 확인합니다."""
+    if result.tool_calls:
+        return False
+    if isinstance(result.content, list):
+        return not result.content or not result.content[0].get("text")
+    return not result.content
+
+
+class EmptyOutputRetryPolicy:
+    """
+    LLM 이 빈 응답을 반환했을 때의 재시도 정책
+
+    최대 max_attempts 번까지 호출하고, 재시도 사이에는 지수 백오프로 기다립니다.
+    모두 실패하면 사용자 언어에 맞는 대체 응답을 반환합니다.
+    """
+
+    FALLBACK_MESSAGES = {
+        "ko": "죄송합니다. 지금은 응답을 생성하지 못했습니다. 잠시 후 다시 시도해주세요.",
+        "en": "Sorry, I couldn't generate a response right now. Please try again in a moment.",
+        "ja": "申し訳ありません。現在応答を生成できませんでした。しばらくしてからもう一度お試しください。",
+    }
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0,
+        fallback_message: Optional[str] = None,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.fallback_message = fallback_message
+
+    @classmethod
+    def from_env(cls) -> "EmptyOutputRetryPolicy":
+        return cls(
+            max_attempts=int(os.getenv("ASSISTANT_MAX_ATTEMPTS", "3")),
+            base_delay=float(os.getenv("ASSISTANT_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("ASSISTANT_RETRY_MAX_DELAY", "4.0")),
+            fallback_message=os.getenv("ASSISTANT_FALLBACK_MESSAGE") or None,
+        )
+
+    def delay(self, attempt: int) -> float:
+        """attempt 번째 호출이 실패한 뒤 기다릴 시간 (1부터 시작)"""
+        return min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+
+    def fallback(self, language: str = "ko") -> AIMessage:
+        content = self.fallback_message or self.FALLBACK_MESSAGES.get(language, self.FALLBACK_MESSAGES["en"])
+        # 대체 응답은 실제 답변이 아니므로 표시해 둡니다. (의미 캐시 등에 저장하지 않음)
+        return AIMessage(content=content, response_metadata={"fallback": True})
+
+
+DEFAULT_RETRY_POLICY = EmptyOutputRetryPolicy.from_env()
+
+
 class Assistant:
-    """LLM 응답 실행 래퍼"""
-    def __init__(self, runnable: Runnable):
+    """
+    LLM 응답 실행 래퍼
+
+    prompt 와 tools 를 함께 넘기면 호출마다 입력 토큰 수(시스템 프롬프트, 도구 스키마,
+    context_info, 대화 기록)를 계산하고, 예산을 넘으면 LLM 에 보내는 대화 기록만 줄입니다.
+    빈 응답은 retry_policy 에 따라 제한된 횟수만 다시 요청합니다.
+    """
+    def __init__(
+        self,
+        runnable: Runnable,
+        prompt: Optional[ChatPromptTemplate] = None,
+        tools: Optional[Sequence] = None,
+        name: str = "assistant",
+        token_budget: Optional[TokenBudget] = None,
+        retry_policy: Optional[EmptyOutputRetryPolicy] = None,
+    ):
         self.runnable = runnable
+        self.prompt = prompt
+        self.name = name
+        self.token_budget = token_budget or DEFAULT_TOKEN_BUDGET
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        # 도구 스키마는 바뀌지 않으므로 한 번만 계산
+        self.tool_tokens = count_tool_tokens(tools or [], self.token_budget.model)
+
+    def _fit_to_budget(self, state: Dict) -> Dict:
+        """대화 기록을 토큰 예산에 맞추고 사용량을 기록합니다."""
+        if self.prompt is None:
+            return state
+
+        budget = self.token_budget
+        fixed_tokens = self.tool_tokens + count_message_tokens(
+            self.prompt.invoke({**state, "messages": []}).to_messages(), budget.model
+        )
+        history, stats = budget.fit_history(state["messages"], budget.max_input_tokens - fixed_tokens)
+        total_tokens = fixed_tokens + stats["tokens"]
+
+        metrics.observe("assistant_input_tokens_estimated", total_tokens, assistant=self.name)
+        if stats["dropped_messages"]:
+            metrics.increment("assistant_history_dropped_total", stats["dropped_messages"], assistant=self.name)
+            logger.warning(
+                f"[{self.name}] 토큰 예산 초과로 오래된 메시지 {stats['dropped_messages']}개를 제외했습니다 "
+                f"({total_tokens}/{budget.max_input_tokens} 토큰)"
+            )
+        if stats["truncated_tool_outputs"]:
+            metrics.increment("assistant_tool_outputs_truncated_total", stats["truncated_tool_outputs"], assistant=self.name)
+
+        usage = current_token_usage()
+        if usage is not None:
+            usage.add(
+                estimated_input_tokens=total_tokens,
+                dropped_messages=stats["dropped_messages"],
+                truncated_tool_outputs=stats["truncated_tool_outputs"],
+            )
+
+        if stats["dropped_messages"] or stats["truncated_tool_outputs"]:
+            return {**state, "messages": history}
+        return state
 
     def __call__(self, state: Dict, config: RunnableConfig):
-        while True:
+        deadline = deadline_from_config(config)
+        if deadline is not None:
+            deadline.check(STAGE_GRAPH)
+        state = self._fit_to_budget(state)
+        policy = self.retry_policy
+        messages = None
+
+        for attempt in range(1, policy.max_attempts + 1):
             result = self.runnable.invoke(state)
-            if not result.tool_calls and (
-                not result.content
-                or (isinstance(result.content, list) and not result.content[0].get("text"))
-            ):
-                # 출력이 너무 빈약하면 "실제 출력으로 응답해주세요" 메시지 추가
-                messages = state["messages"] + [("user", "실제 출력으로 응답해주세요.")]
-                state = {**state, "messages": messages}
-            else:
+            if not _is_empty_output(result):
+                if attempt > 1:
+                    metrics.increment("assistant_empty_output_recovered_total", assistant=self.name)
+                return {"messages": result}
+
+            metrics.increment("assistant_empty_output_total", assistant=self.name)
+            if attempt == policy.max_attempts:
                 break
-        return {"messages": result} 
\ No newline at end of file
+
+            delay = policy.delay(attempt)
+            logger.warning(
+                f"[{self.name}] 빈 응답 재시도 {attempt}/{policy.max_attempts - 1} ({delay:.2f}초 후)"
+            )
+            time.sleep(delay if deadline is None else min(delay, deadline.remaining()))
+            if deadline is not None:
+                deadline.check(STAGE_GRAPH)
+            # 출력이 너무 빈약하면 "실제 출력으로 응답해주세요" 메시지 추가 (목록은 처음 한 번만 복사)
+            if messages is None:
+                messages = list(state["messages"])
+                state = {**state, "messages": messages}
+            messages.append(("user", "실제 출력으로 응답해주세요."))
+
+        language = (config or {}).get("configurable", {}).get("user_language", "ko")
+        metrics.increment("assistant_fallback_total", assistant=self.name)
+        logger.error(f"[{self.name}] {policy.max_attempts}번 모두 빈 응답이라 대체 응답을 반환합니다.")
+        return {"messages": policy.fallback(language)}
@@ -9,14 +9,14 @@ from langgraph.prebuilt import tools_condition, ToolNode
 from langgraph.types import Command
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableLambda
-from langchain_openai import ChatOpenAI
 
 # 상대 경로 임포트로 변경
-from .models import SubAssistantConfig, CompleteOrEscalate, Assistant
+from .models import SubAssistantConfig, CompleteOrEscalate, SubmitPlan, Assistant
 from .helpers import create_entry_node, handle_tool_error
+from .planning import PLAN_MODE_ENABLED, PlanExecutor, validate_plan
+from .prompts import PLAN_MODE_RULES, create_sub_assistant_prompt
+from ..llm import get_llm
 
-# LLM 인스턴스 생성
-llm = ChatOpenAI(model="gpt-4o-mini")
 
 
 def create_tool_node_with_fallback(tools: list) -> dict:
@@ -29,58 +29,102 @@ def create_tool_node_with_fallback(tools: list) -> dict:
     )
 
 
+def create_route_assistant(config: SubAssistantConfig):
+    """서브 어시스턴트 노드의 라우팅 함수 생성 함수"""
+    # 도구 이름 집합은 요청마다 만들지 않고 한 번만 만듭니다.
+    safe_toolnames = frozenset(t.name for t in config.safe_tools)
+    tool_names = safe_toolnames | {t.name for t in config.sensitive_tools}
+
+    def route_assistant(state: Dict):
+        route = tools_condition(state)
+        if route == END:
+            return END
+        tool_calls = state["messages"][-1].tool_calls
+        if any(tc["name"] == CompleteOrEscalate.__name__ for tc in tool_calls):
+            return "leave_skill"
+        plan_calls = [tc for tc in tool_calls if tc["name"] == SubmitPlan.__name__]
+        if plan_calls:
+            # 잘못된 계획은 승인을 묻지 않고 바로 어시스턴트에게 돌려보냅니다.
+            if any(validate_plan(tc["args"], tool_names) for tc in plan_calls):
+                return f"{config.id}_plan_invalid"
+            return f"{config.id}_plan"
+        if all(tc["name"] in safe_toolnames for tc in tool_calls):
+            return f"{config.id}_safe_tools"
+        return f"{config.id}_sensitive_tools"
+    return route_assistant
+
+
+def create_route_primary_assistant(sub_assistants: List[SubAssistantConfig]):
+    """메인 어시스턴트 노드의 라우팅 함수 생성 함수"""
+    def route_primary_assistant(state: Dict):
+        route = tools_condition(state)
+        if route == END:
+            return END
+        tool_calls = state["messages"][-1].tool_calls
+        if tool_calls:
+            name = tool_calls[0]["name"]
+            # 동적으로 서브 어시스턴트 전환 처리
+            for config in sub_assistants:
+                if name == config.transition_tool.__name__:
+                    return f"enter_{config.id}"
+            return "primary_assistant_tools"
+        raise ValueError("No tool calls found but not END")
+    return route_primary_assistant
+
+
 def create_sub_assistant(
     builder: StateGraph,
     config: SubAssistantConfig
 ) -> None:
     """서브 어시스턴트 노드와 엣지를 생성하는 함수"""
     
+    # 계획 승인 모드: 민감한 작업 여러 개를 SubmitPlan 하나로 묶어 한 번에 승인받습니다.
+    plan_mode = PLAN_MODE_ENABLED and bool(config.sensitive_tools)
+
     # 1. 어시스턴트 프롬프트 생성
-    assistant_prompt = ChatPromptTemplate.from_messages([
-        (
-            "system",
-            config.system_prompt
-        ),
-        ("placeholder", "{messages}")
-    ]).partial(time=datetime.now)
+    system_prompt = config.system_prompt + "\n\n" + PLAN_MODE_RULES if plan_mode else config.system_prompt
+    assistant_prompt = create_sub_assistant_prompt(system_prompt)
 
     # 2. 어시스턴트 실행기 생성
-    assistant_runnable = assistant_prompt | llm.bind_tools(
-        config.safe_tools + config.sensitive_tools + [CompleteOrEscalate]
-    )
+    assistant_tools = config.safe_tools + config.sensitive_tools + [CompleteOrEscalate]
+    if plan_mode:
+        assistant_tools.append(SubmitPlan)
+    assistant_runnable = assistant_prompt | get_llm("tool_calling", tools=assistant_tools)
     
     # 3. 노드 생성
     # 3.1 진입 노드
     builder.add_node(f"enter_{config.id}", create_entry_node(config.name, config.id))
     # 3.2 어시스턴트 노드
-    builder.add_node(config.id, Assistant(assistant_runnable))
+    builder.add_node(
+        config.id,
+        Assistant(assistant_runnable, prompt=assistant_prompt, tools=assistant_tools, name=config.id),
+    )
     # 3.3 도구 노드
     builder.add_node(f"{config.id}_safe_tools", create_tool_node_with_fallback(config.safe_tools))
     builder.add_node(f"{config.id}_sensitive_tools", create_tool_node_with_fallback(config.sensitive_tools))
+    # 3.4 계획 노드 (승인 후 실행 / 검증 실패 시 반려)
+    if plan_mode:
+        executor = PlanExecutor(config.safe_tools + config.sensitive_tools, name=config.id)
+        builder.add_node(f"{config.id}_plan", executor)
+        builder.add_node(f"{config.id}_plan_invalid", executor.reject)
     
     # 4. 엣지 연결
     # 4.1 진입 노드 -> 어시스턴트 노드
     builder.add_edge(f"enter_{config.id}", config.id)
     
     # 4.2 어시스턴트 노드 -> 도구 노드 또는 종료 노드 (조건부)
-    def route_assistant(state: Dict):
-        route = tools_condition(state)
-        if route == END:
-            return END
-        tool_calls = state["messages"][-1].tool_calls
-        if any(tc["name"] == CompleteOrEscalate.__name__ for tc in tool_calls):
-            return "leave_skill"
-        safe_toolnames = [t.name for t in config.safe_tools]
-        if all(tc["name"] in safe_toolnames for tc in tool_calls):
-            return f"{config.id}_safe_tools"
-        return f"{config.id}_sensitive_tools"
-    
+    destinations = [f"{config.id}_safe_tools", f"{config.id}_sensitive_tools", "leave_skill", END]
+    if plan_mode:
+        destinations += [f"{config.id}_plan", f"{config.id}_plan_invalid"]
     builder.add_conditional_edges(
         config.id,
-        route_assistant,
-        [f"{config.id}_safe_tools", f"{config.id}_sensitive_tools", "leave_skill", END],
+        create_route_assistant(config),
+        destinations,
     )
     
     # 4.3 도구 노드 -> 어시스턴트 노드
     builder.add_edge(f"{config.id}_safe_tools", config.id)
-    builder.add_edge(f"{config.id}_sensitive_tools", config.id) 
\ No newline at end of file
+    builder.add_edge(f"{config.id}_sensitive_tools", config.id)
+    if plan_mode:
+        builder.add_edge(f"{config.id}_plan", config.id)
+        builder.add_edge(f"{config.id}_plan_invalid", config.id) 
\ No newline at end of file
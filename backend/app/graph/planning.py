@@ -0,0 +1,361 @@
+"""
+계획 승인 모드입니다. (PLAN_MODE_ENABLED=true 일 때만 사용)
+
+서브 어시스턴트가 여러 개의 민감한 도구 호출을 SubmitPlan 하나로 묶어 제안하면
+run_conversation 이 계획 전체를 한 번의 tool_approval 로 반환하고, 승인(y) 후
+PlanExecutor 가 단계 간 의존 관계에 맞춰 실행합니다.
+- depends_on 과 인자의 "$s1.id" 참조가 의존 관계가 되며, 의존 관계가 없는 단계는 동시에 실행합니다.
+- 앞 단계 결과에서 ID를 읽어 뒤 단계 인자의 참조를 채웁니다.
+  결과가 API 응답 dict/list (str(dict) 또는 JSON) 이면 항목의 "id" 와 이름(name/title)을,
+  아니면 "과일 (ID: 3)", "냉장고 '우리집'가 생성되었습니다. (ID: 5)" 같은 글에서 ID와 앞의 항목 이름 전체를 읽습니다.
+- 실패한 단계에 의존하는 단계는 실행하지 않고 건너뜁니다.
+
+환경 변수
+- PLAN_MODE_ENABLED: 계획 승인 모드 사용 여부 (기본 false)
+- PLAN_MAX_CONCURRENCY: 동시에 실행할 최대 단계 수 (기본 4)
+- PLAN_MAX_STEPS: 계획 하나의 최대 단계 수 (기본 20)
+"""
+
+import ast
+import contextvars
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+from ..deadlines import STAGE_TOOL, DeadlineError, deadline_from_config
+from ..metrics import metrics
+from .models import SubmitPlan
+
+logger = logging.getLogger(__name__)
+
+PLAN_MODE_ENABLED = os.getenv("PLAN_MODE_ENABLED", "false").lower() in ("1", "true", "yes")
+PLAN_MAX_CONCURRENCY = int(os.getenv("PLAN_MAX_CONCURRENCY", "4"))
+PLAN_MAX_STEPS = int(os.getenv("PLAN_MAX_STEPS", "20"))
+
+# "$s1.id" (첫 번째 ID) 또는 "$s2.id.과일" (이름이 '과일'인 항목의 ID)
+_REFERENCE = re.compile(r"^\$(?P<step>[\w-]+)\.id(?:\.(?P<name>.+))?$")
+# 도구 결과 문자열의 "(ID: 3)" 과, 그 앞의 항목 이름 ("- Green Apple", "'우리집'가 생성되었습니다.")
+_RESULT_ID = re.compile(r"\(ID:\s*(?P<id>[^)\s,]+)\)")
+_QUOTED_NAME = re.compile(r"'([^']+)'")
+_ITEM_SEPARATOR = re.compile(r"[\n,:]")
+# handle_api_error / upstream_unavailable_message 가 만드는 실패 결과
+_FAILURE_PREFIXES = ("오류 발생", "[일시적 장애]")
+
+
+def _is_plan_call(tool_call: Dict[str, Any]) -> bool:
+    return tool_call.get("name") == SubmitPlan.__name__
+
+
+def _walk(value: Any):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _walk(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _walk(item)
+    else:
+        yield value
+
+
+def step_references(args: Dict[str, Any]) -> Set[str]:
+    """인자 안의 "$<step>.id" 참조가 가리키는 단계 ID"""
+    refs = set()
+    for value in _walk(args):
+        if isinstance(value, str):
+            match = _REFERENCE.match(value.strip())
+            if match:
+                refs.add(match.group("step"))
+    return refs
+
+
+def plan_dependencies(steps: Sequence[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    return {step["id"]: set(step.get("depends_on") or []) | step_references(step.get("args") or {}) for step in steps}
+
+
+def validate_plan(plan: Dict[str, Any], tool_names: Set[str]) -> List[str]:
+    """계획의 오류 목록을 반환합니다. (비어 있으면 실행 가능)"""
+    steps = plan.get("steps") or []
+    if not steps:
+        return ["계획에 단계가 없습니다."]
+    if len(steps) > PLAN_MAX_STEPS:
+        return [f"계획은 최대 {PLAN_MAX_STEPS}단계까지 가능합니다. ({len(steps)}단계)"]
+
+    errors = []
+    ids = [step.get("id") for step in steps]
+    duplicated = sorted({step_id for step_id in ids if ids.count(step_id) > 1})
+    if duplicated:
+        errors.append(f"단계 ID가 중복되었습니다: {', '.join(duplicated)}")
+    for step in steps:
+        if step.get("tool") not in tool_names:
+            errors.append(f"[{step.get('id')}] 사용할 수 없는 도구입니다: {step.get('tool')}")
+
+    dependencies = plan_dependencies(steps)
+    for step_id, deps in dependencies.items():
+        unknown = sorted(deps - set(ids))
+        if unknown:
+            errors.append(f"[{step_id}] 존재하지 않는 단계를 참조합니다: {', '.join(unknown)}")
+        if step_id in deps:
+            errors.append(f"[{step_id}] 자기 자신을 참조할 수 없습니다.")
+    if errors:
+        return errors
+
+    # 순환 의존 확인 (위상 정렬)
+    remaining = {step_id: set(deps) for step_id, deps in dependencies.items()}
+    while remaining:
+        ready = [step_id for step_id, deps in remaining.items() if not deps]
+        if not ready:
+            return [f"단계 사이에 순환 의존이 있습니다: {', '.join(sorted(remaining))}"]
+        for step_id in ready:
+            del remaining[step_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return []
+
+
+def _parse_structured(result: str) -> Any:
+    """API 응답을 그대로 문자열로 만든 결과(JSON 또는 str(dict))를 되돌립니다. 아니면 None"""
+    text = result.strip()
+    if not text.startswith(("{", "[")):
+        return None
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            return parse(text)
+        except (ValueError, SyntaxError, TypeError):
+            continue
+    return None
+
+
+def _structured_name(item: Dict[str, Any]) -> Optional[str]:
+    """API 응답 항목의 이름 (name, title, 또는 첫 번역의 name/title)"""
+    name = item.get("name") or item.get("title")
+    if not name:
+        translations = item.get("translations") or [item.get("translation") or {}]
+        first = translations[0] if translations and isinstance(translations[0], dict) else {}
+        name = first.get("name") or first.get("title")
+    return str(name) if name else None
+
+
+def _text_name(prefix: str) -> Optional[str]:
+    """"(ID: n)" 바로 앞 항목의 이름: 따옴표 안의 이름, 없으면 구분자(줄바꿈, 쉼표, 콜론) 뒤 글 전체"""
+    segment = _ITEM_SEPARATOR.split(prefix)[-1]
+    quoted = _QUOTED_NAME.findall(segment)
+    if quoted:
+        return quoted[-1]
+    return segment.strip().lstrip("-*• ").strip() or None
+
+
+def extract_ids(result: str) -> Tuple[List[str], Dict[str, str]]:
+    """도구 결과에서 (ID 목록, 이름별 ID) 를 추출합니다."""
+    ids, named = [], {}
+    data = _parse_structured(result)
+    if data is not None:
+        for item in data if isinstance(data, list) else [data]:
+            if not isinstance(item, dict) or item.get("id") is None:
+                continue
+            ids.append(str(item["id"]))
+            name = _structured_name(item)
+            if name:
+                named[name] = str(item["id"])
+        return ids, named
+
+    start = 0
+    for match in _RESULT_ID.finditer(result):
+        ids.append(match.group("id"))
+        name = _text_name(result[start:match.start()])
+        if name:
+            named[name] = match.group("id")
+        start = match.end()
+    return ids, named
+
+
+def _coerce(value: str) -> Any:
+    return int(value) if value.isdigit() else value
+
+
+def resolve_args(args: Any, outputs: Dict[str, Tuple[List[str], Dict[str, str]]]) -> Any:
+    """인자의 "$<step>.id" 참조를 앞 단계 결과의 ID로 바꿉니다."""
+    if isinstance(args, dict):
+        return {key: resolve_args(value, outputs) for key, value in args.items()}
+    if isinstance(args, list):
+        return [resolve_args(value, outputs) for value in args]
+    if not isinstance(args, str):
+        return args
+    match = _REFERENCE.match(args.strip())
+    if not match:
+        return args
+
+    ids, named = outputs.get(match.group("step"), ([], {}))
+    name = match.group("name")
+    if name is None:
+        if not ids:
+            raise ValueError(f"{match.group('step')} 단계 결과에서 ID를 찾을 수 없습니다.")
+        return _coerce(ids[0])
+    if name not in named:
+        raise ValueError(f"{match.group('step')} 단계 결과에서 '{name}'의 ID를 찾을 수 없습니다.")
+    return _coerce(named[name])
+
+
+def plan_approval_tools(tool_calls: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    tool_approval 응답의 tools 목록을 만듭니다.
+    SubmitPlan 호출은 단계별 항목으로 펼쳐서 사용자가 계획 전체를 한 번에 확인할 수 있게 합니다.
+    """
+    tools = []
+    for tool_call in tool_calls:
+        if not _is_plan_call(tool_call):
+            tools.append(tool_call)
+            continue
+        plan = tool_call.get("args") or {}
+        dependencies = plan_dependencies(plan.get("steps") or [])
+        for step in plan.get("steps") or []:
+            tools.append({
+                "name": step.get("tool"),
+                "args": step.get("args") or {},
+                "id": f"{tool_call['id']}:{step.get('id')}",
+                "type": "tool_call",
+                "plan_step": step.get("id"),
+                "depends_on": sorted(dependencies.get(step.get("id"), ())),
+                "plan_summary": plan.get("summary"),
+            })
+    return tools
+
+
+class PlanExecutor:
+    """승인된 SubmitPlan 을 실행하는 그래프 노드"""
+
+    def __init__(self, tools: Sequence[Any], name: str, max_concurrency: int = PLAN_MAX_CONCURRENCY):
+        self.tools = {tool.name: tool for tool in tools}
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+
+    def validate(self, tool_call: Dict[str, Any]) -> List[str]:
+        return validate_plan(tool_call.get("args") or {}, set(self.tools))
+
+    def _answer_others(self, message: Any) -> List[ToolMessage]:
+        """SubmitPlan 과 함께 호출된 다른 도구에도 응답을 채웁니다."""
+        return [
+            ToolMessage(
+                tool_call_id=tc["id"],
+                name=tc["name"],
+                content="SubmitPlan 과 함께 호출한 도구는 실행하지 않았습니다. 필요하면 계획의 단계로 포함하세요.",
+            )
+            for tc in message.tool_calls
+            if not _is_plan_call(tc)
+        ]
+
+    def reject(self, state: Dict) -> dict:
+        """검증에 실패한 계획을 어시스턴트에게 돌려보내는 노드"""
+        message = state["messages"][-1]
+        responses = self._answer_others(message)
+        for tool_call in message.tool_calls:
+            if _is_plan_call(tool_call):
+                responses.append(self._rejection(tool_call, self.validate(tool_call)))
+        return {"messages": responses}
+
+    def _rejection(self, tool_call: Dict[str, Any], errors: List[str]) -> ToolMessage:
+        metrics.increment("plan_rejected_total", assistant=self.name)
+        return ToolMessage(
+            tool_call_id=tool_call["id"],
+            name=tool_call["name"],
+            content="계획을 실행할 수 없습니다. 고쳐서 다시 제출하세요.\n" + "\n".join(f"- {e}" for e in errors),
+        )
+
+    def _run_step(self, step: Dict[str, Any], args: Dict[str, Any], config: RunnableConfig) -> str:
+        return str(self.tools[step["tool"]].invoke(args, config))
+
+    def execute(self, plan: Dict[str, Any], config: RunnableConfig) -> List[Dict[str, Any]]:
+        """
+        계획을 실행하고 단계별 결과(id, tool, status, result)를 계획 순서대로 반환합니다.
+        status 는 success / failure / skipped 중 하나입니다.
+        """
+        steps = {step["id"]: step for step in plan["steps"]}
+        pending = plan_dependencies(plan["steps"])
+        deadline = deadline_from_config(config)
+        outputs: Dict[str, Tuple[List[str], Dict[str, str]]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def finish(step_id: str, status: str, result: str) -> None:
+            results[step_id] = {"id": step_id, "tool": steps[step_id]["tool"], "status": status, "result": result}
+            metrics.increment("plan_steps_total", assistant=self.name, outcome=status)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(steps)), thread_name_prefix="plan-step") as pool:
+            running = {}
+            while pending or running:
+                # 실패/건너뜀 단계에 의존하는 단계는 건너뜁니다.
+                for step_id, deps in list(pending.items()):
+                    blocked = sorted(d for d in deps if d in results and results[d]["status"] != "success")
+                    if blocked:
+                        del pending[step_id]
+                        finish(step_id, "skipped", f"선행 단계({', '.join(blocked)})가 완료되지 않아 실행하지 않았습니다.")
+
+                ready = [step_id for step_id, deps in pending.items() if all(d in results for d in deps)]
+                if ready and deadline is not None:
+                    deadline.check(STAGE_TOOL)
+                for step_id in ready:
+                    del pending[step_id]
+                    step = steps[step_id]
+                    try:
+                        args = resolve_args(step.get("args") or {}, outputs)
+                    except ValueError as e:
+                        finish(step_id, "failure", f"오류 발생: {e}")
+                        continue
+                    # 단계마다 컨텍스트(요청 마감 시간, 토큰 사용량 등)를 복사해 작업 스레드에서 실행
+                    future = pool.submit(contextvars.copy_context().run, self._run_step, step, args, config)
+                    running[future] = step_id
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_id = running.pop(future)
+                    try:
+                        result = future.result()
+                    except DeadlineError:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    except Exception as e:
+                        logger.warning(f"[{self.name}] 계획 단계 {step_id} 실패: {e}")
+                        finish(step_id, "failure", f"오류 발생: {e}")
+                        continue
+                    if result.startswith(_FAILURE_PREFIXES):
+                        finish(step_id, "failure", result)
+                    else:
+                        outputs[step_id] = extract_ids(result)
+                        finish(step_id, "success", result)
+
+        return [results[step["id"]] for step in plan["steps"]]
+
+    def __call__(self, state: Dict, config: RunnableConfig) -> dict:
+        message = state["messages"][-1]
+        responses = self._answer_others(message)
+        for tool_call in message.tool_calls:
+            if not _is_plan_call(tool_call):
+                continue
+            errors = self.validate(tool_call)
+            if errors:
+                responses.append(self._rejection(tool_call, errors))
+                continue
+            started = time.perf_counter()
+            step_results = self.execute(tool_call["args"], config)
+            metrics.observe("plan_execution_seconds", time.perf_counter() - started, assistant=self.name)
+
+            succeeded = sum(1 for r in step_results if r["status"] == "success")
+            lines = [f"계획 실행 결과 (성공 {succeeded}/{len(step_results)}):"]
+            labels = {"success": "완료", "failure": "실패", "skipped": "건너뜀"}
+            for r in step_results:
+                lines.append(f"[{r['id']}] {r['tool']} ({labels[r['status']]}): {r['result']}")
+            logger.info(f"[{self.name}] 계획 실행 완료: {succeeded}/{len(step_results)} 성공")
+            responses.append(ToolMessage(tool_call_id=tool_call["id"], name=tool_call["name"], content="\n".join(lines)))
+        return {"messages": responses}
+
+
+def find_plan_call(tool_calls: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return next((tc for tc in tool_calls if _is_plan_call(tc)), None)
@@ -0,0 +1,96 @@
+"""
+어시스턴트 프롬프트 조립을 담당합니다.
+
+PROMPT_LAYOUT=cache (기본값)이면 제공자 측 프롬프트 프리픽스 캐시가 적중하도록
+[정적 규칙] → [바인딩된 도구 스키마] → [천천히 바뀌는 컨텍스트(시간)] → [요청별 컨텍스트] → [메시지]
+순서로 배치합니다. 도구 스키마는 OpenAI API의 tools 파라미터로 전달되므로
+바인딩 순서를 고정하는 것으로 충분합니다.
+
+시간은 PROMPT_TIME_GRANULARITY(초, 기본 3600) 단위로 내림하여 호출마다 프리픽스가 바뀌지 않게 합니다.
+PROMPT_LAYOUT=legacy 이면 기존 배치(마이크로초 단위 시간, 규칙 중간의 컨텍스트)를 사용합니다.
+"""
+
+import os
+from datetime import datetime
+
+from langchain_core.prompts import ChatPromptTemplate
+
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "cache").lower()
+PROMPT_TIME_GRANULARITY = int(os.getenv("PROMPT_TIME_GRANULARITY", "3600"))
+
+
+def prompt_time() -> str:
+    """PROMPT_TIME_GRANULARITY 단위로 내림한 현재 시각"""
+    now = datetime.now()
+    if PROMPT_TIME_GRANULARITY <= 1:
+        return now.strftime("%Y-%m-%d %H:%M:%S")
+    rounded = datetime.fromtimestamp(now.timestamp() // PROMPT_TIME_GRANULARITY * PROMPT_TIME_GRANULARITY)
+    return rounded.strftime("%Y-%m-%d %H:%M")
+
+
+# 메인 어시스턴트 정적 규칙
+PRIMARY_ASSISTANT_RULES = (
+    "You are the main, high-level AI assistant for Acme. "
+    "You handle general inquiries and pass specialized tasks to sub-assistants (RefrigeratorAssistant, RecipeAssistant, etc.).\n\n"
+
+    "=== IMPORTANT RULES ===\n"
+    "1. You can only call ONE function (tool) per assistant message.\n"
+    "2. If the user wants to do a specialized task, call the appropriate sub-assistant via the function call.\n"
+    "3. Do not reveal the existence of sub-assistants or function calls to the user.\n"
+    "4. If the user wants to do multiple tasks, handle them one at a time in sequence.\n"
+    "5. If searching or requesting external data, be persistent. Expand query if needed. "
+    "6. If user wants to do a task related to recipe and refrigerator in the same time, do not call both tools in the same time, but handle them one at a time in sequence.\n"
+    "Do not give up after one empty search.\n\n"
+
+    "You can handle:\n"
+    "- Basic Q&A about Acme.\n"
+    "- Searching for general info.\n"
+    "But if the user specifically needs to create or update something that belongs to specialized domain,\n"
+    "delegate that to the corresponding sub-assistant.\n\n"
+)
+
+_PRIMARY_TIME = "=== Current Date & Time ===\n{time}\n\n"
+_PRIMARY_CONTEXT = "Context: {context_info}\n\n"
+_PRIMARY_CLOSING = "=== If you do not have enough context to answer, ask clarifying questions. ==="
+
+
+def create_primary_assistant_prompt() -> ChatPromptTemplate:
+    """메인 어시스턴트 프롬프트를 생성합니다."""
+    if PROMPT_LAYOUT == "legacy":
+        return ChatPromptTemplate.from_messages([
+            ("system", PRIMARY_ASSISTANT_RULES + _PRIMARY_TIME + _PRIMARY_CONTEXT + _PRIMARY_CLOSING),
+            ("placeholder", "{messages}"),
+        ]).partial(time=datetime.now)
+
+    return ChatPromptTemplate.from_messages([
+        ("system", PRIMARY_ASSISTANT_RULES + _PRIMARY_CLOSING),
+        ("system", _PRIMARY_TIME.strip()),
+        ("system", _PRIMARY_CONTEXT.strip()),
+        ("placeholder", "{messages}"),
+    ]).partial(time=prompt_time)
+
+
+def create_sub_assistant_prompt(system_prompt: str) -> ChatPromptTemplate:
+    """
+    서브 어시스턴트 프롬프트를 생성합니다.
+    서브 어시스턴트 시스템 프롬프트는 요청별 컨텍스트가 없고 시간은 끝부분에만 있으므로
+    cache 레이아웃에서는 시간만 내림합니다.
+    """
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("placeholder", "{messages}"),
+    ])
+    return prompt.partial(time=datetime.now if PROMPT_LAYOUT == "legacy" else prompt_time)
+
+
+# 계획 승인 모드 (PLAN_MODE_ENABLED=true) 에서 서브 어시스턴트 시스템 프롬프트 뒤에 붙는 규칙
+PLAN_MODE_RULES = (
+    "=== PLAN MODE ===\n"
+    "When the user's request needs TWO OR MORE sensitive actions (create/update/delete), do not call them one by one.\n"
+    "Instead call `SubmitPlan` ONCE with every action as an ordered step; the user approves the whole plan at once.\n"
+    "- Each step has a short id (s1, s2, ...), the tool name, its args and `depends_on` (ids that must finish first).\n"
+    "- To use an ID created by an earlier step, write the arg value as \"$s1.id\" (first ID in that step's result) "
+    "or \"$s2.id.<name>\" (ID of the item with that name, e.g. \"$s2.id.과일\" for a created category).\n"
+    "- Steps without dependencies run concurrently, so only add dependencies that are really needed.\n"
+    "- Use safe tools first if you need existing IDs. For a single sensitive action, call the tool directly."
+)
@@ -0,0 +1,204 @@
+"""
+primary_assistant 앞단의 의미 기반 답변 캐시입니다. (SEMANTIC_CACHE_ENABLED=true 일 때만 사용)
+
+- 도구 호출 없이 바로 답한 턴만 저장합니다. (사용자 데이터를 조회/변경한 답변은 저장하지 않음)
+  빈 응답 대신 돌려준 대체 응답(response_metadata["fallback"])도 저장하지 않습니다.
+- 대화 맥락에 의존하지 않는 질문만 대상으로 합니다.
+  스레드의 이전 메시지 수가 SEMANTIC_CACHE_MAX_HISTORY(기본 0) 이하일 때만 조회/저장합니다.
+- 캐시 범위는 (user_language, page, user_id, refrigerator_id, recipe_id, category_id) 입니다.
+  primary_assistant 프롬프트에 사용자 ID와 현재 냉장고/레시피/카테고리 ID가 들어가므로,
+  그 맥락을 쓴 답변이 다른 사용자나 다른 화면에 재사용되지 않도록 사용자와 맥락별로 따로 저장합니다.
+- 질문 임베딩의 코사인 유사도가 SEMANTIC_CACHE_THRESHOLD 이상이면 적중입니다.
+  임계값은 임베더에 따라 달라야 합니다. (hashing 임베더는 openai 보다 낮은 유사도를 냅니다)
+- 항목은 SEMANTIC_CACHE_TTL_SECONDS 후 만료되고, 범위별 SEMANTIC_CACHE_MAX_ENTRIES 를 넘으면 오래된 것부터 제거합니다.
+  범위 수가 SEMANTIC_CACHE_MAX_SCOPES(기본 10000)를 넘으면 가장 오래 쓰지 않은 범위를 통째로 제거합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from ..embeddings import create_embedder
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_MAX_HISTORY = int(os.getenv("SEMANTIC_CACHE_MAX_HISTORY", "0"))
+
+# (user_language, page, user_id, refrigerator_id, recipe_id, category_id)
+Scope = Tuple[str, ...]
+
+# 프롬프트 맥락(fetch_context)에 들어가는 설정 키
+_SCOPE_KEYS = ("user_language", "page", "user_id", "refrigerator_id", "recipe_id", "category_id")
+
+
+def cache_scope(configurable: Dict[str, Any]) -> Scope:
+    """요청 설정에서 캐시 범위를 만듭니다. (언어 기본값 en, 나머지 기본값 None)"""
+    defaults = {"user_language": "en"}
+    return tuple(str(configurable.get(key) or defaults.get(key)) for key in _SCOPE_KEYS)
+
+
+class _ScopeEntries:
+    """범위 하나의 캐시 항목 (벡터 행렬과 답변 목록)"""
+
+    def __init__(self, dimensions: int):
+        self.vectors = np.empty((0, dimensions), dtype=np.float32)
+        self.questions: List[str] = []
+        self.answers: List[str] = []
+        self.expires_at: List[float] = []
+
+    def keep(self, mask: np.ndarray) -> None:
+        indexes = np.flatnonzero(mask)
+        self.vectors = self.vectors[indexes]
+        self.questions = [self.questions[i] for i in indexes]
+        self.answers = [self.answers[i] for i in indexes]
+        self.expires_at = [self.expires_at[i] for i in indexes]
+
+
+class SemanticCache:
+    """질문 임베딩 유사도로 이전 답변을 재사용하는 캐시"""
+
+    def __init__(
+        self,
+        embedder: Embeddings,
+        threshold: float = 0.92,
+        ttl_seconds: float = 86400,
+        max_entries: int = 1000,
+        max_scopes: int = 10000,
+    ):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_scopes = max_scopes
+        self._lock = threading.Lock()
+        self._scopes: "OrderedDict[Scope, _ScopeEntries]" = OrderedDict()
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedder.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _purge_expired(self, entries: _ScopeEntries) -> None:
+        now = time.time()
+        if entries.expires_at and min(entries.expires_at) < now:
+            entries.keep(np.asarray(entries.expires_at) >= now)
+
+    def lookup(self, scope: Scope, question: str) -> Tuple[Optional[str], float, np.ndarray]:
+        """(답변 또는 None, 최고 유사도, 질문 벡터)를 반환합니다."""
+        vector = self.embed(question)
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if entries is None or not entries.answers:
+                return None, 0.0, vector
+            self._purge_expired(entries)
+            if not entries.answers:
+                return None, 0.0, vector
+            similarities = entries.vectors @ vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity >= self.threshold:
+                return entries.answers[best], similarity, vector
+        return None, similarity, vector
+
+    def store(self, scope: Scope, question: str, answer: str, vector: Optional[np.ndarray] = None) -> None:
+        if vector is None:
+            vector = self.embed(question)
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if entries is None:
+                entries = self._scopes[scope] = _ScopeEntries(vector.shape[0])
+                while len(self._scopes) > self.max_scopes:
+                    _, evicted_entries = self._scopes.popitem(last=False)
+                    metrics.increment("semantic_cache_evictions_total", len(evicted_entries.answers))
+            self._scopes.move_to_end(scope)
+            self._purge_expired(entries)
+
+            # 거의 같은 질문이 이미 있으면 교체
+            if entries.answers:
+                entries.keep(entries.vectors @ vector < self.threshold)
+
+            if len(entries.answers) >= self.max_entries:
+                evicted = len(entries.answers) - self.max_entries + 1
+                entries.keep(np.arange(len(entries.answers)) >= evicted)
+                metrics.increment("semantic_cache_evictions_total", evicted)
+
+            entries.vectors = np.vstack([entries.vectors, vector[np.newaxis, :]])
+            entries.questions.append(question)
+            entries.answers.append(answer)
+            entries.expires_at.append(time.time() + self.ttl_seconds)
+            metrics.set_gauge("semantic_cache_entries", sum(len(e.answers) for e in self._scopes.values()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+        metrics.set_gauge("semantic_cache_entries", 0)
+
+
+class SemanticCacheNode:
+    """어시스턴트 노드를 감싸 캐시 적중 시 LLM 호출 없이 답변하는 노드"""
+
+    def __init__(self, assistant, cache: SemanticCache, max_history: int = 0):
+        self.assistant = assistant
+        self.cache = cache
+        self.max_history = max_history
+
+    def _standalone_question(self, state: Dict) -> Optional[str]:
+        messages = state["messages"]
+        if not messages or len(messages) - 1 > self.max_history:
+            return None
+        last = messages[-1]
+        if not isinstance(last, HumanMessage) or not isinstance(last.content, str):
+            return None
+        return last.content.strip() or None
+
+    def __call__(self, state: Dict, config: RunnableConfig):
+        question = self._standalone_question(state)
+        if question is None:
+            metrics.increment("semantic_cache_lookups_total", result="skip")
+            return self.assistant(state, config)
+
+        scope = cache_scope(config.get("configurable", {}))
+
+        answer, similarity, vector = self.cache.lookup(scope, question)
+        metrics.observe("semantic_cache_similarity", similarity, language=scope[0])
+        if answer is not None:
+            metrics.increment("semantic_cache_lookups_total", result="hit", language=scope[0])
+            logger.info(f"의미 캐시 적중 (유사도 {similarity:.3f}, 범위 {scope})")
+            return {
+                "messages": AIMessage(
+                    content=answer,
+                    response_metadata={"semantic_cache": {"similarity": similarity}},
+                )
+            }
+
+        metrics.increment("semantic_cache_lookups_total", result="miss", language=scope[0])
+        result = self.assistant(state, config)
+        message = result["messages"]
+        if message.response_metadata.get("fallback"):
+            metrics.increment("semantic_cache_store_skipped_total", reason="fallback")
+            return result
+        if not message.tool_calls and isinstance(message.content, str) and message.content.strip():
+            self.cache.store(scope, question, message.content, vector)
+        return result
+
+
+def create_semantic_cache() -> Optional[SemanticCache]:
+    """환경 변수 설정에 맞는 의미 캐시를 생성합니다. 비활성화되어 있으면 None"""
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    return SemanticCache(
+        embedder=create_embedder(),
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+        ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400")),
+        max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000")),
+        max_scopes=int(os.getenv("SEMANTIC_CACHE_MAX_SCOPES", "10000")),
+    )
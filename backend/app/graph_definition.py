@@ -26,10 +26,17 @@ from .graph.models import (
     Assistant
 )
 from .graph.helpers import update_dialog_stack, create_entry_node, pop_dialog_state, handle_tool_error
-from .graph.node_factory import create_tool_node_with_fallback, create_sub_assistant, llm
+from .graph.node_factory import (
+    create_tool_node_with_fallback,
+    create_sub_assistant,
+    create_route_primary_assistant,
+)
+from .llm import get_llm
 
 # 서브 어시스턴트 설정 관리 모듈 임포트
 from .graph import SUB_ASSISTANTS, register_sub_assistants
+from .graph.prompts import create_primary_assistant_prompt
+from .graph.semantic_cache import SemanticCacheNode, SEMANTIC_CACHE_MAX_HISTORY, create_semantic_cache
 
 
 def build_graph() -> StateGraph:
@@ -66,72 +73,35 @@ def build_graph() -> StateGraph:
     builder.add_conditional_edges("fetch_context_info", route_to_workflow)
 
     # 2) 메인 어시스턴트 설정
-    primary_assistant_prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                # ---- System Prompt Start ----
-                "You are the main, high-level AI assistant for Acme. "
-                "You handle general inquiries and pass specialized tasks to sub-assistants (RefrigeratorAssistant, RecipeAssistant, etc.).\n\n"
-
-                "=== IMPORTANT RULES ===\n"
-                "1. You can only call ONE function (tool) per assistant message.\n"
-                "2. If the user wants to do a specialized task, call the appropriate sub-assistant via the function call.\n"
-                "3. Do not reveal the existence of sub-assistants or function calls to the user.\n"
-                "4. If the user wants to do multiple tasks, handle them one at a time in sequence.\n"
-                "5. If searching or requesting external data, be persistent. Expand query if needed. "
-                "6. If user wants to do a task related to recipe and refrigerator in the same time, do not call both tools in the same time, but handle them one at a time in sequence.\n"
-                "Do not give up after one empty search.\n\n"
-
-                "You can handle:\n"
-                "- Basic Q&A about Acme.\n"
-                "- Searching for general info.\n"
-                "But if the user specifically needs to create or update something that belongs to specialized domain,\n"
-                "delegate that to the corresponding sub-assistant.\n\n"
-
-                "=== Current Date & Time ===\n"
-                "{time}\n\n"
-
-                "Context: {context_info}\n\n"
-
-                "=== If you do not have enough context to answer, ask clarifying questions. ==="
-                # ---- System Prompt End ----
-            ),
-            ("placeholder", "{messages}"),
-        ]
-    ).partial(time=datetime.now)
+    primary_assistant_prompt = create_primary_assistant_prompt()
 
     # 서브 어시스턴트 전환 도구 목록 동적 생성
     transition_tools = [config.transition_tool for config in SUB_ASSISTANTS]
     
     primary_tools = []  # 필요시 추가
-    assistant_runnable = primary_assistant_prompt | llm.bind_tools(
-        primary_tools + transition_tools
+    assistant_runnable = primary_assistant_prompt | get_llm(
+        "route", tools=primary_tools + transition_tools
     )
 
-    builder.add_node("primary_assistant", Assistant(assistant_runnable))
-    builder.add_node("primary_assistant_tools", create_tool_node_with_fallback(primary_tools))
+    primary_assistant = Assistant(
+        assistant_runnable,
+        prompt=primary_assistant_prompt,
+        tools=primary_tools + transition_tools,
+        name="primary_assistant",
+    )
+    # 일반 Q&A 의미 캐시 (SEMANTIC_CACHE_ENABLED=true 일 때만)
+    semantic_cache = create_semantic_cache()
+    if semantic_cache is not None:
+        primary_assistant = SemanticCacheNode(primary_assistant, semantic_cache, SEMANTIC_CACHE_MAX_HISTORY)
 
-    # 메인 어시스턴트 라우팅 함수 동적 생성
-    def route_primary_assistant(state: Dict):
-        route = tools_condition(state)
-        if route == END:
-            return END
-        tool_calls = state["messages"][-1].tool_calls
-        if tool_calls:
-            name = tool_calls[0]["name"]
-            # 동적으로 서브 어시스턴트 전환 처리
-            for config in SUB_ASSISTANTS:
-                if name == config.transition_tool.__name__:
-                    return f"enter_{config.id}"
-            return "primary_assistant_tools"
-        raise ValueError("No tool calls found but not END")
+    builder.add_node("primary_assistant", primary_assistant)
+    builder.add_node("primary_assistant_tools", create_tool_node_with_fallback(primary_tools))
 
     # 메인 어시스턴트 엣지 연결 동적 생성
     edge_destinations = [f"enter_{config.id}" for config in SUB_ASSISTANTS] + ["primary_assistant_tools", END]
     builder.add_conditional_edges(
         "primary_assistant",
-        route_primary_assistant,
+        create_route_primary_assistant(SUB_ASSISTANTS),
         edge_destinations,
     )
     builder.add_edge("primary_assistant_tools", "primary_assistant")
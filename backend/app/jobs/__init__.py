@@ -0,0 +1,6 @@
+"""
+jobs 패키지는 오래 걸리는 LLM 작업을 비동기로 실행하는 작업 관리자와 저장소를 제공합니다.
+"""
+
+from .store import JobStore, MemoryJobStore, SQLiteJobStore, create_job_store, INTERRUPTED_ERROR, TERMINAL_STATUSES
+from .manager import JobManager, JobQueueFull
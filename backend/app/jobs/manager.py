@@ -0,0 +1,144 @@
+"""
+오래 걸리는 LLM 작업을 워커 풀에서 실행하는 작업 관리자입니다.
+
+요청 핸들러는 submit() 으로 작업 ID를 즉시 받아 반환하고,
+클라이언트는 GET /api/jobs/{id} 폴링이나 SSE(/api/jobs/{id}/events)로 완료를 확인합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from ..llm import Priority, llm_priority
+from ..metrics import metrics
+from .store import JobStore, TERMINAL_STATUSES, create_job_store
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Any]
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업 수가 상한을 넘었을 때 발생하는 예외"""
+
+
+class JobManager:
+    """작업 등록/실행/상태 조회를 담당하는 관리자"""
+
+    def __init__(self, store: JobStore, max_workers: int = 4, max_pending: int = 100):
+        self.store = store
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._handlers: Dict[str, Tuple[JobHandler, Priority]] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        # 이전 프로세스에서 끝나지 못한 작업은 실행할 워커가 없으므로 실패 처리합니다.
+        interrupted = self.store.fail_unfinished()
+        if interrupted:
+            logger.warning(f"재시작 전에 끝나지 못한 작업 {interrupted}개를 실패 처리했습니다.")
+            metrics.increment("jobs_interrupted_total", interrupted)
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        return cls(
+            store=create_job_store(),
+            max_workers=int(os.getenv("JOB_WORKERS", "4")),
+            max_pending=int(os.getenv("JOB_MAX_PENDING", "100")),
+        )
+
+    def register(self, kind: str, handler: JobHandler, priority: Priority = Priority.BATCH) -> None:
+        """작업 종류별 실행 함수를 등록합니다."""
+        self._handlers[kind] = (handler, priority)
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """작업을 대기열에 넣고 생성된 작업 레코드를 반환합니다."""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                metrics.increment("jobs_rejected_total", kind=kind)
+                raise JobQueueFull(f"대기 중인 작업이 너무 많습니다 ({self._pending})")
+            self._pending += 1
+            metrics.set_gauge("jobs_pending", self._pending)
+
+        job = None
+        try:
+            self.store.purge_expired()
+            job = self.store.create(str(uuid.uuid4()), kind)
+            self._executor.submit(self._run, job["id"], kind, payload)
+        except BaseException as e:
+            # 워커에 넘기지 못했으면 자리를 돌려주고 만든 레코드는 실패 처리합니다.
+            self._release()
+            if job is not None:
+                self.store.update(job["id"], status="failed", error=str(e))
+            raise
+        metrics.increment("jobs_submitted_total", kind=kind)
+        return job
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            metrics.set_gauge("jobs_pending", self._pending)
+
+    def _run(self, job_id: str, kind: str, payload: Dict[str, Any]) -> None:
+        handler, priority = self._handlers[kind]
+        started = time.perf_counter()
+        self.store.update(job_id, status="running")
+        metrics.add_gauge("jobs_running", 1)
+        try:
+            with llm_priority(priority):
+                result = handler(payload)
+            self.store.update(job_id, status="succeeded", result=result)
+            status = "succeeded"
+        except Exception as e:
+            logger.error(f"작업 실패 ({kind}, {job_id}): {e}", exc_info=True)
+            self.store.update(job_id, status="failed", error=str(e))
+            status = "failed"
+        finally:
+            metrics.add_gauge("jobs_running", -1)
+            self._release()
+
+        metrics.increment("jobs_completed_total", kind=kind, status=status)
+        metrics.observe("job_duration_seconds", time.perf_counter() - started, kind=kind)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    async def events(
+        self,
+        job_id: str,
+        poll_interval: float = 0.5,
+        heartbeat_interval: float = 15.0,
+    ) -> AsyncIterator[str]:
+        """작업 상태가 바뀔 때마다 SSE 이벤트 문자열을 생성합니다. 종료 상태에서 끝납니다."""
+        last_updated = None
+        last_sent = time.monotonic()
+        while True:
+            job = self.store.get(job_id)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'job not found'})}\n\n"
+                return
+
+            if job["updated_at"] != last_updated:
+                last_updated = job["updated_at"]
+                last_sent = time.monotonic()
+                yield f"event: {job['status']}\ndata: {json.dumps(job, ensure_ascii=False)}\n\n"
+                if job["status"] in TERMINAL_STATUSES:
+                    return
+            elif time.monotonic() - last_sent >= heartbeat_interval:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+
+            await asyncio.sleep(poll_interval)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """워커 풀을 멈추고 저장소를 닫습니다. (끝나지 않은 작업은 다음 시작 때 실패 처리됨)"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self.store.close()
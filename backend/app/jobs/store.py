@@ -0,0 +1,210 @@
+"""
+작업(Job) 상태와 결과를 TTL과 함께 보관하는 저장소입니다.
+
+JOB_STORE 환경 변수로 구현을 선택합니다.
+- memory (기본값): 프로세스 메모리
+- sqlite: JOB_SQLITE_PATH 파일 (기본값: jobs.sqlite3)
+
+작업은 만든 프로세스의 워커 풀에서만 실행되므로, 재시작 전에 끝나지 못한 작업(queued, running)은
+시작할 때 fail_unfinished() 로 실패 처리합니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+# 종료 상태
+TERMINAL_STATUSES = ("succeeded", "failed")
+# 재시작 시 실패 처리하는 미완료 작업의 오류 메시지
+INTERRUPTED_ERROR = "서버가 다시 시작되어 작업이 중단되었습니다. 다시 요청해주세요."
+
+
+class JobStore(ABC):
+    """작업 저장소 인터페이스"""
+
+    def __init__(self, ttl_seconds: float = 3600):
+        self.ttl_seconds = ttl_seconds
+
+    def _new_record(self, job_id: str, kind: str) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "expires_at": now + self.ttl_seconds,
+        }
+
+    @abstractmethod
+    def create(self, job_id: str, kind: str) -> Dict[str, Any]:
+        """queued 상태의 작업 레코드를 만들어 반환합니다."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 레코드를 반환합니다. (없거나 만료되었으면 None)"""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        """작업 레코드 필드를 바꾸고 만료 시간을 연장합니다. (없으면 None)"""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """만료된 작업을 지우고 지운 수를 반환합니다."""
+
+    @abstractmethod
+    def fail_unfinished(self, error: str = INTERRUPTED_ERROR) -> int:
+        """종료 상태가 아닌 작업을 모두 failed 로 바꾸고 바꾼 수를 반환합니다."""
+
+    def close(self) -> None:
+        """저장소 자원을 정리합니다."""
+
+
+class MemoryJobStore(JobStore):
+    """프로세스 메모리 저장소"""
+
+    def __init__(self, ttl_seconds: float = 3600):
+        super().__init__(ttl_seconds)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def create(self, job_id: str, kind: str) -> Dict[str, Any]:
+        record = self._new_record(job_id, kind)
+        with self._lock:
+            self._jobs[job_id] = record
+        return dict(record)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            if record["expires_at"] < time.time():
+                del self._jobs[job_id]
+                return None
+            return dict(record)
+
+    def update(self, job_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            now = time.time()
+            record.update(fields, updated_at=now, expires_at=now + self.ttl_seconds)
+            return dict(record)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, r in self._jobs.items() if r["expires_at"] < now]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def fail_unfinished(self, error: str = INTERRUPTED_ERROR) -> int:
+        now = time.time()
+        with self._lock:
+            unfinished = [r for r in self._jobs.values() if r["status"] not in TERMINAL_STATUSES]
+            for record in unfinished:
+                record.update(status="failed", error=error, updated_at=now, expires_at=now + self.ttl_seconds)
+        return len(unfinished)
+
+
+class SQLiteJobStore(JobStore):
+    """SQLite 파일 저장소 (프로세스 재시작 후에도 결과 유지)"""
+
+    def __init__(self, path: str = "jobs.sqlite3", ttl_seconds: float = 3600):
+        super().__init__(ttl_seconds)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at_idx ON jobs (expires_at)")
+        self._conn.commit()
+        self._closed = False
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO jobs (id, data, expires_at) VALUES (?, ?, ?)",
+            (record["id"], json.dumps(record, ensure_ascii=False), record["expires_at"]),
+        )
+        self._conn.commit()
+
+    def create(self, job_id: str, kind: str) -> Dict[str, Any]:
+        record = self._new_record(job_id, kind)
+        with self._lock:
+            self._write(record)
+        return record
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE id = ? AND expires_at >= ?", (job_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, job_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            # 종료 후에도 실행 중이던 작업이 끝나며 호출할 수 있습니다. (다음 시작 때 실패 처리됨)
+            if self._closed:
+                return None
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            record = json.loads(row[0])
+            now = time.time()
+            record.update(fields, updated_at=now, expires_at=now + self.ttl_seconds)
+            self._write(record)
+        return record
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM jobs WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def fail_unfinished(self, error: str = INTERRUPTED_ERROR) -> int:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM jobs WHERE expires_at >= ?", (now,)).fetchall()
+            failed = 0
+            for (data,) in rows:
+                record = json.loads(data)
+                if record["status"] in TERMINAL_STATUSES:
+                    continue
+                record.update(status="failed", error=error, updated_at=now, expires_at=now + self.ttl_seconds)
+                self._write(record)
+                failed += 1
+        return failed
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._conn.close()
+
+
+def create_job_store() -> JobStore:
+    """환경 변수 설정에 맞는 작업 저장소를 생성합니다."""
+    ttl_seconds = float(os.getenv("JOB_TTL_SECONDS", "3600"))
+    backend = os.getenv("JOB_STORE", "memory").lower()
+    if backend == "sqlite":
+        return SQLiteJobStore(os.getenv("JOB_SQLITE_PATH", "jobs.sqlite3"), ttl_seconds)
+    if backend != "memory":
+        raise ValueError(f"Unknown JOB_STORE: {backend}")
+    return MemoryJobStore(ttl_seconds)
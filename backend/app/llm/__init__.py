@@ -0,0 +1,27 @@
+"""
+llm 패키지는 작업 종류별 LLM 클라이언트 생성과 호출 정책(커넥션 풀, 타임아웃, 재시도, 메트릭, 토큰 예산)을 제공합니다.
+"""
+
+from .factory import LLM_PRICES, LLM_PROFILES, LLMProfile, get_llm, get_http_clients, close_llm_clients, llm_cost
+from .transport import RetryPolicy, RetryingTransport, AsyncRetryingTransport
+from .scheduler import (
+    Priority,
+    llm_priority,
+    llm_scheduler,
+    LLMScheduler,
+    LLMSchedulerError,
+    SchedulerQueueFull,
+    SchedulerTimeout,
+    find_scheduler_error,
+)
+from .tokens import (
+    TokenBudget,
+    TokenBudgetExceeded,
+    TokenUsage,
+    DEFAULT_TOKEN_BUDGET,
+    count_text_tokens,
+    count_message_tokens,
+    count_tool_tokens,
+    track_token_usage,
+    current_token_usage,
+)
@@ -0,0 +1,305 @@
+"""
+모든 엔드포인트와 어시스턴트가 공유하는 LLM 클라이언트 팩토리입니다.
+
+- 작업 종류(task)별로 모델/온도를 고릅니다. 짧은 작업은 더 빠르고 저렴한 모델을 쓸 수 있습니다.
+  route(메인 어시스턴트 라우팅), tool_calling(서브 어시스턴트), long_form(레시피 생성/포맷팅),
+  translation(레시피 본문 번역), short_translation(제목 번역), tagging(태그 생성)
+- 설정 우선순위: 환경 변수 > YAML 파일(LLM_ROUTER_CONFIG) > 기본값
+  예: LLM_MODEL, LLM_TAGGING_MODEL, LLM_LONG_FORM_TEMPERATURE
+- 기본 모델과 다른 모델을 쓰는 작업은 API 오류(없는 모델, 429/5xx, 타임아웃) 시 기본 모델로 다시 호출합니다.
+- 동기/비동기 httpx 클라이언트를 하나씩만 만들어 커넥션 풀을 공유합니다.
+- 요청 타임아웃과 지터 지수 백오프 재시도(RetryingTransport)를 적용합니다.
+- 재시도를 포함한 모든 시도는 전역 스케줄러(SchedulingTransport)를 거칩니다.
+- 작업/모델별 호출 수, 지연 시간, 토큰 사용량(프롬프트 캐시 적중 비율 포함), 비용을 app.metrics 에 기록합니다.
+
+YAML 설정 예:
+    tasks:
+      tagging: {model: gpt-4.1-nano}
+      long_form: {model: gpt-4o-mini, temperature: 0.7, fallback: false}
+    prices:  # 100만 토큰당 USD
+      gpt-4.1-nano: {input: 0.10, cached_input: 0.025, output: 0.40}
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import httpx
+import openai
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+
+from ..metrics import metrics
+from .tokens import current_token_usage
+from .scheduler import AsyncSchedulingTransport, SchedulingTransport, llm_scheduler
+from .transport import AsyncRetryingTransport, RetryingTransport, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _load_router_config() -> Dict[str, Any]:
+    """LLM_ROUTER_CONFIG 의 YAML 설정을 읽습니다. (없으면 빈 설정)"""
+    path = os.getenv("LLM_ROUTER_CONFIG")
+    if not path:
+        return {}
+    import yaml
+
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+ROUTER_CONFIG = _load_router_config()
+
+
+class LLMProfile:
+    """작업 종류별 LLM 설정"""
+    def __init__(
+        self,
+        name: str,
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        legacy_name: Optional[str] = None,
+    ):
+        options = (ROUTER_CONFIG.get("tasks") or {}).get(name) or {}
+        self.name = name
+        self.model = self._env(name, legacy_name, "MODEL") or options.get("model", model)
+        temperature_env = self._env(name, legacy_name, "TEMPERATURE")
+        self.temperature = float(temperature_env) if temperature_env else options.get("temperature", temperature)
+        fallback_env = self._env(name, legacy_name, "FALLBACK")
+        self.fallback = fallback_env.lower() in ("1", "true", "yes") if fallback_env else bool(options.get("fallback", True))
+
+    @staticmethod
+    def _env(name: str, legacy_name: Optional[str], key: str) -> Optional[str]:
+        # 이전 프로필 이름(LLM_ASSISTANT_MODEL 등)도 계속 읽습니다.
+        for prefix in (name, legacy_name):
+            value = os.getenv(f"LLM_{prefix.upper()}_{key}") if prefix else None
+            if value:
+                return value
+        return None
+
+    @property
+    def uses_fallback(self) -> bool:
+        return self.fallback and self.model != DEFAULT_MODEL
+
+
+# 작업 종류별 프로필
+LLM_PROFILES: Dict[str, LLMProfile] = {
+    # 메인 어시스턴트의 서브 어시스턴트 선택/일반 답변
+    "route": LLMProfile("route"),
+    # 서브 어시스턴트 (도구 호출)
+    "tool_calling": LLMProfile("tool_calling", legacy_name="assistant"),
+    # 레시피 생성/포맷팅 (긴 출력)
+    "long_form": LLMProfile("long_form", temperature=0.7, legacy_name="recipe"),
+    # 레시피 본문 번역
+    "translation": LLMProfile("translation", temperature=0.3),
+    # 레시피 제목 번역 (한 줄)
+    "short_translation": LLMProfile("short_translation", model="gpt-4.1-nano", temperature=0.3),
+    # 레시피 태그 생성
+    "tagging": LLMProfile("tagging", model="gpt-4.1-nano"),
+}
+
+# 이전 프로필 이름
+_PROFILE_ALIASES = {"assistant": "tool_calling", "recipe": "long_form"}
+
+# 모델별 가격 (100만 토큰당 USD). YAML 의 prices 로 추가/변경할 수 있습니다.
+LLM_PRICES: Dict[str, Dict[str, float]] = {
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4.1": {"input": 2.00, "cached_input": 0.50, "output": 8.00},
+    "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+    "gpt-4.1-nano": {"input": 0.10, "cached_input": 0.025, "output": 0.40},
+    **(ROUTER_CONFIG.get("prices") or {}),
+}
+
+# 기본 모델로 다시 호출할 오류 (스케줄러 거절/마감 시간 초과는 그대로 전달)
+FALLBACK_ERRORS = (openai.APIStatusError, openai.APITimeoutError)
+
+
+def llm_cost(model: str, input_tokens: int, cached_tokens: int, output_tokens: int) -> Optional[float]:
+    """토큰 사용량의 비용 (USD, 가격을 모르는 모델이면 None)"""
+    price = LLM_PRICES.get(model)
+    if price is None:
+        return None
+    cached_price = price.get("cached_input", price["input"])
+    return (
+        (input_tokens - cached_tokens) * price["input"]
+        + cached_tokens * cached_price
+        + output_tokens * price["output"]
+    ) / 1_000_000
+
+# 타임아웃/재시도/커넥션 풀 설정
+LLM_TIMEOUT = _env_float("LLM_TIMEOUT", 60.0)
+LLM_CONNECT_TIMEOUT = _env_float("LLM_CONNECT_TIMEOUT", 5.0)
+LLM_MAX_RETRIES = _env_int("LLM_MAX_RETRIES", 3)
+LLM_MAX_CONNECTIONS = _env_int("LLM_MAX_CONNECTIONS", 100)
+LLM_MAX_KEEPALIVE = _env_int("LLM_MAX_KEEPALIVE", 20)
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """LLM 호출 수, 지연 시간, 토큰 사용량, 비용을 작업/모델별 메트릭으로 기록하는 콜백"""
+
+    def __init__(self, profile: str, model: str = DEFAULT_MODEL, fallback: bool = False):
+        self.profile = profile
+        self.model = model
+        self.fallback = fallback
+        self._started: Dict[UUID, float] = {}
+
+    def _start(self, run_id: UUID) -> None:
+        self._started[run_id] = time.perf_counter()
+        if self.fallback:
+            metrics.increment("llm_fallback_total", profile=self.profile, model=self.model)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[Any], *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        metrics.increment("llm_calls_total", profile=self.profile, model=self.model, status="ok")
+        if started is not None:
+            metrics.observe("llm_call_seconds", time.perf_counter() - started, profile=self.profile, model=self.model)
+
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens = usage.get("input_tokens", 0)
+                    output_tokens = usage.get("output_tokens", 0)
+                    metrics.increment("llm_input_tokens_total", input_tokens, profile=self.profile)
+                    metrics.increment("llm_output_tokens_total", output_tokens, profile=self.profile)
+
+                    # 프롬프트 프리픽스 캐시 적중 토큰 (OpenAI usage.prompt_tokens_details.cached_tokens)
+                    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read") or 0
+                    metrics.increment("llm_cached_input_tokens_total", cached_tokens, profile=self.profile)
+                    if input_tokens:
+                        metrics.observe("llm_cached_token_ratio", cached_tokens / input_tokens, profile=self.profile)
+
+                    cost = llm_cost(self.model, input_tokens, cached_tokens, output_tokens)
+                    if cost is not None:
+                        metrics.increment("llm_cost_usd_total", cost, profile=self.profile, model=self.model)
+
+                    request_usage = current_token_usage()
+                    if request_usage is not None:
+                        request_usage.add_llm_usage(usage)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        metrics.increment("llm_calls_total", profile=self.profile, model=self.model, status=type(error).__name__)
+
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+_llms: Dict[str, ChatOpenAI] = {}
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_KEEPALIVE)
+
+
+def get_http_clients() -> tuple:
+    """공유 (동기, 비동기) httpx 클라이언트를 반환합니다."""
+    global _http_client, _http_async_client
+    with _lock:
+        if _http_client is None:
+            policy = RetryPolicy(max_retries=LLM_MAX_RETRIES)
+            _http_client = httpx.Client(
+                transport=RetryingTransport(
+                    SchedulingTransport(httpx.HTTPTransport(limits=_limits()), llm_scheduler),
+                    policy,
+                ),
+                timeout=_timeout(),
+            )
+            _http_async_client = httpx.AsyncClient(
+                transport=AsyncRetryingTransport(
+                    AsyncSchedulingTransport(httpx.AsyncHTTPTransport(limits=_limits()), llm_scheduler),
+                    policy,
+                ),
+                timeout=_timeout(),
+            )
+        return _http_client, _http_async_client
+
+
+def _chat_model(profile: str, model: str, fallback: bool = False) -> ChatOpenAI:
+    """공유 ChatOpenAI 인스턴스 (작업 종류와 모델별로 하나)"""
+    key = f"{profile}:{model}:{'fallback' if fallback else 'primary'}"
+    with _lock:
+        llm = _llms.get(key)
+    if llm is not None:
+        return llm
+
+    config = LLM_PROFILES[profile]
+    http_client, http_async_client = get_http_clients()
+    kwargs: Dict[str, Any] = {
+        "model": model,
+        "timeout": _timeout(),
+        # 재시도는 RetryingTransport 에서 처리합니다.
+        "max_retries": 0,
+        "http_client": http_client,
+        "http_async_client": http_async_client,
+        "callbacks": [LLMMetricsHandler(profile, model, fallback=fallback)],
+    }
+    if config.temperature is not None:
+        kwargs["temperature"] = config.temperature
+
+    llm = ChatOpenAI(**kwargs)
+    with _lock:
+        return _llms.setdefault(key, llm)
+
+
+def get_llm(profile: str = "tool_calling", tools: Optional[Sequence[Any]] = None) -> Runnable:
+    """
+    작업 종류에 해당하는 LLM 을 반환합니다. tools 를 주면 도구를 바인딩합니다.
+    작업 모델이 기본 모델과 다르면 API 오류 시 기본 모델로 다시 호출하는 Runnable 을 반환합니다.
+    """
+    profile = _PROFILE_ALIASES.get(profile, profile)
+    if profile not in LLM_PROFILES:
+        raise ValueError(f"Unknown LLM profile: {profile}")
+
+    config = LLM_PROFILES[profile]
+    llm: Runnable = _chat_model(profile, config.model)
+    if tools is not None:
+        llm = llm.bind_tools(tools)
+    if not config.uses_fallback:
+        return llm
+
+    fallback: Runnable = _chat_model(profile, DEFAULT_MODEL, fallback=True)
+    if tools is not None:
+        fallback = fallback.bind_tools(tools)
+    return llm.with_fallbacks([fallback], exceptions_to_handle=FALLBACK_ERRORS)
+
+
+async def close_llm_clients() -> None:
+    """공유 httpx 클라이언트를 닫습니다."""
+    global _http_client, _http_async_client
+    with _lock:
+        client, async_client = _http_client, _http_async_client
+        _http_client = _http_async_client = None
+        _llms.clear()
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.aclose()
@@ -0,0 +1,354 @@
+"""
+모든 LLM 호출이 거쳐 가는 전역 스케줄러입니다.
+
+- 요청 수(RPM)와 추정 토큰 수(TPM)를 토큰 버킷으로 관리합니다.
+- 우선순위(대화형 채팅 > 일반 편집 > 배치 생성/번역)가 높은 대기열부터 처리합니다.
+- 우선순위별 대기열 길이와 대기 시간에 상한을 두고, 넘으면 즉시 거절합니다.
+- OpenAI 응답의 x-ratelimit-* 헤더와 429 응답으로 버킷 잔량을 보정합니다.
+
+호출 측은 llm_priority() 컨텍스트로 우선순위를 지정합니다 (기본값: INTERACTIVE).
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Deque, Dict, Iterator, Optional
+
+import httpx
+
+from ..deadlines import STAGE_LLM_QUEUE, current_deadline
+from ..metrics import metrics
+
+# 비동기 대기자가 버킷 상태를 다시 확인하는 최대 간격 (초)
+_POLL_INTERVAL = 0.05
+# 응답 토큰 추정치 (요청 본문에 max_tokens 가 없을 때)
+_DEFAULT_COMPLETION_TOKENS = 512
+
+
+class Priority(IntEnum):
+    """LLM 호출 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # /api/chat
+    STANDARD = 1     # 레시피 포맷팅/단일 생성
+    BATCH = 2        # 다국어 생성, 번역
+
+
+_priority_var: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """블록 안에서 발생하는 LLM 호출의 우선순위를 지정합니다."""
+    token = _priority_var.set(priority)
+    try:
+        yield
+    finally:
+        _priority_var.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority_var.get()
+
+
+class LLMSchedulerError(Exception):
+    """스케줄러가 호출을 거절했을 때 발생하는 예외"""
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SchedulerQueueFull(LLMSchedulerError):
+    """대기열이 가득 참"""
+
+
+class SchedulerTimeout(LLMSchedulerError):
+    """대기 시간 초과"""
+
+
+class TokenBucket:
+    """분당 한도를 초당 비율로 채우는 토큰 버킷 (limit <= 0 이면 무제한)"""
+
+    def __init__(self, limit_per_minute: float):
+        self.capacity = float(limit_per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float) -> None:
+        if self.unlimited:
+            return
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def deficit_seconds(self, amount: float) -> float:
+        """amount 만큼 꺼내려면 기다려야 하는 시간 (0이면 즉시 가능)"""
+        if self.unlimited:
+            return 0.0
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self.level -= min(amount, self.capacity)
+
+    def clamp(self, remaining: float) -> None:
+        """서버가 알려준 잔량보다 많이 남아 있다고 믿지 않도록 보정합니다."""
+        if not self.unlimited:
+            self.level = min(self.level, remaining)
+
+
+class _Ticket:
+    __slots__ = ("priority", "tokens", "enqueued")
+
+    def __init__(self, priority: Priority, tokens: int):
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+
+
+class LLMScheduler:
+    """우선순위와 토큰 버킷 기반 LLM 호출 스케줄러"""
+
+    def __init__(
+        self,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 200_000,
+        max_queue: int = 100,
+        queue_timeouts: Optional[Dict[Priority, float]] = None,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_queue = max_queue
+        self.queue_timeouts = queue_timeouts or {
+            Priority.INTERACTIVE: 30.0,
+            Priority.STANDARD: 60.0,
+            Priority.BATCH: 120.0,
+        }
+        self._cond = threading.Condition()
+        self._queues: Dict[Priority, Deque[_Ticket]] = {p: deque() for p in Priority}
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        return cls(
+            requests_per_minute=float(os.getenv("LLM_RPM", "500")),
+            tokens_per_minute=float(os.getenv("LLM_TPM", "200000")),
+            max_queue=int(os.getenv("LLM_QUEUE_MAX", "100")),
+            queue_timeouts={
+                Priority.INTERACTIVE: float(os.getenv("LLM_QUEUE_TIMEOUT_INTERACTIVE", "30")),
+                Priority.STANDARD: float(os.getenv("LLM_QUEUE_TIMEOUT_STANDARD", "60")),
+                Priority.BATCH: float(os.getenv("LLM_QUEUE_TIMEOUT_BATCH", "120")),
+            },
+        )
+
+    # --- 대기열 관리 ---
+    def queue_depths(self) -> Dict[str, int]:
+        with self._cond:
+            return {p.name.lower(): len(q) for p, q in self._queues.items()}
+
+    def _update_depth_gauge(self, priority: Priority) -> None:
+        metrics.set_gauge("llm_scheduler_queue_depth", len(self._queues[priority]), priority=priority.name.lower())
+
+    def _enqueue(self, priority: Priority, tokens: int) -> _Ticket:
+        with self._cond:
+            queue = self._queues[priority]
+            if len(queue) >= self.max_queue:
+                metrics.increment("llm_scheduler_rejected_total", priority=priority.name.lower(), reason="queue_full")
+                raise SchedulerQueueFull(f"LLM 대기열이 가득 찼습니다 ({priority.name.lower()})")
+            ticket = _Ticket(priority, tokens)
+            queue.append(ticket)
+            self._update_depth_gauge(priority)
+            return ticket
+
+    def _leave(self, ticket: _Ticket, admitted: bool, reason: str = "timeout") -> None:
+        """대기열에서 티켓을 제거합니다. self._cond 를 잡은 상태에서 호출해야 합니다."""
+        queue = self._queues[ticket.priority]
+        try:
+            queue.remove(ticket)
+        except ValueError:
+            pass
+        self._update_depth_gauge(ticket.priority)
+        label = ticket.priority.name.lower()
+        if admitted:
+            metrics.observe("llm_scheduler_wait_seconds", time.monotonic() - ticket.enqueued, priority=label)
+        else:
+            metrics.increment("llm_scheduler_rejected_total", priority=label, reason=reason)
+        self._cond.notify_all()
+
+    def _try_admit(self, ticket: _Ticket) -> Optional[float]:
+        """
+        티켓을 통과시킬 수 있으면 0, 버킷이 부족하면 기다릴 시간,
+        앞선 대기자가 있으면 None 을 반환합니다. self._cond 를 잡은 상태에서 호출해야 합니다.
+        """
+        for priority in Priority:
+            queue = self._queues[priority]
+            if queue:
+                if queue[0] is not ticket:
+                    return None
+                break
+
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        wait = max(self.requests.deficit_seconds(1), self.tokens.deficit_seconds(ticket.tokens))
+        if wait > 0:
+            return wait
+
+        self.requests.take(1)
+        self.tokens.take(ticket.tokens)
+        self._leave(ticket, admitted=True)
+        return 0.0
+
+    def _timeout_error(self, ticket: _Ticket, timeout: float) -> SchedulerTimeout:
+        return SchedulerTimeout(
+            f"LLM 호출 대기 시간 초과 ({ticket.priority.name.lower()}, {timeout:.0f}초)",
+            retry_after=max(1.0, self.requests.deficit_seconds(1)),
+        )
+
+    # --- 획득 ---
+    def acquire(self, tokens: int, priority: Optional[Priority] = None) -> None:
+        """호출 슬롯을 얻을 때까지 현재 스레드를 대기시킵니다."""
+        priority = current_priority() if priority is None else priority
+        timeout = self.queue_timeouts[priority]
+        # 요청 마감 시간이 더 빠르면 그때까지만 기다립니다.
+        request_deadline = current_deadline()
+        if request_deadline is not None:
+            timeout = request_deadline.timeout_for(STAGE_LLM_QUEUE, timeout)
+        ticket = self._enqueue(priority, tokens)
+        deadline = ticket.enqueued + timeout
+
+        with self._cond:
+            while True:
+                wait = self._try_admit(ticket)
+                if wait == 0:
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._leave(ticket, admitted=False)
+                    if request_deadline is not None:
+                        request_deadline.check(STAGE_LLM_QUEUE)
+                    raise self._timeout_error(ticket, timeout)
+                self._cond.wait(remaining if wait is None else min(wait, remaining))
+
+    async def acquire_async(self, tokens: int, priority: Optional[Priority] = None) -> None:
+        """호출 슬롯을 얻을 때까지 이벤트 루프를 막지 않고 대기합니다."""
+        priority = current_priority() if priority is None else priority
+        timeout = self.queue_timeouts[priority]
+        # 요청 마감 시간이 더 빠르면 그때까지만 기다립니다.
+        request_deadline = current_deadline()
+        if request_deadline is not None:
+            timeout = request_deadline.timeout_for(STAGE_LLM_QUEUE, timeout)
+        ticket = self._enqueue(priority, tokens)
+        deadline = ticket.enqueued + timeout
+
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_admit(ticket)
+                    if wait == 0:
+                        return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._leave(ticket, admitted=False)
+                        if request_deadline is not None:
+                            request_deadline.check(STAGE_LLM_QUEUE)
+                        raise self._timeout_error(ticket, timeout)
+                await asyncio.sleep(min(remaining, wait or _POLL_INTERVAL, _POLL_INTERVAL * 4))
+        except asyncio.CancelledError:
+            with self._cond:
+                self._leave(ticket, admitted=False, reason="cancelled")
+            raise
+
+    # --- 서버 피드백 ---
+    def observe_response(self, response: httpx.Response) -> None:
+        """x-ratelimit-* 헤더와 429 응답으로 버킷 잔량을 보정합니다."""
+        headers = response.headers
+        with self._cond:
+            remaining_requests = headers.get("x-ratelimit-remaining-requests")
+            remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+            try:
+                if remaining_requests is not None:
+                    self.requests.clamp(float(remaining_requests))
+                if remaining_tokens is not None:
+                    self.tokens.clamp(float(remaining_tokens))
+            except ValueError:
+                pass
+            if response.status_code == 429:
+                self.requests.clamp(0)
+                metrics.increment("llm_scheduler_upstream_429_total")
+
+
+def find_scheduler_error(exc: BaseException) -> Optional[LLMSchedulerError]:
+    """
+    예외 체인에서 스케줄러 거절 예외를 찾습니다.
+    OpenAI SDK는 전송 계층 예외를 APIConnectionError 로 감싸서 다시 던집니다.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, LLMSchedulerError):
+            return exc
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def estimate_request_tokens(request: httpx.Request) -> int:
+    """요청 본문 크기로 입력 토큰을 추정하고 응답 토큰 추정치를 더합니다."""
+    content = request.content or b""
+    completion = _DEFAULT_COMPLETION_TOKENS
+    if b'"max_tokens"' in content or b'"max_completion_tokens"' in content:
+        try:
+            body = json.loads(content)
+            completion = int(body.get("max_completion_tokens") or body.get("max_tokens") or completion)
+        except (ValueError, TypeError):
+            pass
+    # JSON 바이트 4개당 약 1토큰 (한국어/일본어는 과대 추정되는 쪽이 안전)
+    return len(content) // 4 + completion
+
+
+class SchedulingTransport(httpx.BaseTransport):
+    """요청을 보내기 전에 스케줄러 슬롯을 얻는 동기 전송 계층"""
+
+    def __init__(self, transport: httpx.BaseTransport, scheduler: LLMScheduler):
+        self._transport = transport
+        self.scheduler = scheduler
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.scheduler.acquire(estimate_request_tokens(request))
+        response = self._transport.handle_request(request)
+        self.scheduler.observe_response(response)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncSchedulingTransport(httpx.AsyncBaseTransport):
+    """요청을 보내기 전에 스케줄러 슬롯을 얻는 비동기 전송 계층"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, scheduler: LLMScheduler):
+        self._transport = transport
+        self.scheduler = scheduler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.scheduler.acquire_async(estimate_request_tokens(request))
+        response = await self._transport.handle_async_request(request)
+        self.scheduler.observe_response(response)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# 전역 스케줄러
+llm_scheduler = LLMScheduler.from_env()
@@ -0,0 +1,268 @@
+"""
+LLM 호출 전 입력 토큰 수를 로컬에서 계산하고, 요청별 토큰 사용량을 집계합니다.
+
+- tiktoken 인코더는 모델별로 한 번만 로드해 재사용합니다.
+  tiktoken 이 없거나 인코딩 파일을 내려받을 수 없는 환경에서는 문자 수 기반 근사치를 사용합니다.
+- 메시지 토큰 수에는 OpenAI 채팅 포맷 오버헤드(메시지당 3토큰, 응답 프라이밍 3토큰)가 포함됩니다.
+- TokenBudget 은 호출당 입력 토큰 상한입니다. 초과하면 긴 도구 출력부터 자르고,
+  그래도 넘치면 오래된 대화를 사람 메시지 경계에서 잘라냅니다. (체크포인트 상태는 그대로 둡니다)
+- track_token_usage() 블록 안의 LLM 호출 사용량은 TokenUsage 에 누적됩니다.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - 선택 의존성
+    tiktoken = None
+
+# 토큰 계산 기준 모델 (factory 와 같은 LLM_MODEL 기본값, 순환 임포트를 피하려고 따로 읽습니다)
+DEFAULT_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+
+# OpenAI 채팅 포맷 오버헤드
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_NAME = 1
+REPLY_PRIMING_TOKENS = 3
+
+TRUNCATION_NOTICE = "\n...(생략됨: 원본 {total} 토큰 중 {kept} 토큰만 포함)"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = DEFAULT_MODEL):
+    """모델에 맞는 tiktoken 인코더를 반환합니다. 사용할 수 없으면 None"""
+    if tiktoken is None:
+        logger.warning("tiktoken 이 설치되지 않아 근사 토큰 수를 사용합니다.")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken 인코딩을 불러오지 못해 근사 토큰 수를 사용합니다: {e}")
+        return None
+
+
+def _approximate_tokens(text: str) -> int:
+    # 영문은 약 4자당 1토큰, 한글/일본어 등 비ASCII 문자는 약 1자당 1토큰
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+@lru_cache(maxsize=8192)
+def count_text_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """문자열의 토큰 수"""
+    if not text:
+        return 0
+    encoding = get_encoding(model)
+    if encoding is None:
+        return _approximate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_text(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """문자열을 max_tokens 이하로 자르고 생략 안내를 붙입니다."""
+    total = count_text_tokens(text, model)
+    if total <= max_tokens:
+        return text
+
+    encoding = get_encoding(model)
+    if encoding is None:
+        kept_text = text[: max(1, len(text) * max_tokens // total)]
+    else:
+        kept_text = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    return kept_text + TRUNCATION_NOTICE.format(total=total, kept=max_tokens)
+
+
+def _message_text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        content = "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+        )
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        content += "".join(tc["name"] + json.dumps(tc["args"], ensure_ascii=False) for tc in tool_calls)
+    return content
+
+
+def count_message_tokens_each(messages: Sequence[BaseMessage], model: str = DEFAULT_MODEL) -> List[int]:
+    """메시지별 토큰 수 (메시지 오버헤드 포함, 응답 프라이밍 제외)"""
+    return [
+        TOKENS_PER_MESSAGE
+        + count_text_tokens(_message_text(m), model)
+        + (TOKENS_PER_NAME if m.name else 0)
+        for m in messages
+    ]
+
+
+def count_message_tokens(messages: Sequence[BaseMessage], model: str = DEFAULT_MODEL) -> int:
+    """LLM 에 전달될 메시지 목록의 토큰 수"""
+    return sum(count_message_tokens_each(messages, model)) + REPLY_PRIMING_TOKENS
+
+
+def count_tool_tokens(tools: Sequence[Any], model: str = DEFAULT_MODEL) -> int:
+    """bind_tools 로 전달되는 도구 스키마의 토큰 수 (JSON 직렬화 기준 근사치)"""
+    if not tools:
+        return 0
+    schemas = [convert_to_openai_tool(tool) for tool in tools]
+    return count_text_tokens(json.dumps(schemas, ensure_ascii=False, sort_keys=True), model)
+
+
+class TokenBudgetExceeded(ValueError):
+    """줄일 수 없는 입력이 토큰 예산을 넘었을 때 발생하는 예외"""
+
+    def __init__(self, tokens: int, max_tokens: int):
+        super().__init__(f"입력이 너무 깁니다 ({tokens} 토큰, 최대 {max_tokens} 토큰)")
+        self.tokens = tokens
+        self.max_tokens = max_tokens
+
+
+class TokenBudget:
+    """호출당 입력 토큰 예산"""
+    def __init__(self, max_input_tokens: int = 100_000, max_tool_output_tokens: int = 4_000, model: str = DEFAULT_MODEL):
+        self.max_input_tokens = max_input_tokens
+        self.max_tool_output_tokens = max_tool_output_tokens
+        self.model = model
+
+    @classmethod
+    def from_env(cls) -> "TokenBudget":
+        return cls(
+            max_input_tokens=int(os.getenv("LLM_MAX_INPUT_TOKENS", "100000")),
+            max_tool_output_tokens=int(os.getenv("LLM_MAX_TOOL_OUTPUT_TOKENS", "4000")),
+        )
+
+    def ensure_within(self, messages: Sequence[BaseMessage]) -> int:
+        """메시지 목록이 예산 안에 드는지 확인하고 토큰 수를 반환합니다."""
+        tokens = count_message_tokens(messages, self.model)
+        record_estimated_tokens(tokens)
+        if tokens > self.max_input_tokens:
+            raise TokenBudgetExceeded(tokens, self.max_input_tokens)
+        return tokens
+
+    def fit_history(
+        self,
+        messages: Sequence[BaseMessage],
+        max_tokens: int,
+    ) -> Tuple[List[BaseMessage], Dict[str, int]]:
+        """
+        대화 기록을 max_tokens 이하로 줄입니다. (예산 안이면 그대로 반환)
+        1) 예산을 넘으면 max_tool_output_tokens 를 넘는 도구 출력을 자릅니다.
+        2) 그래도 넘치면 가장 오래된 메시지부터 버리되, 도구 호출/결과 쌍이 깨지지 않도록
+           사람 메시지에서 시작하게 합니다. 마지막 사람 메시지 이후는 버리지 않습니다.
+        """
+        fitted: List[BaseMessage] = list(messages)
+        counts = count_message_tokens_each(fitted, self.model)
+        total = sum(counts)
+        truncated = 0
+        if total > max_tokens:
+            for i, message in enumerate(fitted):
+                if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+                    continue
+                content = truncate_text(message.content, self.max_tool_output_tokens, self.model)
+                if content is not message.content:
+                    fitted[i] = message.model_copy(update={"content": content})
+                    counts[i] = count_message_tokens_each([fitted[i]], self.model)[0]
+                    truncated += 1
+            total = sum(counts)
+
+        start = 0
+        if total > max_tokens:
+            human_indexes = [i for i, m in enumerate(fitted) if isinstance(m, HumanMessage)]
+            # 끝에서부터 예산에 들어가는 가장 이른 위치
+            kept, cutoff = 0, len(fitted)
+            while cutoff > 0 and kept + counts[cutoff - 1] <= max_tokens:
+                cutoff -= 1
+                kept += counts[cutoff]
+            candidates = [i for i in human_indexes if i >= cutoff]
+            if candidates:
+                start = candidates[0]
+            elif human_indexes:
+                start = human_indexes[-1]
+            total = sum(counts[start:])
+
+        return fitted[start:], {
+            "tokens": total,
+            "dropped_messages": start,
+            "truncated_tool_outputs": truncated,
+        }
+
+
+DEFAULT_TOKEN_BUDGET = TokenBudget.from_env()
+
+
+class TokenUsage:
+    """요청 하나에서 발생한 LLM 토큰 사용량"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cached_input_tokens = 0
+        self.estimated_input_tokens = 0
+        self.dropped_messages = 0
+        self.truncated_tool_outputs = 0
+
+    def add_llm_usage(self, usage: Dict[str, Any]) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.input_tokens += usage.get("input_tokens", 0)
+            self.output_tokens += usage.get("output_tokens", 0)
+            self.cached_input_tokens += (usage.get("input_token_details") or {}).get("cache_read") or 0
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "llm_calls": self.llm_calls,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "total_tokens": self.input_tokens + self.output_tokens,
+                "cached_input_tokens": self.cached_input_tokens,
+                "estimated_input_tokens": self.estimated_input_tokens,
+                "dropped_messages": self.dropped_messages,
+                "truncated_tool_outputs": self.truncated_tool_outputs,
+            }
+
+
+_current_usage: contextvars.ContextVar[Optional[TokenUsage]] = contextvars.ContextVar(
+    "llm_token_usage", default=None
+)
+
+
+@contextmanager
+def track_token_usage() -> Iterator[TokenUsage]:
+    """블록 안에서 발생한 LLM 토큰 사용량을 모읍니다."""
+    usage = TokenUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def current_token_usage() -> Optional[TokenUsage]:
+    """현재 요청의 TokenUsage (track_token_usage 밖이면 None)"""
+    return _current_usage.get()
+
+
+def record_estimated_tokens(tokens: int) -> None:
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add(estimated_input_tokens=tokens)
@@ -0,0 +1,145 @@
+"""
+LLM API 호출에 공통으로 사용하는 httpx 전송 계층입니다.
+
+커넥션 풀을 공유하고, 429/5xx 응답이나 네트워크 오류가 발생하면
+지터가 적용된 지수 백오프로 재시도합니다. 요청 마감 시간(deadline)이 있으면
+매 시도의 타임아웃과 재시도 대기를 남은 시간 안으로 줄입니다.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+import httpx
+
+from ..deadlines import STAGE_LLM, Deadline, current_deadline
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+    """지터가 적용된 지수 백오프 재시도 정책"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """attempt번째(0부터) 재시도 전 대기 시간. Retry-After 헤더가 있으면 우선합니다."""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(self.max_delay, max(0.0, float(retry_after)))
+                except ValueError:
+                    pass
+        # full jitter: [0, min(max_delay, base * 2^attempt)]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def _record_attempt(request: httpx.Request, status: str, elapsed: float) -> None:
+    metrics.increment("llm_http_requests_total", host=request.url.host, status=status)
+    metrics.observe("llm_http_latency_seconds", elapsed, host=request.url.host)
+
+
+def _apply_deadline(request: httpx.Request) -> Optional[Deadline]:
+    """요청 마감 시간이 있으면 확인하고, 남은 시간으로 httpx 타임아웃을 줄입니다."""
+    deadline = current_deadline()
+    if deadline is None:
+        return None
+    remaining = deadline.timeout_for(STAGE_LLM)
+    timeouts = request.extensions.get("timeout") or dict.fromkeys(("connect", "read", "write", "pool"))
+    request.extensions["timeout"] = {
+        key: remaining if value is None else min(value, remaining) for key, value in timeouts.items()
+    }
+    return deadline
+
+
+def _retry_delay(deadline: Optional[Deadline], delay: float) -> float:
+    # 마감 시간을 넘겨 기다리지 않습니다. (다음 시도에서 DeadlineExceeded 발생)
+    return delay if deadline is None else min(delay, deadline.remaining())
+
+
+class RetryingTransport(httpx.BaseTransport):
+    """재시도와 메트릭 기록을 수행하는 동기 전송 계층"""
+
+    def __init__(self, transport: httpx.BaseTransport, policy: RetryPolicy):
+        self._transport = transport
+        self.policy = policy
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        attempt = 0
+        while True:
+            deadline = _apply_deadline(request)
+            started = time.perf_counter()
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as e:
+                _record_attempt(request, type(e).__name__, time.perf_counter() - started)
+                if deadline is not None:
+                    deadline.check(STAGE_LLM)
+                if attempt >= self.policy.max_retries:
+                    raise
+                delay = self.policy.delay(attempt)
+                logger.warning(f"LLM 요청 네트워크 오류, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.policy.max_retries}): {e}")
+            else:
+                _record_attempt(request, str(response.status_code), time.perf_counter() - started)
+                if response.status_code not in RETRYABLE_STATUS or attempt >= self.policy.max_retries:
+                    return response
+                delay = self.policy.delay(attempt, response)
+                response.close()
+                logger.warning(f"LLM 요청 {response.status_code} 응답, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.policy.max_retries})")
+
+            metrics.increment("llm_http_retries_total", host=request.url.host)
+            time.sleep(_retry_delay(deadline, delay))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRetryingTransport(httpx.AsyncBaseTransport):
+    """재시도와 메트릭 기록을 수행하는 비동기 전송 계층"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy):
+        self._transport = transport
+        self.policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        attempt = 0
+        while True:
+            deadline = _apply_deadline(request)
+            started = time.perf_counter()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                _record_attempt(request, type(e).__name__, time.perf_counter() - started)
+                if deadline is not None:
+                    deadline.check(STAGE_LLM)
+                if attempt >= self.policy.max_retries:
+                    raise
+                delay = self.policy.delay(attempt)
+                logger.warning(f"LLM 요청 네트워크 오류, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.policy.max_retries}): {e}")
+            else:
+                _record_attempt(request, str(response.status_code), time.perf_counter() - started)
+                if response.status_code not in RETRYABLE_STATUS or attempt >= self.policy.max_retries:
+                    return response
+                delay = self.policy.delay(attempt, response)
+                await response.aclose()
+                logger.warning(f"LLM 요청 {response.status_code} 응답, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.policy.max_retries})")
+
+            metrics.increment("llm_http_retries_total", host=request.url.host)
+            await asyncio.sleep(_retry_delay(deadline, delay))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -1,16 +1,38 @@
 from typing import Dict, Any, Optional, List
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 import uuid
 from .conversation_runner import run_conversation
 from .graph_definition import build_graph
-from langgraph.checkpoint.memory import MemorySaver
+from .graph import PLAN_MODE_ENABLED, SUB_ASSISTANTS
+from .llm import get_llm, close_llm_clients, Priority, llm_priority, LLMSchedulerError, find_scheduler_error
+from .llm import DEFAULT_TOKEN_BUDGET, TokenBudgetExceeded, track_token_usage, current_token_usage
+from .metrics import metrics
+from .responses import CompressionMiddleware, FastJSONResponse, model_response
+from .deadlines import Deadline, DeadlineError, DeadlineExceeded, RequestCancelled, deadline_scope
+from .thread_locks import ThreadLockManager, ThreadQueueFull
+from .admission import AdmissionController, AdmissionRejected, client_key
+from .jobs import JobManager, JobQueueFull
+from .search import close_recipe_vector_search
+from .embeddings import get_embedding_service, close_embedding_service
+from .recipes import FORMAT_SYSTEM_PROMPT, GENERATE_SYSTEM_PROMPT, SSE_HEADERS, stream_recipe_markdown
+# 같은 이름의 엔드포인트 함수가 있으므로 별칭으로 가져옵니다.
+from .recipes import generate_multilingual_recipe as create_multilingual_recipe
+from .recipes import translate_recipe_sections, translate_short_text
+from .checkpoints import CHECKPOINT_COMPACTION_INTERVAL, CompactingMemorySaver
+from .translation_memory import close_translation_memory
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
 import logging
+import math
+import openai
 
 # 환경 변수 로드
 load_dotenv()
@@ -20,7 +42,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # FastAPI 앱 초기화
-app = FastAPI(title="HIRecipi AI Backend")
+app = FastAPI(title="HIRecipi AI Backend", default_response_class=FastJSONResponse)
+
+# 응답 압축 (gzip/brotli, 일정 크기 이상)
+app.add_middleware(CompressionMiddleware, **CompressionMiddleware.options_from_env())
 
 # CORS 설정
 app.add_middleware(
@@ -31,23 +56,158 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# LLM 초기화
-llm = ChatOpenAI(
-    model_name="gpt-4o-mini",
-    temperature=0.7,
+# LLM 스케줄러 거절/연결 실패 처리
+def _scheduler_rejection_response(error: LLMSchedulerError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(error)},
+        headers={"Retry-After": str(math.ceil(error.retry_after))},
+    )
+
+@app.exception_handler(LLMSchedulerError)
+async def llm_scheduler_error_handler(request: Request, exc: LLMSchedulerError):
+    return _scheduler_rejection_response(exc)
+
+@app.exception_handler(openai.APIConnectionError)
+async def llm_connection_error_handler(request: Request, exc: openai.APIConnectionError):
+    scheduler_error = find_scheduler_error(exc)
+    if scheduler_error:
+        return _scheduler_rejection_response(scheduler_error)
+    logger.error(f"LLM 연결 실패: {exc}", exc_info=True)
+    return JSONResponse(status_code=502, content={"detail": "LLM 서버에 연결할 수 없습니다."})
+
+def llm_priority_dependency(priority: Priority):
+    """엔드포인트에서 발생하는 LLM 호출의 스케줄링 우선순위를 지정하는 의존성"""
+    async def dependency():
+        with llm_priority(priority):
+            yield
+    return dependency
+
+@app.exception_handler(TokenBudgetExceeded)
+async def token_budget_exceeded_handler(request: Request, exc: TokenBudgetExceeded):
+    return JSONResponse(
+        status_code=413,
+        content={"detail": str(exc), "tokens": exc.tokens, "max_tokens": exc.max_tokens},
+    )
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": str(exc), "stage": exc.stage, "timeout": exc.timeout},
+    )
+
+@app.exception_handler(RequestCancelled)
+async def request_cancelled_handler(request: Request, exc: RequestCancelled):
+    # 클라이언트가 이미 연결을 끊었으므로 로그용 상태 코드입니다. (nginx 관례의 499)
+    return JSONResponse(status_code=499, content={"detail": str(exc), "stage": exc.stage})
+
+@app.exception_handler(ThreadQueueFull)
+async def thread_queue_full_handler(request: Request, exc: ThreadQueueFull):
+    return JSONResponse(status_code=409, content={"detail": str(exc), "thread_id": exc.thread_id})
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "endpoint": exc.endpoint, "reason": exc.reason},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+# 엔드포인트 분류별 동시 처리 상한과 사용자별 공정 대기열
+admission = AdmissionController.from_env()
+
+def admission_dependency(endpoint: str):
+    """요청 처리 동안 엔드포인트 분류의 동시 처리 슬롯을 잡는 의존성 (스트리밍 응답은 전송이 끝날 때까지)"""
+    async def dependency(http_request: Request):
+        async with admission.admit(endpoint, client_key(http_request)):
+            yield
+    return dependency
+
+# 채팅 요청 마감 시간 (초). 클라이언트는 X-Request-Timeout 헤더로 더 짧게 지정할 수 있습니다.
+CHAT_DEADLINE_SECONDS = float(os.getenv("CHAT_DEADLINE_SECONDS", "60"))
+DISCONNECT_POLL_INTERVAL = 0.25
+
+def request_deadline(http_request: Request, max_seconds: float) -> Deadline:
+    """요청 헤더와 서버 설정으로 요청 마감 시간을 만듭니다."""
+    timeout = max_seconds
+    header = http_request.headers.get("x-request-timeout")
+    if header:
+        try:
+            timeout = min(max_seconds, max(0.1, float(header)))
+        except ValueError:
+            pass
+    return Deadline(timeout)
+
+async def run_until_disconnected(http_request: Request, deadline: Deadline, func, *args):
+    """
+    동기 함수 func 을 스레드풀에서 실행합니다. (이벤트 루프를 막지 않음)
+    그동안 클라이언트 연결이 끊기면 deadline 을 취소해 다음 확인 지점에서 실행을 멈추게 합니다.
+    """
+    def run():
+        with deadline_scope(deadline):
+            return func(*args)
+
+    # to_thread 는 현재 컨텍스트(우선순위, 토큰 사용량 추적)를 복사해 실행합니다.
+    task = asyncio.ensure_future(asyncio.to_thread(run))
+    try:
+        while not task.done():
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if not done and await http_request.is_disconnected():
+                deadline.cancel("client_disconnected")
+                break
+        # 취소된 경우에도 작업 스레드가 체크포인트를 정리하고 끝날 때까지 기다립니다.
+        return await task
+    except asyncio.CancelledError:
+        deadline.cancel("server_cancelled")
+        raise
+
+# 레시피 엔드포인트의 동기 LLM 호출 전용 스레드풀.
+# 스케줄러 대기와 재시도 대기가 이벤트 루프나 채팅이 쓰는 기본 스레드풀을 막지 않도록 분리하며,
+# 승인된 레시피 요청이 스레드를 기다리지 않도록 동시 처리 상한만큼 둡니다.
+recipe_executor = ThreadPoolExecutor(
+    max_workers=admission.queues["recipe"].max_inflight,
+    thread_name_prefix="recipe-llm",
 )
 
+async def run_recipe_call(func, *args):
+    """동기 함수 func 을 레시피 스레드풀에서 실행합니다. 현재 컨텍스트(우선순위, 토큰 사용량 추적)를 복사해 넘깁니다."""
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(recipe_executor, functools.partial(context.run, func, *args))
+
+def token_usage_dependency(route: str):
+    """요청 단위 LLM 토큰 사용량을 모아 메트릭으로 기록하는 의존성"""
+    async def dependency():
+        with track_token_usage() as usage:
+            yield
+        summary = usage.as_dict()
+        metrics.observe("request_input_tokens", summary["input_tokens"], route=route)
+        metrics.observe("request_output_tokens", summary["output_tokens"], route=route)
+        metrics.observe("request_llm_calls", summary["llm_calls"], route=route)
+    return dependency
+
+# 작업 종류별 LLM (공유 커넥션 풀/타임아웃/재시도, 기본 모델 대체 호출 적용)
+llm = get_llm("long_form")
+translation_llm = get_llm("translation")
+short_translation_llm = get_llm("short_translation")
+tagging_llm = get_llm("tagging")
+
 # 그래프 초기화
 builder = build_graph()
 
-# 메모리 세이버 초기화
-memory = MemorySaver()
+# 메모리 세이버 초기화 (메시지 공유 저장 + 오래된 체크포인트 정리)
+memory = CompactingMemorySaver.from_env()
+compaction_task: Optional[asyncio.Task] = None
 
 # 민감한 도구들의 노드 이름 목록
 sensitive_nodes = [
     "recipe_sensitive_tools",
     "refrigerator_sensitive_tools",
 ]
+# 계획 승인 모드: 승인된 계획을 실행하는 노드도 실행 전에 멈춥니다.
+if PLAN_MODE_ENABLED:
+    sensitive_nodes += [f"{config.id}_plan" for config in SUB_ASSISTANTS]
 
 # 그래프 컴파일
 graph = builder.compile(
@@ -55,6 +215,8 @@ graph = builder.compile(
     interrupt_before=sensitive_nodes
 )
 printed_ids = set()
+# 같은 대화 스레드의 요청은 순서대로, 다른 스레드는 병렬로 실행
+thread_locks = ThreadLockManager.from_env()
 
 # 요청 모델
 class PageContext(BaseModel):
@@ -77,6 +239,7 @@ class ChatResponse(BaseModel):
     responses: Optional[List[Dict[str, Any]]] = None
     complete: Optional[bool] = None
     thread_id: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None  # 예: {"token_usage": {...}}
 
 # 레시피 포맷팅 요청/응답 모델
 class RecipeFormatRequest(BaseModel):
@@ -103,33 +266,13 @@ class RecipeGenerateResponse(BaseModel):
     title: str
     content: str
 
-def parse_recipe_content(content: str) -> dict:
-    """GPT 응답에서 제목, 설명, 내용을 추출합니다."""
-    lines = content.split('\n')
-    title = ""
-    description = ""
-    content_lines = []
-    
-    # 제목과 설명 추출
-    for line in lines:
-        if line.startswith('# '):
-            title = line.replace('# ', '').strip()
-        elif not line.startswith('#') and not title and line.strip():
-            title = line.strip()
-        elif title and not description and line.strip():
-            description = line.strip()
-        else:
-            content_lines.append(line)
-    
-    return {
-        "title": title,
-        "description": description,
-        "content": '\n'.join(content_lines).strip()
-    }
-
-@app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+@app.post("/api/chat", response_model=ChatResponse, dependencies=[
+    Depends(llm_priority_dependency(Priority.INTERACTIVE)),
+    Depends(token_usage_dependency("chat")),
+])
+async def chat(request: ChatRequest, http_request: Request) -> ChatResponse:
     """채팅 요청을 처리하는 엔드포인트"""
+    deadline = request_deadline(http_request, CHAT_DEADLINE_SECONDS)
     try:
         # context가 None이면 빈 딕셔너리로 초기화
         context = request.context or {}
@@ -146,25 +289,38 @@ async def chat(request: ChatRequest) -> ChatResponse:
                 "refrigerator_id": context.get("refrigeratorId", "None"),
                 "recipe_id": context.get("recipeId", "None"),
                 "category_id": context.get("categoryId", "None"),
-                "user_language": context.get("userLanguage", "en")  # 사용자 언어 설정 추가, 기본값은 한국어
+                "user_language": context.get("userLanguage", "en"),  # 사용자 언어 설정 추가, 기본값은 한국어
+                # 요청 마감 시간 (LLM/도구 호출과 슈퍼스텝마다 확인)
+                "deadline": deadline,
             }
         }
         
-        # 대화 처리
-        result = run_conversation(
-            graph=graph,
-            message=request.message,
-            context=context,
-            config=config,
-            printed_ids=printed_ids
-        )
+        # 대화 처리 (같은 스레드의 앞선 요청이 끝난 뒤 채팅 동시 처리 슬롯을 잡고 스레드풀에서 실행, 연결이 끊기면 취소)
+        user_key = f"user:{context['userId']}" if context.get("userId") else client_key(http_request)
+        async with thread_locks.hold(thread_id, deadline, http_request.is_disconnected):
+            async with admission.admit("chat", user_key, deadline):
+                result = await run_until_disconnected(
+                    http_request,
+                    deadline,
+                    run_conversation,
+                    graph,
+                    request.message,
+                    context,
+                    config,
+                    printed_ids,
+                )
         
-        # thread_id 추가
+        # thread_id, 토큰 사용량 추가
         if isinstance(result, dict):
             result["thread_id"] = thread_id
+            usage = current_token_usage()
+            if usage is not None:
+                result["metadata"] = {"token_usage": usage.as_dict()}
             
-        return ChatResponse(**result)
+        return model_response(ChatResponse(**result))
             
+    except (DeadlineError, ThreadQueueFull, AdmissionRejected):
+        raise
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -172,137 +328,65 @@ async def chat(request: ChatRequest) -> ChatResponse:
             detail=f"채팅 처리 중 오류가 발생했습니다: {str(e)}"
         )
 
-@app.post("/api/recipe/format")
+@app.post("/api/recipe/format", dependencies=[
+    Depends(llm_priority_dependency(Priority.STANDARD)),
+    Depends(token_usage_dependency("recipe_format")),
+    Depends(admission_dependency("recipe")),
+])
 async def format_recipe(request: RecipeFormatRequest) -> RecipeFormatResponse:
     """레시피를 깔끔한 마크다운 형식으로 변환합니다."""
-    
-    system_prompt = """You are a helpful AI assistant that formats recipes in a clear and organized way.
-
-    Please convert the recipe into the following format:
-
-    # Recipe Title
-
-    ## Ingredients
-    - Ingredient 1
-    - Ingredient 2
-    ...
-
-    ## Instructions
-    1. First step
-    2. Second step
-    ...
-
-    ## Cooking Tips
-    - Tip 1
-    - Tip 2
-    ...
-
-    Please maintain all information from the input recipe while organizing it into the above format.
-    Keep it concise and remove any unnecessary explanations or repetitions.
-    Also, maintain the original language of the input recipe."""
 
     messages = [
-        SystemMessage(content=system_prompt),
+        SystemMessage(content=FORMAT_SYSTEM_PROMPT),
         HumanMessage(content=request.recipe)
     ]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
     
-    response = llm.invoke(messages)
+    response = await run_recipe_call(llm.invoke, messages)
     
-    return RecipeFormatResponse(
+    return model_response(RecipeFormatResponse(
         formatted_recipe=response.content
-    )
+    ))
 
-@app.post("/api/recipe/translate")
+@app.post("/api/recipe/translate", dependencies=[
+    Depends(llm_priority_dependency(Priority.BATCH)),
+    Depends(token_usage_dependency("recipe_translate")),
+    Depends(admission_dependency("recipe")),
+])
 async def translate_recipe(request: RecipeTranslateRequest) -> RecipeTranslateResponse:
     """레시피와 제목을 지정된 언어로 번역합니다."""
     
-    language_names = {
-        'ko': '한국어',
-        'en': '영어',
-        'ja': '일본어',
-    }
-    
-    target_language_name = language_names.get(request.target_language, request.target_language)
-    
+    # 제목은 짧은 번역 모델로, 본문은 섹션 단위로 번역합니다. (이전에 번역한 섹션은 다시 번역하지 않음)
+    # 인증된 사용자가 없으므로 번역 메모리는 공용 용어만 쓰고, 결과를 수집하지 않습니다.
     translated_title = ""
     if request.title:  # 제목이 제공된 경우에만 번역
-        # 제목 번역
-        title_system_prompt = f"""You are a helpful AI assistant that translates recipe titles accurately.
-        Please translate the given recipe title into {target_language_name}.
-        Keep the translation natural and appropriate for the target language's culinary context.
-        Respond with ONLY the translated title, without any additional text or explanation."""
-
-        title_messages = [
-            SystemMessage(content=title_system_prompt),
-            HumanMessage(content=request.title)
-        ]
-        
-        title_response = llm.invoke(title_messages)
-        translated_title = title_response.content.strip()
-    
-    # 레시피 내용 번역
-    recipe_system_prompt = f"""You are a helpful AI assistant that translates recipes accurately.
-    Please translate the given recipe into {target_language_name}.
-    Follow these guidelines:
-    1. Maintain the recipe's structure and format
-    2. Ensure accurate translation of ingredients, measurements, and cooking instructions
-    3. Use appropriate culinary terminology for the target language
-    4. Keep the same markdown formatting if present
-    5. Preserve line breaks and spacing
-    
-    Respond with ONLY the translated recipe, without any additional text or explanation."""
-
-    recipe_messages = [
-        SystemMessage(content=recipe_system_prompt),
-        HumanMessage(content=request.recipe)
-    ]
-    
-    recipe_response = llm.invoke(recipe_messages)
-    translated_recipe = recipe_response.content.strip()
+        translated_title = await run_recipe_call(
+            translate_short_text, short_translation_llm, request.title, request.target_language
+        )
+    translated_recipe = await run_recipe_call(
+        translate_recipe_sections, translation_llm, request.recipe, request.target_language
+    )
     
-    return RecipeTranslateResponse(
+    return model_response(RecipeTranslateResponse(
         translated_recipe=translated_recipe,
         translated_title=translated_title
-    )
+    ))
 
-@app.post("/api/recipe/generate")
+@app.post("/api/recipe/generate", dependencies=[
+    Depends(llm_priority_dependency(Priority.STANDARD)),
+    Depends(token_usage_dependency("recipe_generate")),
+    Depends(admission_dependency("recipe")),
+])
 async def generate_recipe(request: RecipeGenerateRequest) -> RecipeGenerateResponse:
     """문자열을 기반으로 구조화된 레시피를 생성합니다."""
-    
-    system_prompt = """You are a helpful AI assistant that generates detailed recipes.
-    Based on the user's input, create a complete recipe with a clear title and step-by-step instructions.
-    The recipe should be practical, easy to follow, and include all necessary details.
-    Format the recipe with clear sections for ingredients and cooking steps.
-
-    Please generate the recipe into the following format:
-
-    # Recipe Title
-
-    ## Ingredients
-    - Ingredient 1
-    - Ingredient 2
-    ...
-
-    ## Instructions
-    1. First step
-    2. Second step
-    ...
-
-    ## Cooking Tips
-    - Tip 1
-    - Tip 2
-    ...
-    Please maintain all information from the input recipe while organizing it into the above format.
-    Keep it concise and remove any unnecessary explanations or repetitions.
-    Keep the language natural and engaging while maintaining accuracy and clarity.
-    Also, maintain the original language of the input recipe."""
 
     messages = [
-        SystemMessage(content=system_prompt),
+        SystemMessage(content=GENERATE_SYSTEM_PROMPT),
         HumanMessage(content=request.content)
     ]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
     
-    response = llm.invoke(messages)
+    response = await run_recipe_call(llm.invoke, messages)
     
     # GPT 응답에서 제목과 내용 추출
     try:
@@ -313,129 +397,180 @@ async def generate_recipe(request: RecipeGenerateRequest) -> RecipeGenerateRespo
         # 전체 내용은 그대로 사용
         content = response.content
         
-        return RecipeGenerateResponse(
+        return model_response(RecipeGenerateResponse(
             title=title,
             content=content
-        )
+        ))
     except Exception as e:
         print(f"Error parsing GPT response: {e}")
         # 파싱 실패 시 기본 응답
-        return RecipeGenerateResponse(
+        return model_response(RecipeGenerateResponse(
             title="새로운 레시피",
             content=response.content
-        )
+        ))
 
-@app.post("/api/recipe/generate-multilingual")
+@app.post("/api/recipe/format/stream", dependencies=[Depends(admission_dependency("recipe"))])
+async def format_recipe_stream(request: RecipeFormatRequest):
+    """format_recipe 의 스트리밍 버전입니다. 마크다운 조각과 제목/섹션/항목 이벤트를 SSE 로 보냅니다."""
+    messages = [
+        SystemMessage(content=FORMAT_SYSTEM_PROMPT),
+        HumanMessage(content=request.recipe)
+    ]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
+
+    return StreamingResponse(
+        stream_recipe_markdown(llm, messages, route="recipe_format_stream", priority=Priority.STANDARD),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+@app.post("/api/recipe/generate/stream", dependencies=[Depends(admission_dependency("recipe"))])
+async def generate_recipe_stream(request: RecipeGenerateRequest):
+    """generate_recipe 의 스트리밍 버전입니다. 마크다운 조각과 제목/섹션/항목 이벤트를 SSE 로 보냅니다."""
+    messages = [
+        SystemMessage(content=GENERATE_SYSTEM_PROMPT),
+        HumanMessage(content=request.content)
+    ]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
+
+    return StreamingResponse(
+        stream_recipe_markdown(llm, messages, route="recipe_generate_stream", priority=Priority.STANDARD),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+def build_multilingual_recipe(content: str) -> dict:
+    """사용자 입력을 기반으로 3개 언어(한국어, 영어, 일본어) 레시피와 태그를 생성합니다."""
+    return create_multilingual_recipe(llm, tagging_llm, content)
+
+@app.post("/api/recipe/generate-multilingual", dependencies=[
+    Depends(llm_priority_dependency(Priority.BATCH)),
+    Depends(token_usage_dependency("recipe_generate_multilingual")),
+    Depends(admission_dependency("recipe")),
+])
 async def generate_multilingual_recipe(request: RecipeGenerateRequest) -> dict:
     """사용자 입력을 기반으로 3개 언어(한국어, 영어, 일본어)로 레시피를 생성합니다."""
-    
-    # 각 언어별 프롬프트 생성
-    prompts = {
-        "ko": """다음 레시피를 한국어로 작성해주세요. 제목, 간단한 설명, 그리고 다음 형식으로 레시피 내용을 작성해주세요:
-
-# [레시피 제목]
-[레시피 설명]
-
-## 재료
-- 재료 1
-- 재료 2
-...
-
-## 조리 방법
-1. 첫 번째 단계
-2. 두 번째 단계
-...
-
-## 조리 팁
-- 팁 1
-- 팁 2
-...""",
-        "en": """Please write the following recipe in English. Include a title, brief description, and recipe content in the following format:
-
-# [Recipe Title]
-[Recipe Description]
-
-## Ingredients
-- Ingredient 1
-- Ingredient 2
-...
-
-## Instructions
-1. First step
-2. Second step
-...
-
-## Cooking Tips
-- Tip 1
-- Tip 2
-...""",
-        "ja": """以下のレシピを日本語で書いてください。タイトル、簡単な説明、そして以下の形式でレシピの内容を書いてください：
-
-# [レシピタイトル]
-[レシピの説明]
-
-## 材料
-- 材料 1
-- 材料 2
-...
-
-## 作り方
-1. 最初のステップ
-2. 次のステップ
-...
-
-## 調理のコツ
-- コツ 1
-- コツ 2
-..."""
-    }
-    
-    translations = []
-    
-    # 각 언어별로 레시피 생성
-    for lang, prompt in prompts.items():
-        messages = [
-            SystemMessage(content=prompt),
-            HumanMessage(content=request.content)
-        ]
-        
-        response = llm.invoke(messages)
-        recipe_data = parse_recipe_content(response.content)
-        
-        translations.append({
-            "language": lang,
-            "title": recipe_data["title"],
-            "description": recipe_data["description"],
-            "content": recipe_data["content"]
-        })
-    
-    # 태그 생성을 위한 프롬프트
-    tag_prompt = """Based on the recipe, suggest up to 5 relevant tags in English.
-    Return only the tags separated by commas, for example: "Korean, Spicy, Stew, Traditional, Healthy"
+    return await run_recipe_call(build_multilingual_recipe, request.content)
+
+# 비동기 작업 관리자 초기화
+job_manager = JobManager.from_env()
+job_manager.register(
+    "recipe.generate_multilingual",
+    lambda payload: build_multilingual_recipe(payload["content"]),
+    priority=Priority.BATCH,
+)
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    events_url: str
+
+def _job_response(job: dict) -> JobResponse:
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        status_url=f"/api/jobs/{job['id']}",
+        events_url=f"/api/jobs/{job['id']}/events",
+    )
+
+@app.post("/api/jobs/recipe/generate-multilingual", status_code=202)
+async def submit_multilingual_recipe_job(request: RecipeGenerateRequest) -> JobResponse:
+    """다국어 레시피 생성을 작업으로 등록하고 작업 ID를 즉시 반환합니다."""
+    try:
+        job = job_manager.submit("recipe.generate_multilingual", {"content": request.content})
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return _job_response(job)
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str) -> dict:
+    """작업 상태와 결과를 조회합니다."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없거나 만료되었습니다.")
+    return job
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """작업 상태 변화를 SSE로 전송합니다. 완료 또는 실패 시 스트림이 종료됩니다."""
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없거나 만료되었습니다.")
+    return StreamingResponse(
+        job_manager.events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# 임베딩 요청/응답 모델
+EMBEDDING_MAX_TEXTS = int(os.getenv("EMBEDDING_MAX_TEXTS", "256"))
+
+class EmbeddingRequest(BaseModel):
+    texts: List[str]
+
+class EmbeddingResponse(BaseModel):
+    model: str
+    dimensions: int
+    embeddings: List[List[float]]
+    cached: int
+
+@app.post("/api/embeddings", response_model=EmbeddingResponse, dependencies=[
+    Depends(llm_priority_dependency(Priority.STANDARD)),
+    Depends(token_usage_dependency("embeddings")),
+])
+async def create_embeddings(request: EmbeddingRequest):
     """
-    
-    tag_messages = [
-        SystemMessage(content=tag_prompt),
-        HumanMessage(content=request.content)
-    ]
-    
-    tag_response = llm.invoke(tag_messages)
-    tags = [tag.strip() for tag in tag_response.content.split(',')][:5]
-    
-    return {
-        "translations": translations,
-        "tags": tags
-    }
+    텍스트 임베딩을 반환합니다. 캐시에 있는 텍스트는 제공자를 호출하지 않고,
+    동시에 들어온 요청들은 하나의 배치로 묶어 임베딩합니다.
+    """
+    if not request.texts:
+        raise HTTPException(status_code=400, detail="texts 가 비어 있습니다.")
+    if len(request.texts) > EMBEDDING_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {EMBEDDING_MAX_TEXTS}개까지 요청할 수 있습니다.")
+
+    service = get_embedding_service()
+    try:
+        vectors, hits = await service.aembed(request.texts)
+    except Exception as e:
+        logger.error(f"임베딩 생성 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return model_response(EmbeddingResponse(
+        model=service.model,
+        dimensions=len(vectors[0]),
+        embeddings=vectors,
+        cached=hits,
+    ))
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """프로세스 내 메트릭 스냅샷을 반환합니다."""
+    return metrics.snapshot()
+
+@app.on_event("startup")
+async def startup_event():
+    """백그라운드 체크포인트 정리를 시작합니다."""
+    global compaction_task
+    if CHECKPOINT_COMPACTION_INTERVAL > 0:
+        compaction_task = asyncio.create_task(memory.run_compaction(CHECKPOINT_COMPACTION_INTERVAL))
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 정리 작업을 수행합니다."""
+    if compaction_task is not None:
+        compaction_task.cancel()
     if printed_ids:
         await memory.close()
+    job_manager.shutdown()
+    recipe_executor.shutdown(wait=False, cancel_futures=True)
+    await asyncio.to_thread(close_recipe_vector_search)
+    await asyncio.to_thread(close_embedding_service)
+    await asyncio.to_thread(close_translation_memory)
+    await close_llm_clients()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,24 @@
+"""
+recipes 패키지는 레시피 정리/생성 프롬프트, 스트리밍 응답(SSE) 처리, 다국어 레시피 생성, 섹션 단위 증분 번역(번역 메모리 용어집 포함)을 제공합니다.
+"""
+
+from .prompts import FORMAT_SYSTEM_PROMPT, GENERATE_SYSTEM_PROMPT
+from .markdown import RecipeMarkdownParser, parse_recipe_content
+from .streaming import stream_recipe_markdown, sse_event, SSE_HEADERS
+from .multilingual import (
+    MULTILINGUAL_STRUCTURED_OUTPUT,
+    MultilingualRecipe,
+    RecipeTranslation,
+    generate_multilingual_recipe,
+    repair_multilingual,
+)
+from .sections import (
+    RecipeSection,
+    SectionTranslationStore,
+    fill_translations,
+    glossary_prompt,
+    section_translations,
+    split_sections,
+    translate_recipe_sections,
+    translate_short_text,
+)
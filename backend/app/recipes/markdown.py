@@ -0,0 +1,128 @@
+"""
+스트리밍 중인 레시피 마크다운을 줄 단위로 파싱합니다.
+
+청크가 들어올 때마다 완성된 줄만 해석해 이벤트를 만들므로, 전체 응답을 기다리지 않고
+제목/섹션/재료 항목을 바로 화면에 그릴 수 있습니다.
+
+이벤트 (이름, 데이터)
+- title: {"title"}
+- description: {"description"}
+- section: {"index", "name", "kind"}
+- item: {"section", "kind", "index", "text"}
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+Event = Tuple[str, Dict[str, Any]]
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_LIST_ITEM = re.compile(r"^(?:[-*+•]|\d+[.)])\s+(.*)$")
+
+# 섹션 이름으로 종류를 추정합니다. (프롬프트가 원문 언어를 유지하도록 하므로 3개 언어를 모두 봅니다)
+SECTION_KINDS = {
+    "ingredients": ("ingredient", "재료", "材料"),
+    "instructions": ("instruction", "step", "direction", "method", "조리 방법", "조리 순서", "만드는", "作り方", "手順"),
+    "tips": ("tip", "팁", "コツ", "ポイント"),
+}
+
+
+def section_kind(name: str) -> str:
+    lowered = name.lower()
+    for kind, keywords in SECTION_KINDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            return kind
+    return "other"
+
+
+class RecipeMarkdownParser:
+    """레시피 마크다운 증분 파서"""
+
+    def __init__(self):
+        self._buffer = ""
+        self.title: Optional[str] = None
+        self.description: Optional[str] = None
+        self.sections: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: str) -> List[Event]:
+        """청크를 추가하고 새로 완성된 줄에서 나온 이벤트를 반환합니다."""
+        self._buffer += chunk
+        events: List[Event] = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            events.extend(self._parse_line(line))
+        return events
+
+    def close(self) -> List[Event]:
+        """스트림이 끝났을 때 남은 마지막 줄을 처리합니다."""
+        line, self._buffer = self._buffer, ""
+        return self._parse_line(line)
+
+    def result(self) -> Dict[str, Any]:
+        return {"title": self.title, "description": self.description, "sections": self.sections}
+
+    def _parse_line(self, line: str) -> List[Event]:
+        stripped = line.strip()
+        # 모델이 응답을 ```markdown 으로 감싸는 경우가 있어 코드 펜스는 무시합니다.
+        if not stripped or stripped.startswith("```"):
+            return []
+
+        heading = _HEADING.match(stripped)
+        if heading:
+            level, text = len(heading.group(1)), heading.group(2)
+            if level == 1 and self.title is None:
+                self.title = text
+                return [("title", {"title": text})]
+            return [self._start_section(text)]
+
+        # 제목 줄 없이 시작하면 첫 줄을 제목으로 봅니다. (parse_recipe_content 와 같은 규칙)
+        if self.title is None:
+            self.title = stripped
+            return [("title", {"title": stripped})]
+
+        if not self.sections:
+            if self.description is None:
+                self.description = stripped
+                return [("description", {"description": stripped})]
+            return []
+
+        section = self.sections[-1]
+        item = _LIST_ITEM.match(stripped)
+        text = item.group(1) if item else stripped
+        section["items"].append(text)
+        return [("item", {
+            "section": section["name"],
+            "kind": section["kind"],
+            "index": len(section["items"]) - 1,
+            "text": text,
+        })]
+
+    def _start_section(self, name: str) -> Event:
+        section = {"name": name, "kind": section_kind(name), "items": []}
+        self.sections.append(section)
+        return ("section", {"index": len(self.sections) - 1, "name": name, "kind": section["kind"]})
+
+
+def parse_recipe_content(content: str) -> dict:
+    """GPT 응답에서 제목, 설명, 내용을 추출합니다."""
+    lines = content.split('\n')
+    title = ""
+    description = ""
+    content_lines = []
+    
+    # 제목과 설명 추출
+    for line in lines:
+        if line.startswith('# '):
+            title = line.replace('# ', '').strip()
+        elif not line.startswith('#') and not title and line.strip():
+            title = line.strip()
+        elif title and not description and line.strip():
+            description = line.strip()
+        else:
+            content_lines.append(line)
+    
+    return {
+        "title": title,
+        "description": description,
+        "content": '\n'.join(content_lines).strip()
+    }
@@ -0,0 +1,211 @@
+"""
+다국어(한국어, 영어, 일본어) 레시피 생성입니다.
+
+구조화 응답 모드 (기본)
+- 세 언어 번역과 태그를 JSON 응답 하나로 받아 Pydantic 모델(MultilingualRecipe)로 검증합니다.
+  사용자 입력을 한 번만 보내므로 언어별 3번 + 태그 1번 호출보다 입력 토큰이 약 1/4 로 줄어듭니다.
+- 응답이 스키마에 맞지 않으면 전체를 다시 생성하지 않고 먼저 고칩니다.
+  (코드 블록/앞뒤 설명 제거, 언어 코드를 키로 쓴 객체 → 목록, 쉼표로 이은 태그 → 목록, 제목의 "#" 제거 등)
+  고친 뒤에도 빠지거나 잘못된 언어만 언어별 마크다운 프롬프트로 보충합니다.
+- 태그가 비어 있으면 태그만 tagging_llm 으로 따로 생성합니다. (결과에 항상 태그가 들어가도록)
+
+두 모드 모두 사용자 입력에 나오는 용어의 번역 메모리 용어집(공용 용어)을 프롬프트에 붙입니다.
+이 경로를 부르는 엔드포인트/작업에는 인증된 사용자가 없으므로 생성 결과를 번역 메모리에 수집하지 않습니다.
+
+MULTILINGUAL_STRUCTURED_OUTPUT=false 이면 언어별 마크다운 생성 + 태그 생성(이전 방식)을 사용합니다.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Literal, Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+
+from ..llm import DEFAULT_TOKEN_BUDGET
+from ..metrics import metrics
+from .markdown import parse_recipe_content
+from .prompts import MULTILINGUAL_PROMPTS, MULTILINGUAL_SYSTEM_PROMPT, MULTILINGUAL_TAG_PROMPT
+from .sections import glossary_prompt
+
+logger = logging.getLogger(__name__)
+
+MULTILINGUAL_STRUCTURED_OUTPUT = os.getenv("MULTILINGUAL_STRUCTURED_OUTPUT", "true").lower() in ("1", "true", "yes")
+
+LANGUAGES = ("ko", "en", "ja")
+MAX_TAGS = 5
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def normalize_tags(value: Any) -> List[str]:
+    """태그 목록 정리 (쉼표로 이은 문자열 허용, 공백/따옴표/# 제거, 중복 제거, 최대 MAX_TAGS 개)"""
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        return []
+    tags: List[str] = []
+    for tag in value:
+        tag = str(tag).strip().strip('"').lstrip("#").strip()
+        if tag and tag.lower() not in (t.lower() for t in tags):
+            tags.append(tag)
+    return tags[:MAX_TAGS]
+
+
+class RecipeTranslation(BaseModel):
+    """한 언어의 레시피"""
+    language: Literal["ko", "en", "ja"]
+    title: str = Field(min_length=1)
+    description: str = ""
+    content: str = Field(min_length=1)
+
+    @field_validator("title", "description", "content", mode="before")
+    @classmethod
+    def _strip(cls, value: Any) -> Any:
+        return value.strip() if isinstance(value, str) else value
+
+
+class MultilingualRecipe(BaseModel):
+    """세 언어 레시피와 태그"""
+    translations: List[RecipeTranslation]
+    tags: List[str] = Field(default_factory=list)
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _normalize_tags(cls, value: Any) -> List[str]:
+        return normalize_tags(value)
+
+    @model_validator(mode="after")
+    def _check_languages(self) -> "MultilingualRecipe":
+        languages = [t.language for t in self.translations]
+        if sorted(languages) != sorted(LANGUAGES):
+            raise ValueError(f"translations 는 {', '.join(LANGUAGES)} 를 하나씩 포함해야 합니다: {languages}")
+        self.translations.sort(key=lambda t: LANGUAGES.index(t.language))
+        return self
+
+
+def _extract_json(text: str) -> Optional[Any]:
+    """응답에서 JSON 객체를 꺼냅니다. (코드 블록, 앞뒤 설명 허용)"""
+    text = _CODE_FENCE.sub("", text.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        # strict=False: 문자열 안의 줄바꿈 같은 제어 문자를 허용합니다.
+        return json.loads(text[start:end + 1], strict=False)
+    except json.JSONDecodeError:
+        return None
+
+
+def _repair_translation(language: str, item: Any) -> Optional[RecipeTranslation]:
+    if not isinstance(item, dict):
+        return None
+    item = {**item, "language": item.get("language") or language}
+    if isinstance(item.get("title"), str):
+        item["title"] = item["title"].lstrip("#").strip()
+    if item.get("description") is None:
+        item["description"] = ""
+    if isinstance(item.get("content"), list):
+        item["content"] = "\n".join(str(line) for line in item["content"])
+    try:
+        return RecipeTranslation.model_validate(item)
+    except ValidationError:
+        return None
+
+
+def repair_multilingual(data: Any) -> Dict[str, Any]:
+    """
+    스키마에 맞지 않는 응답을 언어별로 고칩니다.
+    반환값: {"translations": {언어: RecipeTranslation}, "tags": [...]} (고칠 수 없는 언어는 빠짐)
+    """
+    if not isinstance(data, dict):
+        return {"translations": {}, "tags": []}
+
+    raw = data.get("translations", data.get("recipes"))
+    if isinstance(raw, dict):
+        items = list(raw.items())
+    elif isinstance(raw, list):
+        items = [(item.get("language") if isinstance(item, dict) else None, item) for item in raw]
+    else:
+        # 최상위에 언어 코드를 키로 쓴 경우
+        items = [(language, data[language]) for language in LANGUAGES if language in data]
+
+    translations: Dict[str, RecipeTranslation] = {}
+    for language, item in items:
+        translation = _repair_translation(str(language or "").lower(), item)
+        if translation is not None:
+            translations.setdefault(translation.language, translation)
+
+    return {"translations": translations, "tags": normalize_tags(data.get("tags"))}
+
+
+def _generate_language(llm: Runnable, language: str, content: str) -> RecipeTranslation:
+    """언어 하나를 마크다운 프롬프트로 생성합니다."""
+    system_prompt = MULTILINGUAL_PROMPTS[language] + glossary_prompt(content, (language,))
+    messages = [SystemMessage(content=system_prompt), HumanMessage(content=content)]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
+    recipe_data = parse_recipe_content(llm.invoke(messages).content)
+    return RecipeTranslation.model_construct(language=language, **recipe_data)
+
+
+def _generate_tags(llm: Runnable, content: str) -> List[str]:
+    messages = [SystemMessage(content=MULTILINGUAL_TAG_PROMPT), HumanMessage(content=content)]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
+    return normalize_tags(llm.invoke(messages).content)
+
+
+def generate_multilingual_structured(
+    llm: Runnable,
+    content: str,
+    tagging_llm: Optional[Runnable] = None,
+) -> MultilingualRecipe:
+    """
+    세 언어 레시피와 태그를 JSON 응답 하나로 생성하고, 맞지 않는 부분만 고치거나 보충합니다.
+    태그가 비어 있으면 tagging_llm(없으면 llm)으로 태그만 생성합니다.
+    """
+    system_prompt = MULTILINGUAL_SYSTEM_PROMPT + glossary_prompt(content, LANGUAGES)
+    messages = [SystemMessage(content=system_prompt), HumanMessage(content=content)]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
+    text = llm.bind(response_format={"type": "json_object"}).invoke(messages).content
+
+    try:
+        recipe = MultilingualRecipe.model_validate_json(text)
+        result = "valid"
+    except ValidationError as e:
+        logger.warning(f"다국어 레시피 응답이 스키마와 맞지 않아 고칩니다: {e.error_count()}개 오류")
+        repaired = repair_multilingual(_extract_json(text))
+        translations = repaired["translations"]
+        missing = [language for language in LANGUAGES if language not in translations]
+        for language in missing:
+            translations[language] = _generate_language(llm, language, content)
+        result = "partial" if missing else "repaired"
+        if missing:
+            metrics.increment("multilingual_regenerated_languages_total", len(missing))
+            logger.info(f"다국어 레시피 응답에서 빠진 언어만 다시 생성했습니다: {missing}")
+        recipe = MultilingualRecipe.model_construct(
+            translations=[translations[language] for language in LANGUAGES],
+            tags=repaired["tags"],
+        )
+
+    tags = "model"
+    if not recipe.tags:
+        recipe.tags = _generate_tags(tagging_llm or llm, content)
+        tags = "generated"
+        logger.info("다국어 레시피 응답에 태그가 없어 태그만 따로 생성했습니다.")
+    metrics.increment("multilingual_structured_total", result=result, tags=tags)
+    return recipe
+
+
+def generate_multilingual_recipe(llm: Runnable, tagging_llm: Runnable, content: str) -> Dict[str, Any]:
+    """사용자 입력을 기반으로 3개 언어(한국어, 영어, 일본어) 레시피와 태그를 생성합니다."""
+    if MULTILINGUAL_STRUCTURED_OUTPUT:
+        recipe = generate_multilingual_structured(llm, content, tagging_llm)
+    else:
+        recipe = MultilingualRecipe.model_construct(
+            translations=[_generate_language(llm, language, content) for language in LANGUAGES],
+            tags=_generate_tags(tagging_llm, content),
+        )
+    return recipe.model_dump()
@@ -0,0 +1,174 @@
+"""
+레시피 정리/생성/번역/다국어 생성 시스템 프롬프트입니다. 일반 응답과 스트리밍 응답이 같은 프롬프트를 사용합니다.
+"""
+
+FORMAT_SYSTEM_PROMPT = """You are a helpful AI assistant that formats recipes in a clear and organized way.
+
+    Please convert the recipe into the following format:
+
+    # Recipe Title
+
+    ## Ingredients
+    - Ingredient 1
+    - Ingredient 2
+    ...
+
+    ## Instructions
+    1. First step
+    2. Second step
+    ...
+
+    ## Cooking Tips
+    - Tip 1
+    - Tip 2
+    ...
+
+    Please maintain all information from the input recipe while organizing it into the above format.
+    Keep it concise and remove any unnecessary explanations or repetitions.
+    Also, maintain the original language of the input recipe."""
+
+GENERATE_SYSTEM_PROMPT = """You are a helpful AI assistant that generates detailed recipes.
+    Based on the user's input, create a complete recipe with a clear title and step-by-step instructions.
+    The recipe should be practical, easy to follow, and include all necessary details.
+    Format the recipe with clear sections for ingredients and cooking steps.
+
+    Please generate the recipe into the following format:
+
+    # Recipe Title
+
+    ## Ingredients
+    - Ingredient 1
+    - Ingredient 2
+    ...
+
+    ## Instructions
+    1. First step
+    2. Second step
+    ...
+
+    ## Cooking Tips
+    - Tip 1
+    - Tip 2
+    ...
+    Please maintain all information from the input recipe while organizing it into the above format.
+    Keep it concise and remove any unnecessary explanations or repetitions.
+    Keep the language natural and engaging while maintaining accuracy and clarity.
+    Also, maintain the original language of the input recipe."""
+
+# 언어별 마크다운 레시피 생성 프롬프트 (다국어 생성의 이전 방식, 구조화 응답에서 빠진 언어 보충)
+MULTILINGUAL_PROMPTS = {
+    "ko": """다음 레시피를 한국어로 작성해주세요. 제목, 간단한 설명, 그리고 다음 형식으로 레시피 내용을 작성해주세요:
+
+# [레시피 제목]
+[레시피 설명]
+
+## 재료
+- 재료 1
+- 재료 2
+...
+
+## 조리 방법
+1. 첫 번째 단계
+2. 두 번째 단계
+...
+
+## 조리 팁
+- 팁 1
+- 팁 2
+...""",
+    "en": """Please write the following recipe in English. Include a title, brief description, and recipe content in the following format:
+
+# [Recipe Title]
+[Recipe Description]
+
+## Ingredients
+- Ingredient 1
+- Ingredient 2
+...
+
+## Instructions
+1. First step
+2. Second step
+...
+
+## Cooking Tips
+- Tip 1
+- Tip 2
+...""",
+    "ja": """以下のレシピを日本語で書いてください。タイトル、簡単な説明、そして以下の形式でレシピの内容を書いてください：
+
+# [レシピタイトル]
+[レシピの説明]
+
+## 材料
+- 材料 1
+- 材料 2
+...
+
+## 作り方
+1. 最初のステップ
+2. 次のステップ
+...
+
+## 調理のコツ
+- コツ 1
+- コツ 2
+..."""
+}
+
+# 태그 생성 프롬프트 (다국어 생성의 이전 방식)
+MULTILINGUAL_TAG_PROMPT = """Based on the recipe, suggest up to 5 relevant tags in English.
+    Return only the tags separated by commas, for example: "Korean, Spicy, Stew, Traditional, Healthy"
+    """
+
+MULTILINGUAL_SYSTEM_PROMPT = """You are a helpful AI assistant that writes recipes in Korean, English and Japanese at once.
+Based on the user's input, write the same recipe in all three languages and suggest up to 5 relevant tags in English.
+
+Respond with ONLY a JSON object of this shape:
+{
+  "translations": [
+    {"language": "ko", "title": "...", "description": "...", "content": "..."},
+    {"language": "en", "title": "...", "description": "...", "content": "..."},
+    {"language": "ja", "title": "...", "description": "...", "content": "..."}
+  ],
+  "tags": ["Korean", "Spicy", "Stew"]
+}
+
+- title: the recipe title only (no "#")
+- description: one or two sentences describing the dish
+- content: markdown body without the title, using these sections in each language
+  - ko: "## 재료", "## 조리 방법", "## 조리 팁"
+  - en: "## Ingredients", "## Instructions", "## Cooking Tips"
+  - ja: "## 材料", "## 作り方", "## 調理のコツ"
+  Ingredients and tips are "- " bullet lists, instructions are a numbered list.
+- All three translations must describe the same recipe (same ingredients, amounts and steps)."""
+
+# 레시피 번역 프롬프트 ({language}: 목표 언어 이름)
+TRANSLATE_SHORT_PROMPT = """You are a helpful AI assistant that translates recipe titles and short descriptions accurately.
+    Please translate the given text into {language}.
+    Keep the translation natural and appropriate for the target language's culinary context.
+    Respond with ONLY the translated text, without any additional text or explanation."""
+
+TRANSLATE_RECIPE_PROMPT = """You are a helpful AI assistant that translates recipes accurately.
+    Please translate the given recipe into {language}.
+    Follow these guidelines:
+    1. Maintain the recipe's structure and format
+    2. Ensure accurate translation of ingredients, measurements, and cooking instructions
+    3. Use appropriate culinary terminology for the target language
+    4. Keep the same markdown formatting if present
+    5. Preserve line breaks and spacing
+
+    Respond with ONLY the translated recipe, without any additional text or explanation."""
+
+# 바뀐 섹션 여러 개를 한 번에 번역하는 프롬프트
+SECTION_TRANSLATE_PROMPT = TRANSLATE_RECIPE_PROMPT + """
+
+    The input contains several independent sections of one recipe. Each section starts with a marker line like <<<0>>>.
+    Translate every section and output each one after its original marker line, in the same order.
+    Keep every marker line exactly as it is and do not add, merge or drop sections."""
+
+# 번역 메모리 용어집 ({terms}: "- ko: ... / en: ... / ja: ..." 줄 목록)
+GLOSSARY_PROMPT = """
+
+    Use these established translations for the following culinary terms whenever they appear:
+{terms}"""
@@ -0,0 +1,313 @@
+"""
+레시피 마크다운의 섹션 분할과 섹션 단위 증분 번역입니다.
+
+레시피를 고칠 때 바뀐 섹션만 번역하고, 바뀌지 않은 섹션은 이전 번역을 그대로 이어 붙입니다.
+번역 지연 시간과 토큰이 레시피 전체 크기가 아니라 수정한 분량에 비례합니다.
+- 섹션은 "## " 제목 줄부터 다음 "## " 제목 전까지입니다. (## 재료 / ## Ingredients, ## 조리 방법 / ## Instructions ...)
+  첫 "## " 제목 전 내용(제목, 설명)도 하나의 섹션입니다.
+- 섹션 원문 해시와 목표 언어로 이전 번역을 찾습니다. (SectionTranslationStore, LRU)
+- 이전 원문/번역 쌍을 알면 섹션 수가 같을 때 순서대로 짝지어 저장소에 먼저 넣습니다.
+- 바뀐 섹션은 구분자로 묶어 한 번에 번역하고, 구분자가 깨지면 해당 섹션만 하나씩 번역합니다.
+- 번역 메모리(translation_memory)에 있는 용어는 프롬프트에 용어집으로 붙이고,
+  번역 메모리에 있는 짧은 글(제목, 카테고리 이름 등)은 LLM 없이 바로 돌려줍니다.
+  user_id 를 넘기면 그 사용자가 수집한 용어도 쓰고, 새로 번역한 짧은 글을 그 사용자의 용어로 수집합니다.
+
+환경 변수
+- RECIPE_TRANSLATION_CACHE_SIZE: 보관할 섹션 번역 수 (기본 5000)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
+
+from ..llm import DEFAULT_TOKEN_BUDGET
+from ..metrics import metrics
+from ..translation_memory import LANGUAGES, detect_language, get_translation_memory
+from .markdown import section_kind
+from .prompts import GLOSSARY_PROMPT, SECTION_TRANSLATE_PROMPT, TRANSLATE_RECIPE_PROMPT, TRANSLATE_SHORT_PROMPT
+
+logger = logging.getLogger(__name__)
+
+LANGUAGE_NAMES = {"ko": "Korean", "en": "English", "ja": "Japanese"}
+
+_SECTION_HEADING = re.compile(r"^##\s+(.*?)\s*#*$")
+_SECTION_MARKER = re.compile(r"^<<<(\d+)>>>\s*$", re.MULTILINE)
+
+
+def content_hash(text: str) -> str:
+    """줄 끝 공백과 앞뒤 빈 줄을 무시한 내용 해시"""
+    normalized = "\n".join(line.rstrip() for line in text.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+class RecipeSection:
+    """레시피 마크다운의 "## " 섹션 하나 (heading 이 None 이면 첫 제목 전 내용)"""
+    __slots__ = ("heading", "text", "hash")
+
+    def __init__(self, heading: Optional[str], text: str):
+        self.heading = heading
+        self.text = text
+        self.hash = content_hash(text)
+
+    @property
+    def kind(self) -> str:
+        return section_kind(self.heading) if self.heading else "preamble"
+
+    def __repr__(self) -> str:
+        return f"RecipeSection({self.heading!r}, {self.hash[:8]})"
+
+
+def split_sections(markdown: str) -> List[RecipeSection]:
+    """레시피 마크다운을 "## " 제목 단위로 나눕니다. (섹션을 이어 붙이면 원문과 같음)"""
+    sections: List[RecipeSection] = []
+    heading: Optional[str] = None
+    lines: List[str] = []
+    for line in markdown.strip().splitlines():
+        match = _SECTION_HEADING.match(line.strip())
+        if match and (lines or heading is not None):
+            sections.append(RecipeSection(heading, "\n".join(lines).strip()))
+            lines = []
+        if match:
+            heading = match.group(1)
+        lines.append(line)
+    if lines:
+        sections.append(RecipeSection(heading, "\n".join(lines).strip()))
+    return [section for section in sections if section.text]
+
+
+def join_sections(texts: List[str]) -> str:
+    return "\n\n".join(text.strip() for text in texts if text.strip())
+
+
+class SectionTranslationStore:
+    """(원문 해시, 목표 언어) → 번역문 LRU 저장소 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SectionTranslationStore":
+        return cls(max_entries=int(os.getenv("RECIPE_TRANSLATION_CACHE_SIZE", "5000")))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, source_hash: str, language: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get((source_hash, language))
+            if text is not None:
+                self._entries.move_to_end((source_hash, language))
+            return text
+
+    def put(self, source_hash: str, language: str, text: str) -> None:
+        with self._lock:
+            self._entries[(source_hash, language)] = text
+            self._entries.move_to_end((source_hash, language))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        metrics.set_gauge("recipe_translation_cache_entries", len(self._entries))
+
+    def remember(self, source: str, translation: str, language: str) -> int:
+        """이전 원문/번역 쌍을 섹션별로 짝지어 저장합니다. (섹션 수가 다르면 짝지을 수 없어 0)"""
+        source_sections, translated_sections = split_sections(source), split_sections(translation)
+        if len(source_sections) != len(translated_sections):
+            return 0
+        for source_section, translated_section in zip(source_sections, translated_sections):
+            self.put(source_section.hash, language, translated_section.text)
+        return len(source_sections)
+
+
+section_translations = SectionTranslationStore.from_env()
+
+
+def glossary_prompt(
+    text: str,
+    target_languages: Iterable[str],
+    source_language: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """text 에 나오는 용어의 번역 메모리 용어집 프롬프트 (없으면 빈 문자열)"""
+    entries = get_translation_memory().glossary(text, target_languages, source_language, user_id)
+    if not entries:
+        return ""
+    metrics.observe("translation_glossary_terms", len(entries))
+    terms = "\n".join(
+        "    - " + " / ".join(f"{language}: {entry[language]}" for language in LANGUAGES if language in entry)
+        for entry in entries
+    )
+    return GLOSSARY_PROMPT.format(terms=terms)
+
+
+def _invoke(
+    llm: Runnable,
+    system_prompt: str,
+    text: str,
+    language: str,
+    source_language: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    system_prompt = system_prompt.format(language=LANGUAGE_NAMES.get(language, language))
+    system_prompt += glossary_prompt(text, (language,), source_language, user_id)
+    messages = [SystemMessage(content=system_prompt), HumanMessage(content=text)]
+    DEFAULT_TOKEN_BUDGET.ensure_within(messages)
+    return llm.invoke(messages).content.strip()
+
+
+def _translate_batch(
+    llm: Runnable,
+    sections: List[RecipeSection],
+    language: str,
+    source_language: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> Dict[int, str]:
+    """바뀐 섹션들을 구분자로 묶어 한 번에 번역합니다. 반환값: 목록 위치 → 번역문 (구분자가 깨진 섹션은 빠짐)"""
+    if len(sections) == 1:
+        return {0: _invoke(llm, TRANSLATE_RECIPE_PROMPT, sections[0].text, language, source_language, user_id)}
+
+    text = "\n".join(f"<<<{i}>>>\n{section.text}" for i, section in enumerate(sections))
+    response = _invoke(llm, SECTION_TRANSLATE_PROMPT, text, language, source_language, user_id)
+    parts = _SECTION_MARKER.split(response)
+    # split 결과: [앞부분, 번호, 본문, 번호, 본문, ...]
+    bodies: Dict[int, str] = {}
+    for number, body in zip(parts[1::2], parts[2::2]):
+        index = int(number)
+        if 0 <= index < len(sections) and body.strip():
+            bodies.setdefault(index, body.strip())
+    # 다음 구분자가 빠졌으면 본문에 다음 섹션이 섞여 있으므로 버립니다.
+    return {
+        index: body for index, body in bodies.items()
+        if index == len(sections) - 1 or index + 1 in bodies
+    }
+
+
+def translate_recipe_sections(
+    llm: Runnable,
+    markdown: str,
+    language: str,
+    previous_source: Optional[str] = None,
+    previous_translation: Optional[str] = None,
+    store: SectionTranslationStore = section_translations,
+    source_language: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """
+    레시피 마크다운을 language 로 번역합니다. 이전에 번역한 적 있는 섹션은 저장된 번역을 쓰고
+    바뀐 섹션만 LLM 으로 번역해 원래 순서대로 이어 붙입니다.
+    """
+    if previous_source and previous_translation:
+        store.remember(previous_source, previous_translation, language)
+
+    sections = split_sections(markdown)
+    texts: List[Optional[str]] = [store.get(section.hash, language) for section in sections]
+    changed = [i for i, text in enumerate(texts) if text is None]
+    metrics.increment("recipe_translation_sections_total", len(sections) - len(changed), result="reused")
+    metrics.increment("recipe_translation_sections_total", len(changed), result="translated")
+    if not changed:
+        return join_sections(texts)
+
+    translated = _translate_batch(llm, [sections[i] for i in changed], language, source_language, user_id)
+    for position, index in enumerate(changed):
+        text = translated.get(position)
+        if text is None:
+            # 구분자가 깨진 섹션만 따로 번역합니다.
+            metrics.increment("recipe_translation_section_retries_total")
+            text = _translate_batch(llm, [sections[index]], language, source_language, user_id)[0]
+        texts[index] = text
+        store.put(sections[index].hash, language, text)
+
+    logger.info(f"레시피 번역 ({language}): 섹션 {len(sections)}개 중 {len(changed)}개 번역")
+    return join_sections(texts)
+
+
+def translate_short_text(
+    llm: Runnable,
+    text: str,
+    language: str,
+    store: SectionTranslationStore = section_translations,
+    source_language: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """
+    제목/설명/카테고리 이름 같은 짧은 글을 번역합니다.
+    번역 메모리에 있는 용어는 LLM 없이 돌려주고, 새로 번역한 용어는 user_id 사용자의 번역 메모리에 수집합니다.
+    """
+    if not text.strip():
+        return ""
+    source_language = source_language or detect_language(text)
+    if source_language == language:
+        return text
+    memory = get_translation_memory()
+    remembered = memory.lookup(text, language, source_language, user_id)
+    if remembered is not None:
+        return remembered
+
+    key = content_hash(f"short:{text}")
+    cached = store.get(key, language)
+    if cached is not None:
+        return cached
+    translated = _invoke(llm, TRANSLATE_SHORT_PROMPT, text, language, source_language, user_id)
+    store.put(key, language, translated)
+    if source_language:
+        memory.learn({source_language: text, language: translated}, user_id, origin="translation")
+    return translated
+
+
+def fill_translations(
+    source_language: str,
+    translations: Dict[str, Dict[str, Optional[str]]],
+    previous: Dict[str, Dict[str, str]],
+    llm: Runnable,
+    short_llm: Runnable,
+    languages: Tuple[str, ...] = ("ko", "en", "ja"),
+    store: SectionTranslationStore = section_translations,
+    user_id: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """
+    source_language 의 수정본으로 나머지 언어의 빠진 필드(title, description, content)를 채웁니다.
+    - 원문 필드가 이전과 같으면 이전 번역을 그대로 씁니다.
+    - content 는 바뀐 섹션만 번역합니다. (이전 원문/번역을 저장소에 먼저 넣음)
+    previous: 언어 → 수정 전 번역 {"title", "description", "content"}
+    """
+    previous_source = previous.get(source_language, {})
+    # 원문에서 빠진 필드는 이전 값을 그대로 씁니다.
+    source = {
+        field: translations[source_language].get(field) if translations[source_language].get(field) is not None
+        else previous_source.get(field) or ""
+        for field in ("title", "description", "content")
+    }
+    result = []
+    for language in languages:
+        given = translations.get(language, {})
+        old = previous.get(language, {})
+        if language == source_language:
+            result.append({"language": language, **source})
+            continue
+        filled = {"language": language}
+        for field in ("title", "description", "content"):
+            if given.get(field) is not None:
+                filled[field] = given[field]
+                continue
+            source_text = source[field]
+            unchanged = source_text == (previous_source.get(field) or "") and old.get(field) is not None
+            if unchanged:
+                filled[field] = old[field]
+            elif field == "content":
+                filled[field] = translate_recipe_sections(
+                    llm, source_text, language, previous_source.get(field), old.get(field),
+                    store=store, source_language=source_language, user_id=user_id,
+                )
+            else:
+                filled[field] = translate_short_text(
+                    short_llm, source_text, language, store=store, source_language=source_language, user_id=user_id,
+                )
+        result.append(filled)
+    return result
@@ -0,0 +1,94 @@
+"""
+레시피 마크다운을 LLM 토큰 단위로 SSE(Server-Sent Events) 스트리밍합니다.
+
+이벤트 순서
+- delta: {"text"}  모델이 생성한 원문 조각 (그대로 이어 붙이면 전체 마크다운)
+- title / description / section / item: RecipeMarkdownParser 가 줄 단위로 만든 구조 이벤트
+- done: {"title", "description", "sections", "content", "token_usage"}
+- error: {"error", "retry_after"?}  스트림 도중 실패
+
+StreamingResponse 는 엔드포인트가 반환된 뒤에 본문을 생성하므로, 의존성 대신
+제너레이터 안에서 우선순위와 토큰 사용량 추적을 직접 설정합니다.
+"""
+
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+from ..llm import LLMSchedulerError, Priority, find_scheduler_error, llm_priority, track_token_usage
+from ..metrics import metrics
+from .markdown import RecipeMarkdownParser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TITLE = "새로운 레시피"
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _error_event(error: Exception) -> str:
+    scheduler_error = error if isinstance(error, LLMSchedulerError) else find_scheduler_error(error)
+    if scheduler_error:
+        return sse_event("error", {"error": str(scheduler_error), "retry_after": scheduler_error.retry_after})
+    return sse_event("error", {"error": str(error)})
+
+
+async def stream_recipe_markdown(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    route: str,
+    priority: Priority = Priority.STANDARD,
+) -> AsyncIterator[str]:
+    """llm.astream 결과를 SSE 이벤트 문자열로 변환합니다."""
+    parser = RecipeMarkdownParser()
+    chunks: List[str] = []
+    started = time.perf_counter()
+    status = "cancelled"
+
+    with llm_priority(priority), track_token_usage() as usage:
+        try:
+            async for chunk in llm.astream(messages, stream_usage=True):
+                text = chunk.content if isinstance(chunk.content, str) else ""
+                if not text:
+                    continue
+                if not chunks:
+                    metrics.observe("recipe_stream_first_token_seconds", time.perf_counter() - started, route=route)
+                chunks.append(text)
+
+                yield sse_event("delta", {"text": text})
+                for event, data in parser.feed(text):
+                    if event == "title":
+                        metrics.observe("recipe_stream_title_seconds", time.perf_counter() - started, route=route)
+                    yield sse_event(event, data)
+
+            for event, data in parser.close():
+                yield sse_event(event, data)
+
+            result = parser.result()
+            status = "completed"
+            yield sse_event("done", {
+                **result,
+                "title": result["title"] or DEFAULT_TITLE,
+                "content": "".join(chunks),
+                "token_usage": usage.as_dict(),
+            })
+        except Exception as e:
+            status = "error"
+            logger.error(f"레시피 스트리밍 중 오류 발생 ({route}): {e}")
+            yield _error_event(e)
+        finally:
+            # 클라이언트가 연결을 끊으면 제너레이터가 취소되고 LLM 스트림도 함께 닫힙니다.
+            summary = usage.as_dict()
+            metrics.increment("recipe_stream_total", route=route, status=status)
+            metrics.observe("recipe_stream_seconds", time.perf_counter() - started, route=route)
+            metrics.observe("request_input_tokens", summary["input_tokens"], route=route)
+            metrics.observe("request_output_tokens", summary["output_tokens"], route=route)
+            metrics.observe("request_llm_calls", summary["llm_calls"], route=route)
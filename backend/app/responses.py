@@ -0,0 +1,159 @@
+"""
+orjson 기반 JSON 응답과 응답 압축(gzip/brotli) 미들웨어입니다.
+
+환경 변수
+- COMPRESSION_MIN_SIZE: 이 크기(바이트) 이상인 응답만 압축 (기본 1024)
+- GZIP_LEVEL: gzip 압축 수준 (기본 6)
+- BROTLI_QUALITY: brotli 품질 (기본 4, 동적 응답에 맞춘 빠른 설정)
+
+brotli 패키지가 없으면 gzip 만 사용합니다.
+"""
+
+import gzip
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import orjson
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# 압축할 Content-Type (SSE 는 스트리밍이므로 애초에 압축 대상이 아님)
+_COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/markdown", "text/csv")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 으로 직렬화하는 JSON 응답 (앱 기본 응답 클래스)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(model: BaseModel, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """
+    이미 만들어진(검증된) 응답 모델을 바로 직렬화합니다.
+    모델 인스턴스를 그대로 반환하면 FastAPI 가 response_model 로 한 번 더 검증하므로 그 과정을 건너뜁니다.
+    """
+    return FastJSONResponse(model.model_dump(), status_code=status_code, headers=headers)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 인코딩(br/gzip)을 고릅니다. 품질값이 같으면 br 을 우선합니다."""
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip()] = quality
+
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding 에 따라 br 또는 gzip 으로 응답을 압축하는 ASGI 미들웨어
+
+    본문이 한 번에 전송되는 응답만 압축합니다. 스트리밍 응답(SSE 등)은 청크가 늦게
+    전달되지 않도록 그대로 통과시킵니다.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    @classmethod
+    def options_from_env(cls) -> Dict[str, int]:
+        return {
+            "minimum_size": int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+            "gzip_level": int(os.getenv("GZIP_LEVEL", "6")),
+            "brotli_quality": int(os.getenv("BROTLI_QUALITY", "4")),
+        }
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # 첫 본문을 보고 압축 여부를 정할 때까지 헤더 전송을 미룹니다.
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and content_type.startswith(_COMPRESSIBLE_TYPES)
+            ):
+                compressed = self.compress(encoding, body)
+                if len(compressed) < len(body):
+                    headers["content-encoding"] = encoding
+                    headers["content-length"] = str(len(compressed))
+                    headers.add_vary_header("Accept-Encoding")
+                    metrics.increment("response_compressed_total", encoding=encoding)
+                    metrics.observe("response_compression_ratio", len(compressed) / len(body), encoding=encoding)
+                    message = {**message, "body": compressed}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,16 @@
+"""
+search 패키지는 백엔드 내 검색(토큰화, BM25 역색인, 사용자별 레시피 색인, 임베딩 유사도 검색)을 제공합니다.
+"""
+
+from .text import normalize, tokenize
+from .bm25 import BM25Index
+from .recipe_index import RecipeSearchIndexes, recipe_fields, recipe_summary
+from .vector import (
+    RecipeVectorSearch,
+    RecipeVectorStore,
+    PgVectorRecipeStore,
+    SQLiteRecipeVectorStore,
+    create_vector_store,
+    get_recipe_vector_search,
+    close_recipe_vector_search,
+)
@@ -0,0 +1,88 @@
+"""
+필드 가중치를 지원하는 BM25 역색인입니다. (문서 단위 추가/삭제 가능)
+"""
+
+import heapq
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, List, Tuple
+
+from .text import tokenize
+
+
+class BM25Index:
+    """메모리 내 BM25 역색인"""
+
+    def __init__(self, field_weights: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        # term -> {doc_id: 가중 빈도}
+        self._postings: Dict[str, Dict[Hashable, float]] = defaultdict(dict)
+        # doc_id -> {term: 가중 빈도}
+        self._doc_terms: Dict[Hashable, Dict[str, float]] = {}
+        self._doc_lengths: Dict[Hashable, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: Hashable, fields: Dict[str, str]) -> None:
+        """문서를 추가합니다. 이미 있으면 교체합니다."""
+        frequencies: Dict[str, float] = defaultdict(float)
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for token in tokenize(text):
+                frequencies[token] += weight
+        length = sum(frequencies.values())
+
+        with self._lock:
+            self._remove(doc_id)
+            for term, frequency in frequencies.items():
+                self._postings[term][doc_id] = frequency
+            self._doc_terms[doc_id] = dict(frequencies)
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+
+    def remove(self, doc_id: Hashable) -> bool:
+        with self._lock:
+            return self._remove(doc_id)
+
+    def _remove(self, doc_id: Hashable) -> bool:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        return True
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Hashable, float]]:
+        """(doc_id, 점수) 목록을 점수 내림차순으로 반환합니다."""
+        terms = set(tokenize(query, for_query=True))
+        scores: Dict[Hashable, float] = defaultdict(float)
+
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if not doc_count or not terms:
+                return []
+            average_length = self._total_length / doc_count or 1.0
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,171 @@
+"""
+사용자별 레시피 검색 색인입니다.
+
+- 사용자의 첫 검색 때 레시피 목록(GET /api/recipes)을 한 번 받아 색인을 만듭니다.
+- 제목, 설명, 태그, 본문을 ko/en/ja 번역 전체에 걸쳐 색인하므로 어느 언어로 검색해도 찾을 수 있습니다.
+- 에이전트의 생성/수정/삭제 도구가 색인을 바로 갱신합니다.
+  웹 화면에서의 변경은 RECIPE_INDEX_TTL_SECONDS(기본 300초) 후 재구성 때 반영됩니다.
+- 색인은 최근 사용한 RECIPE_INDEX_MAX_USERS 명까지만 메모리에 유지합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from ..metrics import metrics
+from .bm25 import BM25Index
+
+logger = logging.getLogger(__name__)
+
+RecipeLoader = Callable[[str], List[Dict[str, Any]]]
+
+# 필드 가중치
+RECIPE_FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "description": 1.5,
+    "content": 1.0,
+}
+
+
+def _tag_names(tag: Any) -> List[str]:
+    # 도구 입력은 문자열, API 응답은 {"tag": {"name": ..., "translations": [...]}} 형태
+    if isinstance(tag, str):
+        return [tag]
+    if not isinstance(tag, dict):
+        return []
+    tag = tag.get("tag", tag)
+    names = [tag.get("name") or ""]
+    names += [t.get("name") or "" for t in tag.get("translations") or []]
+    return [name for name in names if name]
+
+
+def recipe_fields(recipe: Dict[str, Any]) -> Dict[str, str]:
+    """레시피를 색인 필드별 텍스트로 변환합니다."""
+    translations = recipe.get("translations") or []
+    return {
+        "title": "\n".join(t.get("title") or "" for t in translations),
+        "description": "\n".join(t.get("description") or "" for t in translations),
+        "content": "\n".join(t.get("content") or "" for t in translations),
+        "tags": "\n".join(name for tag in recipe.get("tags") or [] for name in _tag_names(tag)),
+    }
+
+
+def recipe_summary(recipe: Dict[str, Any], language: str) -> Dict[str, Any]:
+    """검색 결과용 레시피 (요청 언어 번역 하나만, 없으면 첫 번째 번역)"""
+    translations = recipe.get("translations") or []
+    translation = next((t for t in translations if t.get("language") == language), None)
+    if translation is None and translations:
+        translation = translations[0]
+    return {
+        "id": recipe.get("id"),
+        "type": recipe.get("type"),
+        "isPublic": recipe.get("isPublic"),
+        "favoriteCount": recipe.get("favoriteCount"),
+        "translations": [translation] if translation else [],
+        "tags": sorted({name for tag in recipe.get("tags") or [] for name in _tag_names(tag)}),
+    }
+
+
+class _UserIndex:
+    def __init__(self):
+        self.index = BM25Index(RECIPE_FIELD_WEIGHTS)
+        self.recipes: Dict[str, Dict[str, Any]] = {}
+        self.built_at = 0.0
+        self.lock = threading.Lock()
+
+
+class RecipeSearchIndexes:
+    """사용자별 레시피 색인 관리자"""
+
+    def __init__(self, loader: RecipeLoader, ttl_seconds: float = 300, max_users: int = 1000):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[str, _UserIndex]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls, loader: RecipeLoader) -> "RecipeSearchIndexes":
+        return cls(
+            loader=loader,
+            ttl_seconds=float(os.getenv("RECIPE_INDEX_TTL_SECONDS", "300")),
+            max_users=int(os.getenv("RECIPE_INDEX_MAX_USERS", "1000")),
+        )
+
+    def _entry(self, user_id: str) -> _UserIndex:
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                entry = self._users[user_id] = _UserIndex()
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+                metrics.set_gauge("recipe_index_users", len(self._users))
+            else:
+                self._users.move_to_end(user_id)
+            return entry
+
+    def _loaded(self, user_id: str) -> Optional[_UserIndex]:
+        with self._lock:
+            return self._users.get(user_id)
+
+    def _ensure_built(self, user_id: str) -> _UserIndex:
+        entry = self._entry(user_id)
+        # 같은 사용자의 동시 첫 검색은 한 번만 재구성합니다.
+        with entry.lock:
+            if time.time() - entry.built_at < self.ttl_seconds:
+                return entry
+
+            started = time.perf_counter()
+            recipes = self.loader(user_id)
+            index = BM25Index(RECIPE_FIELD_WEIGHTS)
+            by_id = {}
+            for recipe in recipes:
+                recipe_id = str(recipe["id"])
+                by_id[recipe_id] = recipe
+                index.add(recipe_id, recipe_fields(recipe))
+            entry.index, entry.recipes, entry.built_at = index, by_id, time.time()
+
+            metrics.increment("recipe_index_builds_total")
+            metrics.observe("recipe_index_build_seconds", time.perf_counter() - started)
+            logger.info(f"레시피 색인 생성 (user {user_id}, {len(by_id)}개)")
+        return entry
+
+    def search(self, user_id: str, query: str, language: str = "ko", limit: int = 10) -> List[Dict[str, Any]]:
+        """사용자 레시피를 검색해 점수 순 요약 목록을 반환합니다."""
+        entry = self._ensure_built(user_id)
+        started = time.perf_counter()
+        hits = entry.index.search(query, limit)
+        metrics.observe("recipe_search_seconds", time.perf_counter() - started)
+        return [
+            {**recipe_summary(entry.recipes[recipe_id], language), "score": round(score, 4)}
+            for recipe_id, score in hits
+            if recipe_id in entry.recipes
+        ]
+
+    def upsert(self, user_id: str, recipe: Dict[str, Any]) -> None:
+        """색인이 이미 있는 사용자의 레시피를 추가하거나 기존 항목에 덮어씁니다."""
+        entry = self._loaded(user_id)
+        if entry is None or not entry.built_at or recipe.get("id") is None:
+            return
+        recipe_id = str(recipe["id"])
+        with entry.lock:
+            recipe = {**entry.recipes.get(recipe_id, {}), **recipe}
+            entry.recipes[recipe_id] = recipe
+            entry.index.add(recipe_id, recipe_fields(recipe))
+
+    def remove(self, user_id: str, recipe_id: Any) -> None:
+        entry = self._loaded(user_id)
+        if entry is None:
+            return
+        with entry.lock:
+            entry.recipes.pop(str(recipe_id), None)
+            entry.index.remove(str(recipe_id))
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+            metrics.set_gauge("recipe_index_users", len(self._users))
@@ -0,0 +1,39 @@
+"""
+검색용 토큰화입니다.
+
+- NFKC 정규화 + 소문자 변환 (전각/반각 문자 통일)
+- 한글/가나/한자 구간: 띄어쓰기와 조사에 영향을 덜 받도록 문자 n-gram 을 사용합니다.
+  색인은 1-gram + 2-gram, 검색어는 2-gram (한 글자 검색어만 1-gram) 으로 만듭니다.
+  예) "김치찌개를" → 김, 치, 찌, 개, 를, 김치, 치찌, 찌개, 개를
+- 그 외 문자: 영숫자 단어 단위
+"""
+
+import re
+import unicodedata
+from typing import List
+
+# 한글 음절/자모, 히라가나/가타카나, CJK 한자
+_CJK_CHARS = r"\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff"
+_TOKEN_PATTERN = re.compile(rf"(?P<cjk>[{_CJK_CHARS}]+)|(?P<word>[^\W_{_CJK_CHARS}]+)")
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def tokenize(text: str, for_query: bool = False) -> List[str]:
+    """문자열을 검색 토큰 목록으로 변환합니다."""
+    tokens: List[str] = []
+    if not text:
+        return tokens
+
+    for match in _TOKEN_PATTERN.finditer(normalize(text)):
+        run = match.group("cjk")
+        if run is None:
+            tokens.append(match.group("word"))
+            continue
+
+        if len(run) == 1 or not for_query:
+            tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
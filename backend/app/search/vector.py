@@ -0,0 +1,512 @@
+"""
+레시피 임베딩(recipes.embedding, 1536차원) 기반 유사도 검색입니다.
+
+VECTOR_STORE 환경 변수로 저장소를 선택합니다.
+- pgvector (기본값): DATABASE_URL 의 PostgreSQL 에 asyncpg 커넥션 풀로 직접 질의합니다.
+  ivfflat 인덱스 검색은 탐색한 리스트(probes)의 후보에만 범위/언어 조건을 적용하므로,
+  조건을 통과하는 레시피가 적으면 결과가 k 개보다 적거나 비어 버립니다. 그래서 범위별로 질의를 나눕니다.
+  - own / shared: 대상 레시피가 사용자 한 명 분량이므로 조건으로 먼저 걸러 낸 뒤(MATERIALIZED CTE)
+    인덱스 없이 정확한 거리 순으로 정렬합니다.
+  - public / all: ivfflat 인덱스를 쓰고, pgvector 0.8 의 iterative scan(PGVECTOR_ITERATIVE_SCAN)으로
+    조건을 통과한 후보가 k 개가 될 때까지(최대 PGVECTOR_MAX_PROBES 리스트) 더 탐색합니다.
+    relaxed_order 는 순서가 조금 어긋날 수 있어 바깥 질의에서 거리로 다시 정렬합니다.
+    iterative scan 을 지원하지 않는 pgvector 에서는 경고를 남기고 probes 만 설정합니다.
+  커넥션마다 ivfflat.probes(PGVECTOR_PROBES)를 설정합니다.
+- sqlite: VECTOR_SQLITE_PATH 의 SQLite 파일을 NumPy 로 전수 비교합니다. (테스트/로컬용)
+
+검색 범위(scope)
+- own: 내 레시피 / shared: 나에게 공유되어 수락한 레시피 / public: 공개 레시피 / all: 셋 모두
+
+도구는 동기 함수로 실행되므로, 커넥션 풀은 전용 이벤트 루프 스레드에서 관리합니다.
+질의 임베딩은 호출한 스레드에서 동기로 만들고 LRU 캐시에 보관합니다.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ..embeddings import create_embedder
+from ..metrics import metrics
+from .text import normalize
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ("own", "shared", "public", "all")
+LANGUAGES = ("ko", "en", "ja")
+MAX_K = 20
+
+# 요청 언어 번역이 없을 때 사용할 번역 순서
+_TRANSLATION_FALLBACK_ORDER = {"ko": 0, "en": 1, "ja": 2}
+
+
+def _vector_literal(embedding: Sequence[float]) -> str:
+    return "[" + ",".join(f"{v:.7g}" for v in embedding) + "]"
+
+
+class RecipeVectorStore:
+    """레시피 벡터 저장소 인터페이스"""
+
+    async def search(
+        self,
+        embedding: Sequence[float],
+        user_id: str,
+        k: int,
+        language: Optional[str],
+        scope: str,
+    ) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class PgVectorRecipeStore(RecipeVectorStore):
+    """pgvector 저장소 (asyncpg 커넥션 풀)"""
+
+    _SCOPE_FILTERS = {
+        "own": "r.owner_id = $3",
+        "shared": (
+            "EXISTS (SELECT 1 FROM shared_recipes s WHERE s.recipe_id = r.id "
+            "AND s.user_id = $3 AND s.status = 'accepted' AND s.can_view)"
+        ),
+        "public": "r.is_public",
+    }
+    # 조건으로 먼저 걸러 정확히 정렬하는 범위 (사용자 한 명 분량의 레시피)
+    _EXACT_SCOPES = ("own", "shared")
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        probes: int = 10,
+        timeout: float = 5.0,
+        iterative_scan: Optional[str] = "relaxed_order",
+        max_probes: Optional[int] = None,
+    ):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.probes = probes
+        self.timeout = timeout
+        self.iterative_scan = iterative_scan
+        self.max_probes = max_probes
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._queries = {scope: self._build_query(scope) for scope in SCOPES}
+
+    def _build_query(self, scope: str) -> str:
+        if scope == "all":
+            scope_filter = "(" + " OR ".join(self._SCOPE_FILTERS.values()) + ")"
+        else:
+            scope_filter = self._SCOPE_FILTERS[scope]
+        filters = f"""
+                r.embedding IS NOT NULL
+                AND {scope_filter}
+                AND ($4::text IS NULL OR EXISTS (
+                    SELECT 1 FROM recipe_translations x WHERE x.recipe_id = r.id AND x.language = $4
+                ))"""
+        if scope in self._EXACT_SCOPES:
+            # 먼저 걸러 낸 후보(인덱스를 쓰지 않는 작은 집합)를 정확한 거리로 정렬합니다.
+            nearest = f"""
+            candidates AS MATERIALIZED (
+                SELECT r.id, r.embedding FROM recipes r WHERE {filters}
+            ),
+            nearest AS (
+                SELECT c.id, c.embedding <=> $1::text::vector AS distance
+                FROM candidates c
+                ORDER BY distance
+                LIMIT $2
+            )"""
+        else:
+            # ivfflat 인덱스 검색 (iterative scan 이 조건을 통과한 후보가 k 개가 될 때까지 탐색)
+            nearest = f"""
+            nearest AS MATERIALIZED (
+                SELECT r.id, r.embedding <=> $1::text::vector AS distance
+                FROM recipes r
+                WHERE {filters}
+                ORDER BY r.embedding <=> $1::text::vector
+                LIMIT $2
+            )"""
+        # $1: 질의 벡터, $2: k, $3: 사용자 ID, $4: 언어 (NULL 이면 전체)
+        return f"""
+            WITH {nearest}
+            SELECT r.id, r.type, r.is_public, r.favorite_count, r.owner_id,
+                   t.language, t.title, t.description,
+                   1 - n.distance AS similarity
+            FROM nearest n
+            JOIN recipes r ON r.id = n.id
+            LEFT JOIN LATERAL (
+                SELECT rt.language, rt.title, rt.description
+                FROM recipe_translations rt
+                WHERE rt.recipe_id = r.id
+                ORDER BY (rt.language = $4) DESC NULLS LAST,
+                         CASE rt.language WHEN 'ko' THEN 0 WHEN 'en' THEN 1 ELSE 2 END
+                LIMIT 1
+            ) t ON TRUE
+            ORDER BY n.distance
+        """
+
+    async def _init_connection(self, connection) -> None:
+        await connection.execute(f"SET ivfflat.probes = {int(self.probes)}")
+        if not self.iterative_scan:
+            return
+        import asyncpg
+
+        try:
+            await connection.execute(f"SET ivfflat.iterative_scan = '{self.iterative_scan}'")
+            if self.max_probes:
+                await connection.execute(f"SET ivfflat.max_probes = {int(self.max_probes)}")
+        except asyncpg.PostgresError as e:
+            # pgvector 0.8 미만: public/all 검색은 탐색한 리스트의 후보만 봅니다.
+            logger.warning(f"ivfflat iterative scan 을 설정하지 못했습니다. (pgvector 0.8 이상 필요): {e}")
+            self.iterative_scan = None
+
+    async def _get_pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    import asyncpg
+
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        command_timeout=self.timeout,
+                        init=self._init_connection,
+                    )
+        return self._pool
+
+    async def search(self, embedding, user_id, k, language, scope):
+        pool = await self._get_pool()
+        async with pool.acquire(timeout=self.timeout) as connection:
+            rows = await connection.fetch(self._queries[scope], _vector_literal(embedding), k, user_id, language)
+        return [
+            {
+                "id": row["id"],
+                "type": row["type"],
+                "isPublic": row["is_public"],
+                "favoriteCount": row["favorite_count"],
+                "owned": row["owner_id"] == user_id,
+                "language": row["language"],
+                "title": row["title"],
+                "description": row["description"],
+                "similarity": round(float(row["similarity"]), 4),
+            }
+            for row in rows
+        ]
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+class SQLiteRecipeVectorStore(RecipeVectorStore):
+    """SQLite + NumPy 전수 비교 저장소 (pgvector 스키마의 필요한 부분만 재현)"""
+
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS recipes (
+                id INTEGER PRIMARY KEY,
+                type TEXT NOT NULL DEFAULT 'ai',
+                is_public INTEGER NOT NULL DEFAULT 0,
+                favorite_count INTEGER NOT NULL DEFAULT 0,
+                owner_id TEXT NOT NULL,
+                embedding BLOB
+            );
+            CREATE TABLE IF NOT EXISTS recipe_translations (
+                recipe_id INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                content TEXT NOT NULL DEFAULT ''
+            );
+            CREATE TABLE IF NOT EXISTS shared_recipes (
+                recipe_id INTEGER NOT NULL,
+                user_id TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'accepted',
+                can_view INTEGER NOT NULL DEFAULT 1
+            );
+            """
+        )
+        self._matrix: Optional[np.ndarray] = None
+        self._rows: List[Dict[str, Any]] = []
+
+    def add_recipe(
+        self,
+        recipe_id: int,
+        owner_id: str,
+        embedding: Sequence[float],
+        translations: List[Dict[str, Any]],
+        is_public: bool = False,
+        favorite_count: int = 0,
+        type: str = "ai",
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recipes (id, type, is_public, favorite_count, owner_id, embedding) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (recipe_id, type, int(is_public), favorite_count, owner_id,
+                 np.asarray(embedding, dtype=np.float32).tobytes()),
+            )
+            self._conn.execute("DELETE FROM recipe_translations WHERE recipe_id = ?", (recipe_id,))
+            self._conn.executemany(
+                "INSERT INTO recipe_translations (recipe_id, language, title, description, content) VALUES (?, ?, ?, ?, ?)",
+                [(recipe_id, t["language"], t["title"], t.get("description"), t.get("content", "")) for t in translations],
+            )
+            self._conn.commit()
+            self._matrix = None
+
+    def share(self, recipe_id: int, user_id: str, status: str = "accepted") -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO shared_recipes (recipe_id, user_id, status) VALUES (?, ?, ?)", (recipe_id, user_id, status)
+            )
+            self._conn.commit()
+            self._matrix = None
+
+    def _load(self) -> None:
+        recipes = self._conn.execute(
+            "SELECT id, type, is_public, favorite_count, owner_id, embedding FROM recipes WHERE embedding IS NOT NULL"
+        ).fetchall()
+        translations: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for recipe_id, language, title, description in self._conn.execute(
+            "SELECT recipe_id, language, title, description FROM recipe_translations"
+        ):
+            translations.setdefault(recipe_id, {})[language] = {
+                "language": language, "title": title, "description": description,
+            }
+        shared: Dict[int, set] = {}
+        for recipe_id, user_id in self._conn.execute(
+            "SELECT recipe_id, user_id FROM shared_recipes WHERE status = 'accepted' AND can_view"
+        ):
+            shared.setdefault(recipe_id, set()).add(user_id)
+
+        self._rows = [
+            {
+                "id": recipe_id,
+                "type": type_,
+                "isPublic": bool(is_public),
+                "favoriteCount": favorite_count,
+                "ownerId": owner_id,
+                "translations": translations.get(recipe_id, {}),
+                "sharedWith": shared.get(recipe_id, set()),
+            }
+            for recipe_id, type_, is_public, favorite_count, owner_id, _ in recipes
+        ]
+        matrix = np.stack([np.frombuffer(row[5], dtype=np.float32) for row in recipes]) if recipes else np.empty((0, 0))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True) if len(matrix) else 1.0
+        self._matrix = matrix / np.where(norms == 0, 1.0, norms)
+
+    def _visible(self, row: Dict[str, Any], user_id: str, scope: str) -> bool:
+        own = row["ownerId"] == user_id
+        shared = user_id in row["sharedWith"]
+        if scope == "own":
+            return own
+        if scope == "shared":
+            return shared
+        if scope == "public":
+            return row["isPublic"]
+        return own or shared or row["isPublic"]
+
+    async def search(self, embedding, user_id, k, language, scope):
+        with self._lock:
+            if self._matrix is None:
+                self._load()
+            matrix, rows = self._matrix, self._rows
+        if not rows:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        similarities = matrix @ query
+
+        results = []
+        for index in np.argsort(-similarities):
+            row = rows[index]
+            if not self._visible(row, user_id, scope):
+                continue
+            if language and language not in row["translations"]:
+                continue
+            translations = row["translations"]
+            translation = translations.get(language) or (
+                min(translations.values(), key=lambda t: _TRANSLATION_FALLBACK_ORDER.get(t["language"], 9))
+                if translations else {}
+            )
+            results.append({
+                "id": row["id"],
+                "type": row["type"],
+                "isPublic": row["isPublic"],
+                "favoriteCount": row["favoriteCount"],
+                "owned": row["ownerId"] == user_id,
+                "language": translation.get("language"),
+                "title": translation.get("title"),
+                "description": translation.get("description"),
+                "similarity": round(float(similarities[index]), 4),
+            })
+            if len(results) >= k:
+                break
+        return results
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _LoopThread:
+    """커넥션 풀을 소유하는 전용 이벤트 루프 스레드"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name=self._name, daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+        return future.result(timeout)
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+
+class RecipeVectorSearch:
+    """질의 임베딩 캐시 + 벡터 저장소 검색 서비스"""
+
+    def __init__(self, store: RecipeVectorStore, embedder: Embeddings, cache_size: int = 1024, timeout: float = 10.0):
+        self.store = store
+        self.embedder = embedder
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._loop = _LoopThread("vector-search-loop")
+
+    def embed_query(self, query: str) -> List[float]:
+        key = normalize(query).strip()
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+        if embedding is not None:
+            metrics.increment("vector_query_embedding_cache_total", result="hit")
+            return embedding
+
+        metrics.increment("vector_query_embedding_cache_total", result="miss")
+        embedding = self.embedder.embed_query(query)
+        with self._cache_lock:
+            self._cache[key] = embedding
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return embedding
+
+    @staticmethod
+    def _validate(k: int, language: Optional[str], scope: str) -> int:
+        if scope not in SCOPES:
+            raise ValueError(f"scope 는 {', '.join(SCOPES)} 중 하나여야 합니다.")
+        if language is not None and language not in LANGUAGES:
+            raise ValueError(f"language 는 {', '.join(LANGUAGES)} 중 하나여야 합니다.")
+        return max(1, min(int(k), MAX_K))
+
+    def search(
+        self,
+        query: str,
+        user_id: str,
+        k: int = 5,
+        language: Optional[str] = None,
+        scope: str = "all",
+    ) -> List[Dict[str, Any]]:
+        """동기 호출용 검색 (도구에서 사용)"""
+        k = self._validate(k, language, scope)
+        embedding = self.embed_query(query)
+        started = time.perf_counter()
+        try:
+            return self._loop.run(self.store.search(embedding, user_id, k, language, scope), self.timeout)
+        finally:
+            metrics.observe("vector_search_seconds", time.perf_counter() - started, scope=scope)
+
+    async def asearch(
+        self,
+        query: str,
+        user_id: str,
+        k: int = 5,
+        language: Optional[str] = None,
+        scope: str = "all",
+    ) -> List[Dict[str, Any]]:
+        """비동기 호출용 검색 (엔드포인트 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.search, query, user_id, k, language, scope)
+
+    def close(self) -> None:
+        try:
+            self._loop.run(self.store.close(), self.timeout)
+        finally:
+            self._loop.stop()
+
+
+def create_vector_store() -> RecipeVectorStore:
+    """환경 변수 설정에 맞는 벡터 저장소를 생성합니다."""
+    backend = os.getenv("VECTOR_STORE", "pgvector").lower()
+    if backend == "sqlite":
+        return SQLiteRecipeVectorStore(os.getenv("VECTOR_SQLITE_PATH", "vectors.sqlite3"))
+    if backend != "pgvector":
+        raise ValueError(f"Unknown VECTOR_STORE: {backend}")
+
+    dsn = os.getenv("DATABASE_URL")
+    if not dsn:
+        raise ValueError("DATABASE_URL is not set.")
+    return PgVectorRecipeStore(
+        dsn,
+        min_size=int(os.getenv("PG_POOL_MIN_SIZE", "1")),
+        max_size=int(os.getenv("PG_POOL_MAX_SIZE", "10")),
+        probes=int(os.getenv("PGVECTOR_PROBES", "10")),
+        timeout=float(os.getenv("PG_COMMAND_TIMEOUT", "5")),
+        iterative_scan=os.getenv("PGVECTOR_ITERATIVE_SCAN", "relaxed_order") or None,
+        max_probes=int(os.getenv("PGVECTOR_MAX_PROBES", "0")) or None,
+    )
+
+
+_service: Optional[RecipeVectorSearch] = None
+_service_lock = threading.Lock()
+
+
+def get_recipe_vector_search() -> RecipeVectorSearch:
+    """공유 벡터 검색 서비스 (첫 사용 때 생성)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = RecipeVectorSearch(
+                store=create_vector_store(),
+                embedder=create_embedder(),
+                cache_size=int(os.getenv("VECTOR_QUERY_CACHE_SIZE", "1024")),
+            )
+        return _service
+
+
+def close_recipe_vector_search() -> None:
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.close()
@@ -0,0 +1,132 @@
+"""
+대화 스레드(thread_id)별 요청 직렬화입니다.
+
+같은 thread_id 로 동시에 들어온 채팅 요청(중복 전송, 재시도, 여러 탭)이 같은 체크포인트에서
+graph.stream/get_state 를 섞어 실행하지 않도록, 스레드마다 비동기 락으로 도착 순서대로 하나씩 실행합니다.
+서로 다른 스레드는 락을 공유하지 않으므로 그대로 병렬로 실행됩니다.
+락은 사용 중인 요청(실행 + 대기)이 없어지는 즉시 제거됩니다.
+
+환경 변수
+- CHAT_THREAD_MAX_QUEUE: 스레드 하나에서 실행 중인 요청 뒤에 기다릴 수 있는 최대 요청 수 (기본 4)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from .deadlines import STAGE_THREAD_QUEUE, Deadline, RequestCancelled
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadQueueFull(Exception):
+    """같은 스레드에서 기다리는 요청이 너무 많을 때 발생하는 예외"""
+
+    def __init__(self, thread_id: str, waiting: int):
+        super().__init__(f"같은 대화에서 처리 대기 중인 요청이 너무 많습니다 ({waiting}개). 잠시 후 다시 시도해주세요.")
+        self.thread_id = thread_id
+        self.waiting = waiting
+
+
+class _ThreadEntry:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        # 락을 잡고 있거나 기다리는 요청 수
+        self.users = 0
+
+
+class ThreadLockManager:
+    """thread_id 별 비동기 락 관리자 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, max_queue: int = 4, poll_interval: float = 0.25):
+        self.max_queue = max_queue
+        self.poll_interval = poll_interval
+        self._entries: Dict[str, _ThreadEntry] = {}
+
+    @classmethod
+    def from_env(cls) -> "ThreadLockManager":
+        return cls(max_queue=int(os.getenv("CHAT_THREAD_MAX_QUEUE", "4")))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("thread_locks_active", len(self._entries))
+        metrics.set_gauge("thread_queue_waiting", sum(max(0, e.users - 1) for e in self._entries.values()))
+
+    async def _acquire(
+        self,
+        lock: asyncio.Lock,
+        deadline: Optional[Deadline],
+        disconnected: Optional[Callable[[], Awaitable[bool]]],
+    ) -> None:
+        """마감 시간과 클라이언트 연결 종료를 확인하면서 락을 기다립니다."""
+        acquire = asyncio.ensure_future(lock.acquire())
+        try:
+            while True:
+                timeout = self.poll_interval if disconnected is not None else None
+                if deadline is not None:
+                    timeout = deadline.remaining() if timeout is None else min(timeout, deadline.remaining())
+                done, _ = await asyncio.wait({acquire}, timeout=timeout)
+                if done:
+                    acquire.result()
+                    return
+                if disconnected is not None and await disconnected():
+                    if deadline is None:
+                        raise RequestCancelled("요청이 취소되었습니다 (client_disconnected)", STAGE_THREAD_QUEUE, 0.0)
+                    deadline.cancel("client_disconnected")
+                if deadline is not None:
+                    deadline.check(STAGE_THREAD_QUEUE)
+        except BaseException:
+            # 포기하는 순간 락을 얻었다면 바로 돌려줍니다.
+            if acquire.done() and not acquire.cancelled() and acquire.exception() is None:
+                lock.release()
+            else:
+                acquire.cancel()
+            raise
+
+    @asynccontextmanager
+    async def hold(
+        self,
+        thread_id: str,
+        deadline: Optional[Deadline] = None,
+        disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[None]:
+        """
+        thread_id 의 앞선 요청이 모두 끝난 뒤 블록을 실행합니다.
+        기다리는 동안 마감 시간이 지나거나(DeadlineExceeded) 연결이 끊기면(RequestCancelled) 실행하지 않습니다.
+        """
+        entry = self._entries.get(thread_id)
+        if entry is None:
+            entry = self._entries[thread_id] = _ThreadEntry()
+        # 앞선 요청 수 (실행 중 1개 + 대기 중)
+        waiting = entry.users
+        if waiting > self.max_queue:
+            metrics.increment("thread_queue_rejected_total")
+            raise ThreadQueueFull(thread_id, waiting - 1)
+
+        entry.users += 1
+        metrics.observe("thread_queue_depth", waiting)
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            await self._acquire(entry.lock, deadline, disconnected)
+            waited = time.perf_counter() - started
+            metrics.observe("thread_queue_wait_seconds", waited)
+            if waiting:
+                logger.info(f"[{thread_id}] 앞선 요청 {waiting}개를 {waited:.2f}초 기다린 뒤 실행합니다.")
+            try:
+                yield
+            finally:
+                entry.lock.release()
+        finally:
+            entry.users -= 1
+            if entry.users == 0 and self._entries.get(thread_id) is entry:
+                del self._entries[thread_id]
+            self._update_gauges()
@@ -1,10 +1,19 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import requests
 from functools import wraps
+import math
 import os
 
+from ..deadlines import STAGE_TOOL, DeadlineError, check_deadline, current_deadline
+from .resilience import UPSTREAM_GUARD, UpstreamGuard, UpstreamUnavailable
+
 NEXT_API_URL = os.getenv('NEXT_API_URL', 'http://frontend:3000')
 INTERNAL_API_KEY = os.getenv('INTERNAL_API_KEY')
+# Next.js API 요청 타임아웃 (초). 요청 마감 시간이 더 빠르면 남은 시간을 사용합니다.
+NEXT_API_TIMEOUT = float(os.getenv('NEXT_API_TIMEOUT', '10'))
+# 목록 도구 한 페이지의 기본/최대 항목 수 (최대값은 Next.js API 의 MAX_PAGE_SIZE 와 같음)
+LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', '10'))
+LIST_MAX_PAGE_SIZE = 50
 
 def get_headers(user_id: str) -> Dict[str, str]:
     """API 요청에 필요한 헤더를 생성합니다."""
@@ -15,6 +24,28 @@ def get_headers(user_id: str) -> Dict[str, str]:
         'x-user-id': user_id
     }
 
+def request_timeout() -> float:
+    """Next.js API 요청에 사용할 타임아웃을 반환합니다."""
+    deadline = current_deadline()
+    if deadline is None:
+        return NEXT_API_TIMEOUT
+    return deadline.timeout_for(STAGE_TOOL, NEXT_API_TIMEOUT)
+
+def send_request(method: str, endpoint: str, headers: Dict[str, str], **kwargs: Any) -> requests.Response:
+    """Next.js API 로 요청을 보냅니다. (타임아웃, 엔드포인트 그룹별 서킷 브레이커/동시성 제한 적용)"""
+    timeout = request_timeout()
+    return UPSTREAM_GUARD.call(
+        UpstreamGuard.group_for(endpoint),
+        lambda: requests.request(method=method, url=f"{NEXT_API_URL}{endpoint}", headers=headers, timeout=timeout, **kwargs),
+    )
+
+def upstream_unavailable_message(error: UpstreamUnavailable) -> str:
+    """서킷이 열렸을 때 LLM 이 같은 도구를 반복 호출하지 않도록 안내하는 도구 결과"""
+    return (
+        f"[일시적 장애] {error.group} 서비스가 현재 응답하지 않습니다. "
+        f"이 도구를 다시 호출하지 말고, 사용자에게 {math.ceil(error.retry_after)}초 정도 후에 다시 시도해 달라고 안내하세요."
+    )
+
 def make_request(
     method: str,
     endpoint: str,
@@ -23,19 +54,22 @@ def make_request(
     params: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """API 요청을 실행하고 결과를 반환합니다."""
-    url = f"{NEXT_API_URL}{endpoint}"
     headers = get_headers(user_id)
     
     try:
-        response = requests.request(
-            method=method,
-            url=url,
-            headers=headers,
+        response = send_request(
+            method,
+            endpoint,
+            headers,
             json=data if data else None,
             params=params if params else None
         )
         response.raise_for_status()
         return response.json() if response.content else {}
+    except requests.exceptions.Timeout as e:
+        # 요청 마감 시간 때문에 짧아진 타임아웃이면 DeadlineExceeded 로 바꿉니다.
+        check_deadline(STAGE_TOOL)
+        raise Exception(f"API 요청 시간 초과: {str(e)}")
     except requests.exceptions.RequestException as e:
         error_message = f"API 요청 실패: {str(e)}"
         if hasattr(e.response, 'json'):
@@ -46,12 +80,34 @@ def make_request(
                 pass
         raise Exception(error_message)
 
+def page_limit(limit: Optional[int]) -> int:
+    """목록 도구의 limit 인자를 허용 범위로 맞춥니다."""
+    if not limit or limit < 1:
+        return LIST_PAGE_SIZE
+    return min(limit, LIST_MAX_PAGE_SIZE)
+
+def format_page(lines: List[str], next_cursor: Optional[str], empty_message: str, total: Optional[int] = None) -> str:
+    """목록 한 페이지를 도구 결과로 만듭니다. 다음 페이지가 있으면 LLM 이 이어서 조회할 수 있도록 커서를 알려줍니다."""
+    if not lines:
+        return empty_message
+    text = "\n".join(lines)
+    if total is not None:
+        text = f"(전체 {total}개)\n{text}"
+    if next_cursor:
+        text += f"\n[더 있음] 나머지 항목은 같은 도구를 cursor=\"{next_cursor}\" 로 다시 호출해 조회하세요. 사용자가 원할 때만 조회하세요."
+    return text
+
 def handle_api_error(func):
     """API 에러를 처리하는 데코레이터"""
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
+        except DeadlineError:
+            # 마감 시간 초과/취소는 도구 결과로 바꾸지 않고 그래프 실행을 멈춥니다.
+            raise
+        except UpstreamUnavailable as e:
+            return upstream_unavailable_message(e)
         except Exception as e:
             return f"오류 발생: {str(e)}"
     return wrapper 
\ No newline at end of file
@@ -6,7 +6,10 @@ import os
 import logging
 import aiohttp
 import json
-from .api_utils import make_request, handle_api_error
+from .api_utils import make_request, handle_api_error, page_limit, format_page
+from ..search import RecipeSearchIndexes, get_recipe_vector_search
+from ..llm import get_llm
+from ..recipes import fill_translations
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -22,14 +25,59 @@ if not INTERNAL_API_KEY:
 elif INTERNAL_API_KEY == "your-secret-key-here":
     logger.warning("INTERNAL_API_KEY is using default value! Please set a proper key.")
 
+# 사용자별 레시피 검색 색인 (RECIPE_SEARCH_INDEX=false 이면 Next.js 검색 API 사용)
+RECIPE_SEARCH_INDEX = os.getenv("RECIPE_SEARCH_INDEX", "true").lower() in ("1", "true", "yes")
+RECIPE_SEARCH_LIMIT = int(os.getenv("RECIPE_SEARCH_LIMIT", "10"))
+
+def _load_user_recipes(user_id: str) -> List[Dict[str, Any]]:
+    result = make_request(method="GET", endpoint="/api/recipes", user_id=user_id)
+    return result if isinstance(result, list) else []
+
+recipe_search_index = RecipeSearchIndexes.from_env(_load_user_recipes)
+
+def _recipe_line(recipe: Dict[str, Any], language: Optional[str]) -> str:
+    """레시피 목록 한 줄 (사용자 언어 번역의 제목, 없으면 첫 번역)"""
+    translations = recipe.get("translations") or [recipe.get("translation") or {}]
+    translation = next((t for t in translations if t.get("language") == language), translations[0])
+    return f"- {translation.get('title') or '(제목 없음)'} (ID: {recipe.get('id')})"
+
+def _list_recipe_page(endpoint: str, limit: Optional[int], cursor: Optional[str], config: RunnableConfig, empty_message: str) -> str:
+    """페이지 번호로 조회하는 레시피 목록 API (즐겨찾기, 공유) 한 페이지를 도구 결과로 만듭니다."""
+    configuration = config.get("configurable", {})
+    user_id = configuration.get("user_id")
+    if not user_id:
+        raise ValueError("No user_id configured.")
+
+    page = int(cursor) if cursor and cursor.isdigit() and int(cursor) > 0 else 1
+    language = configuration.get("user_language")
+    params = {"page": page, "limit": page_limit(limit)}
+    if language:
+        params["language"] = language
+    result = make_request(method="GET", endpoint=endpoint, user_id=user_id, params=params)
+
+    pagination = result.get("pagination", {})
+    has_more = page < pagination.get("totalPages", 0)
+    return format_page(
+        [_recipe_line(r, language) for r in result.get("recipes", [])],
+        str(page + 1) if has_more else None,
+        empty_message,
+        total=pagination.get("total"),
+    )
+
 ##############
 # SAFE TOOLS #
 ##############
 
 @tool
 @handle_api_error
-def get_all_recipes(config: RunnableConfig) -> str:
-    """[SAFE] 사용자의 레시피 목록을 조회합니다."""
+def get_all_recipes(limit: Optional[int] = None, cursor: Optional[str] = None, config: RunnableConfig = None) -> str:
+    """[SAFE] 사용자의 레시피 목록을 최신순으로 한 페이지씩 조회합니다. 상세 내용은 get_recipe_details 로 조회하세요.
+
+    Args:
+        limit: 한 번에 조회할 레시피 수 (기본값: 10, 최대 50)
+        cursor: 다음 페이지 커서 (이전 결과의 [더 있음] 안내에 있는 값, 첫 페이지는 생략)
+        config: 설정 정보 (user_id 포함)
+    """
     configuration = config.get("configurable", {})
     user_id = configuration.get("user_id")
     if not user_id:
@@ -38,9 +86,15 @@ def get_all_recipes(config: RunnableConfig) -> str:
     result = make_request(
         method="GET",
         endpoint="/api/recipes",
-        user_id=user_id
+        user_id=user_id,
+        params={"limit": page_limit(limit), "cursor": cursor or "0"}
+    )
+    language = configuration.get("user_language")
+    return format_page(
+        [_recipe_line(r, language) for r in result.get("recipes", [])],
+        result.get("nextCursor"),
+        "레시피가 없습니다.",
     )
-    return str(result)
 
 @tool
 @handle_api_error
@@ -60,6 +114,14 @@ def get_recipe_with_keyword(keyword: str, language: str = "ko", config: Runnable
     # 언어 유효성 검사
     if language not in ["ko", "en", "ja"]:
         language = "ko"  # 기본값으로 설정
+
+    # 백엔드 색인 검색 (첫 검색 때만 레시피 목록을 불러옴)
+    if RECIPE_SEARCH_INDEX:
+        recipes = recipe_search_index.search(user_id, keyword, language, RECIPE_SEARCH_LIMIT)
+        result = {"recipes": recipes, "total": len(recipes)}
+        if not recipes:
+            result["message"] = "검색 결과가 없습니다."
+        return str(result)
     
     # 검색 API 호출
     result = make_request(
@@ -92,49 +154,27 @@ def get_recipe_details(recipe_id: str, config: RunnableConfig) -> str:
 
 @tool
 @handle_api_error
-def get_favorite_recipes(config: RunnableConfig) -> str:
-    """[SAFE] 즐겨찾기한 레시피 목록을 조회합니다."""
-    configuration = config.get("configurable", {})
-    user_id = configuration.get("user_id")
-    if not user_id:
-        raise ValueError("No user_id configured.")
+def get_favorite_recipes(limit: Optional[int] = None, cursor: Optional[str] = None, config: RunnableConfig = None) -> str:
+    """[SAFE] 즐겨찾기한 레시피 목록을 한 페이지씩 조회합니다.
 
-    result = make_request(
-        method="GET",
-        endpoint="/api/recipes/favorites",
-        user_id=user_id
-    )
-    return str(result)
+    Args:
+        limit: 한 번에 조회할 레시피 수 (기본값: 10, 최대 50)
+        cursor: 다음 페이지 커서 (이전 결과의 [더 있음] 안내에 있는 값, 첫 페이지는 생략)
+        config: 설정 정보 (user_id 포함)
+    """
+    return _list_recipe_page("/api/recipes/favorites", limit, cursor, config, "즐겨찾기한 레시피가 없습니다.")
 
 @tool
 @handle_api_error
-def get_shared_recipes(config: RunnableConfig) -> str:
-    """[SAFE] 공유된 레시피 목록을 조회합니다."""
-    configuration = config.get("configurable", {})
-    user_id = configuration.get("user_id", None)
-    if not user_id:
-        raise ValueError("No user_id configured.")
-    try:
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-            'x-api-key': INTERNAL_API_KEY or '',
-            'x-user-id': user_id
-        }
-        response = requests.get(
-            f"{NEXT_API_URL}/api/recipes/shared",
-            headers=headers
-        )
-        if response.status_code == 200:
-            recipes = response.json()
-            return "\n".join([
-                f"- {r['title']} (ID: {r['id']}, 공유자: {r['ownerName']})"
-                for r in recipes
-            ])
-        else:
-            return f"공유 레시피 목록 조회 실패: {response.status_code}"
-    except Exception as e:
-        return f"공유 레시피 목록 조회 중 오류 발생: {str(e)}"
+def get_shared_recipes(limit: Optional[int] = None, cursor: Optional[str] = None, config: RunnableConfig = None) -> str:
+    """[SAFE] 공유된 레시피 목록을 최신순으로 한 페이지씩 조회합니다.
+
+    Args:
+        limit: 한 번에 조회할 레시피 수 (기본값: 10, 최대 50)
+        cursor: 다음 페이지 커서 (이전 결과의 [더 있음] 안내에 있는 값, 첫 페이지는 생략)
+        config: 설정 정보 (user_id 포함)
+    """
+    return _list_recipe_page("/api/recipes/shared", limit, cursor, config, "공유된 레시피가 없습니다.")
 
 @tool
 @handle_api_error
@@ -162,6 +202,35 @@ def search_shared_recipes(keyword: str, config: RunnableConfig) -> str:
     
     return str(result)
 
+@tool
+@handle_api_error
+def vector_search_recipes(
+    query: str,
+    k: int = 5,
+    language: Optional[str] = None,
+    scope: str = "all",
+    config: RunnableConfig = None,
+) -> str:
+    """[SAFE] 의미가 비슷한 레시피를 찾습니다. "김치찌개 같은 거"처럼 정확한 키워드가 없는 요청에 사용합니다.
+
+    Args:
+        query: 찾고 싶은 레시피에 대한 설명
+        k: 결과 수 (기본값: 5, 최대 20)
+        language: 이 언어 번역이 있는 레시피만 검색 ('ko', 'en', 'ja'), 생략하면 전체
+        scope: 검색 범위 ('own': 내 레시피, 'shared': 공유받은 레시피, 'public': 공개 레시피, 'all': 전체)
+        config: 설정 정보 (user_id 포함)
+    """
+    configuration = config.get("configurable", {})
+    user_id = configuration.get("user_id")
+    if not user_id:
+        raise ValueError("No user_id configured.")
+
+    recipes = get_recipe_vector_search().search(query, user_id, k=k, language=language, scope=scope)
+    result = {"recipes": recipes, "total": len(recipes)}
+    if not recipes:
+        result["message"] = "검색 결과가 없습니다."
+    return str(result)
+
 ###############
 # SENSITIVE TOOLS #
 ###############
@@ -202,50 +271,71 @@ def create_recipe(
             "tags": tags
         }
     )
+    if isinstance(result, dict):
+        recipe_search_index.upsert(user_id, result)
     return str(result)
 
 @tool
 @handle_api_error
 def update_recipe(
     recipe_id: str,
-    ko_title: str,
-    ko_content: str,
-    ko_description: str,
-    en_title: str,
-    en_content: str,
-    en_description: str,
-    ja_title: str,
-    ja_content: str,
-    ja_description: str,
     tags: List[str],
-    config: RunnableConfig
+    ko_title: Optional[str] = None,
+    ko_content: Optional[str] = None,
+    ko_description: Optional[str] = None,
+    en_title: Optional[str] = None,
+    en_content: Optional[str] = None,
+    en_description: Optional[str] = None,
+    ja_title: Optional[str] = None,
+    ja_content: Optional[str] = None,
+    ja_description: Optional[str] = None,
+    config: RunnableConfig = None
 ) -> str:
-    """[SENSITIVE] 레시피를 수정합니다."""
+    """[SENSITIVE] 레시피를 수정합니다.
+    사용자가 수정한 언어의 제목/내용(/설명)만 넘기면 나머지 언어는 바뀐 부분만 번역해 맞춥니다.
+    다른 언어도 직접 고쳤을 때만 그 언어의 필드를 함께 넘기세요.
+
+    Args:
+        recipe_id: 수정할 레시피 ID
+        tags: 태그 목록
+        ko_title, ko_content, ko_description: 한국어 제목/내용(마크다운)/설명
+        en_title, en_content, en_description: 영어 제목/내용(마크다운)/설명
+        ja_title, ja_content, ja_description: 일본어 제목/내용(마크다운)/설명
+        config: 설정 정보 (user_id 포함)
+    """
     configuration = config.get("configurable", {})
     user_id = configuration.get("user_id")
     if not user_id:
         raise ValueError("No user_id configured.")
 
-    translations = [
-        {
-            "language": "ko",
-            "title": ko_title,
-            "content": ko_content,
-            "description": ko_description
-        },
-        {
-            "language": "en",
-            "title": en_title,
-            "content": en_content,
-            "description": en_description
-        },
-        {
-            "language": "ja",
-            "title": ja_title,
-            "content": ja_content,
-            "description": ja_description
-        }
-    ]
+    given = {
+        "ko": {"title": ko_title, "content": ko_content, "description": ko_description},
+        "en": {"title": en_title, "content": en_content, "description": en_description},
+        "ja": {"title": ja_title, "content": ja_content, "description": ja_description},
+    }
+    # 제목과 내용을 모두 넘긴 언어를 번역 원문으로 씁니다. (사용자 언어 우선)
+    complete = [lang for lang, fields in given.items() if fields["title"] and fields["content"]]
+    if not complete:
+        raise ValueError("최소 한 언어의 제목과 내용이 필요합니다.")
+    user_language = configuration.get("user_language")
+    source_language = user_language if user_language in complete else complete[0]
+
+    # 수정 전 번역 (레시피 하나만 최신 값으로 조회)
+    previous_recipe = make_request(
+        method="GET",
+        endpoint=f"/api/recipes/{recipe_id}",
+        user_id=user_id,
+        params={"include": "translations"}
+    ) or {}
+    previous = {
+        t.get("language"): {k: t.get(k) for k in ("title", "content", "description")}
+        for t in previous_recipe.get("translations") or [previous_recipe.get("translation") or {}]
+        if t.get("language")
+    }
+    translations = fill_translations(
+        source_language, given, previous, get_llm("translation"), get_llm("short_translation"),
+        user_id=user_id,
+    )
 
     result = make_request(
         method="PUT",
@@ -256,6 +346,7 @@ def update_recipe(
             "tags": tags
         }
     )
+    recipe_search_index.upsert(user_id, {"id": recipe_id, "translations": translations, "tags": tags})
     return str(result)
 
 @tool
@@ -272,6 +363,7 @@ def delete_recipe(recipe_id: str, config: RunnableConfig) -> str:
         endpoint=f"/api/recipes/{recipe_id}",
         user_id=user_id
     )
+    recipe_search_index.remove(user_id, recipe_id)
     return str(result)
 
 @tool
@@ -313,6 +405,7 @@ safe_tools = [
     get_shared_recipes,
     search_shared_recipes,
     get_recipe_with_keyword,
+    vector_search_recipes,
 ]
 
 # Sensitive Tools
@@ -3,7 +3,12 @@ from langchain_core.tools import tool
 from langchain_core.runnables import RunnableConfig
 import os
 import logging
-from .api_utils import make_request, handle_api_error
+from ..deadlines import DeadlineError
+from ..llm import get_llm
+from ..recipes import translate_short_text
+from ..translation_memory import get_translation_memory
+from .api_utils import make_request, handle_api_error, page_limit, format_page
+from .resilience import UpstreamUnavailable
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -24,10 +29,12 @@ elif INTERNAL_API_KEY == "your-secret-key-here":
 
 @tool
 @handle_api_error
-def get_refrigerators(config: RunnableConfig) -> str:
-    """[SAFE] 사용자의 모든 냉장고 목록을 조회합니다.
+def get_refrigerators(limit: Optional[int] = None, cursor: Optional[str] = None, config: RunnableConfig = None) -> str:
+    """[SAFE] 사용자의 냉장고 목록을 최근 수정순으로 한 페이지씩 조회합니다.
     
     Args:
+        limit: 한 번에 조회할 냉장고 수 (기본값: 10, 최대 50)
+        cursor: 다음 페이지 커서 (이전 결과의 [더 있음] 안내에 있는 값, 첫 페이지는 생략)
         config: 설정 정보 (user_id 포함)
     """
     configuration = config.get("configurable", {})
@@ -35,16 +42,21 @@ def get_refrigerators(config: RunnableConfig) -> str:
     if not user_id:
         raise ValueError("No user_id configured.")
     
-    refrigerators = make_request(
+    result = make_request(
         method="GET",
         endpoint="/api/refrigerators",
-        user_id=user_id
+        user_id=user_id,
+        params={"limit": page_limit(limit), "cursor": cursor or "0"}
     )
     
-    return "\n".join([
-        f"- {r['name']} (ID: {r['id']}, 멤버: {r['memberCount']}명, 재료: {r['ingredientCount']}개)"
-        for r in refrigerators
-    ])
+    return format_page(
+        [
+            f"- {r['name']} (ID: {r['id']}, 멤버: {r['memberCount']}명, 재료: {r['ingredientCount']}개)"
+            for r in result.get("refrigerators", [])
+        ],
+        result.get("nextCursor"),
+        "냉장고가 없습니다.",
+    )
 
 @tool
 @handle_api_error
@@ -230,6 +242,13 @@ def update_category(
         data=update_data
     )
     
+    # 확인된 카테고리 번역을 번역 메모리에 수집합니다.
+    get_translation_memory().learn(
+        {t.get("language"): t.get("name") for t in translations if isinstance(t, dict)},
+        user_id,
+        origin="category",
+    )
+    
     return f"냉장고 {refrigerator_id}의 카테고리 {category_id}가 성공적으로 수정되었습니다."
 
 @tool
@@ -437,6 +456,8 @@ def add_refrigerator_single_category(refrigerator_id: int, type: str, name: str,
             )
             
             results.append(f"카테고리 '{category_name}'가 추가되었습니다.")
+        except (DeadlineError, UpstreamUnavailable):
+            raise
         except Exception as e:
             results.append(f"카테고리 '{category_name}' 추가 중 오류 발생: {str(e)}")
     
@@ -465,6 +486,16 @@ def delete_refrigerator_category(refrigerator_id: int, category_id: int, config:
     
     return f"카테고리가 삭제되었습니다."
 
+def _remembered_category_translations(name: str, user_id: str) -> List[Dict[str, str]]:
+    """한국어 카테고리 이름과, 번역 메모리(공용 + 사용자 용어)에 있으면 영어/일본어 이름 (LLM 호출 없음)"""
+    memory = get_translation_memory()
+    translations = [{"language": "ko", "name": name}]
+    for language in ("en", "ja"):
+        translated = memory.lookup(name, language, "ko", user_id)
+        if translated is not None:
+            translations.append({"language": language, "name": translated})
+    return translations
+
 @tool
 @handle_api_error
 def add_refrigerator_multiple_categories(refrigerator_id: int, icon: str | None, categories: List[str], config: RunnableConfig) -> str:
@@ -486,12 +517,7 @@ def add_refrigerator_multiple_categories(refrigerator_id: int, icon: str | None,
         {
             "type": "custom",
             "icon": icon or "📦",  # 기본 아이콘
-            "translations": [
-                {
-                    "language": "ko",
-                    "name": name
-                }
-            ]
+            "translations": _remembered_category_translations(name, user_id)
         }
         for name in categories
     ]
@@ -503,7 +529,11 @@ def add_refrigerator_multiple_categories(refrigerator_id: int, icon: str | None,
         data={"categories": category_data}
     )
     
-    category_names = [cat["category"]["translations"][0]["name"] for cat in created_categories]
+    # 이어지는 재료 추가에서 바로 쓸 수 있도록 카테고리 ID를 함께 반환합니다.
+    category_names = [
+        f"{cat['category']['translations'][0]['name']} (ID: {cat['categoryId']})"
+        for cat in created_categories
+    ]
     return f"다음 카테고리들이 성공적으로 추가되었습니다: {', '.join(category_names)}"
 
 @tool
@@ -511,9 +541,9 @@ def add_refrigerator_multiple_categories(refrigerator_id: int, icon: str | None,
 def add_refrigerator_single_category_in_multi_language(
     refrigerator_id: int,
     ko_category: str,
-    us_category: str,
-    jp_category: str,
-    config: RunnableConfig,
+    us_category: str | None = None,
+    jp_category: str | None = None,
+    config: RunnableConfig = None,
     icon: str | None = "📦"
 ) -> str:
     """[SENSITIVE] 냉장고에 다국어 지원 카테고리를 추가합니다.
@@ -521,8 +551,8 @@ def add_refrigerator_single_category_in_multi_language(
     Args:
         refrigerator_id: 냉장고 ID
         ko_category: 한국어 카테고리 이름
-        us_category: 영어 카테고리 이름
-        jp_category: 일본어 카테고리 이름
+        us_category: 영어 카테고리 이름 (선택사항, 생략하면 번역 메모리 또는 번역으로 채움)
+        jp_category: 일본어 카테고리 이름 (선택사항, 생략하면 번역 메모리 또는 번역으로 채움)
         config: 설정 정보 (user_id 포함)
         icon: 카테고리 아이콘 (선택사항, 기본값: 📦)
     """
@@ -531,6 +561,16 @@ def add_refrigerator_single_category_in_multi_language(
     if not user_id:
         raise ValueError("No user_id configured.")
     
+    # 빠진 이름은 번역 메모리에서 찾고, 없을 때만 LLM 으로 번역합니다.
+    if not us_category or not jp_category:
+        short_llm = get_llm("short_translation")
+        us_category = us_category or translate_short_text(
+            short_llm, ko_category, "en", source_language="ko", user_id=user_id
+        )
+        jp_category = jp_category or translate_short_text(
+            short_llm, ko_category, "ja", source_language="ko", user_id=user_id
+        )
+    
     # 다국어 번역 데이터 준비
     data = {
         "type": "system",
@@ -549,6 +589,10 @@ def add_refrigerator_single_category_in_multi_language(
         data=data
     )
     
+    get_translation_memory().learn(
+        {"ko": ko_category, "en": us_category, "ja": jp_category}, user_id, origin="category"
+    )
+    
     return f"다국어 카테고리가 성공적으로 추가되었습니다. (한국어: {ko_category}, 영어: {us_category}, 일본어: {jp_category})"
 
 @tool
@@ -0,0 +1,260 @@
+"""
+Next.js API 호출의 장애 격리 계층입니다.
+
+엔드포인트 그룹(/api/recipes → recipes, /api/refrigerators → refrigerators)마다
+- 서킷 브레이커: 연속 실패가 쌓이면 열고(open) 일정 시간 동안 바로 거절합니다.
+  시간이 지나면 반열림(half_open) 상태에서 시험 요청만 보내 회복 여부를 확인합니다.
+- AIMD 동시성 제한: 성공하면 한도를 조금씩 늘리고(additive increase),
+  실패하거나 느려지면 절반으로 줄입니다(multiplicative decrease).
+한 그룹이 느려져도 다른 그룹과 작업 스레드 전체가 묶이지 않도록 하는 것이 목적입니다.
+
+환경 변수
+- UPSTREAM_FAILURE_THRESHOLD: 서킷을 여는 연속 실패 수 (기본 5)
+- UPSTREAM_RESET_TIMEOUT: 서킷이 열린 뒤 시험 요청까지 기다리는 시간 (기본 30초)
+- UPSTREAM_INITIAL_CONCURRENCY / UPSTREAM_MIN_CONCURRENCY / UPSTREAM_MAX_CONCURRENCY: 동시성 한도 (기본 10 / 1 / 64)
+- UPSTREAM_SLOW_THRESHOLD: 이보다 오래 걸린 응답은 과부하 신호로 봅니다 (기본 2초)
+- UPSTREAM_QUEUE_TIMEOUT: 동시성 한도가 찼을 때 기다리는 최대 시간 (기본 0.5초)
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from ..deadlines import current_deadline
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 메트릭 게이지 값
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class UpstreamUnavailable(Exception):
+    """서킷이 열렸거나 동시성 한도를 넘어 요청을 보내지 않고 거절할 때 발생하는 예외"""
+
+    def __init__(self, group: str, reason: str, retry_after: float):
+        super().__init__(f"{group} API 를 일시적으로 사용할 수 없습니다 ({reason}, {retry_after:.0f}초 후 재시도)")
+        self.group = group
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커 (closed → open → half_open → closed)"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        metrics.set_gauge("upstream_circuit_state", CIRCUIT_STATE_VALUES["closed"], group=name)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"[{self.name}] 서킷 상태 변경: {self.state} → {state}")
+        self.state = state
+        metrics.set_gauge("upstream_circuit_state", CIRCUIT_STATE_VALUES[state], group=self.name)
+        metrics.increment("upstream_circuit_transitions_total", group=self.name, to=state)
+
+    def allow(self) -> Optional[float]:
+        """요청을 보내도 되면 None, 아니면 재시도까지 남은 시간(초)을 반환합니다."""
+        with self._lock:
+            if self.state == "open":
+                waited = time.monotonic() - self._opened_at
+                if waited < self.reset_timeout:
+                    return self.reset_timeout - waited
+                self._transition("half_open")
+                self._probes = 0
+            if self.state == "half_open":
+                if self._probes >= self.half_open_max_calls:
+                    return 1.0
+                self._probes += 1
+            return None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self.state == "half_open":
+                self._transition("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._transition("open")
+
+    def release_probe(self) -> None:
+        """시험 요청을 보내지 못했을 때 반열림 슬롯을 돌려줍니다."""
+        with self._lock:
+            if self.state == "half_open" and self._probes > 0:
+                self._probes -= 1
+
+
+class AIMDLimiter:
+    """AIMD(가산 증가, 곱셈 감소) 동시성 제한기"""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        slow_threshold: float = 2.0,
+        backoff_ratio: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.slow_threshold = slow_threshold
+        self.backoff_ratio = backoff_ratio
+        # 동시에 실패한 요청들이 한도를 연달아 깎지 않도록 감소 사이 최소 간격을 둡니다.
+        self.cooldown = cooldown
+        self.inflight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("upstream_concurrency_limit", math.floor(self.limit), group=self.name)
+        metrics.set_gauge("upstream_inflight", self.inflight, group=self.name)
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.inflight >= math.floor(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.inflight += 1
+            self._update_gauges()
+            return True
+
+    def release(self, latency: float, overloaded: bool) -> None:
+        with self._cond:
+            self.inflight -= 1
+            now = time.monotonic()
+            if overloaded or latency > self.slow_threshold:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._update_gauges()
+            self._cond.notify_all()
+
+
+class UpstreamGuard:
+    """엔드포인트 그룹별 서킷 브레이커 + AIMD 제한기"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        initial_concurrency: int = 10,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        slow_threshold: float = 2.0,
+        queue_timeout: float = 0.5,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.slow_threshold = slow_threshold
+        self.queue_timeout = queue_timeout
+        self._groups: Dict[str, Tuple[CircuitBreaker, AIMDLimiter]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "UpstreamGuard":
+        return cls(
+            failure_threshold=int(os.getenv("UPSTREAM_FAILURE_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("UPSTREAM_RESET_TIMEOUT", "30")),
+            initial_concurrency=int(os.getenv("UPSTREAM_INITIAL_CONCURRENCY", "10")),
+            min_concurrency=int(os.getenv("UPSTREAM_MIN_CONCURRENCY", "1")),
+            max_concurrency=int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "64")),
+            slow_threshold=float(os.getenv("UPSTREAM_SLOW_THRESHOLD", "2")),
+            queue_timeout=float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", "0.5")),
+        )
+
+    @staticmethod
+    def group_for(endpoint: str) -> str:
+        """/api/recipes/1/share → recipes"""
+        parts = [part for part in endpoint.split("?")[0].split("/") if part]
+        if parts and parts[0] == "api":
+            parts = parts[1:]
+        return parts[0] if parts else "root"
+
+    def group(self, name: str) -> Tuple[CircuitBreaker, AIMDLimiter]:
+        with self._lock:
+            if name not in self._groups:
+                self._groups[name] = (
+                    CircuitBreaker(name, self.failure_threshold, self.reset_timeout),
+                    AIMDLimiter(
+                        name,
+                        initial=self.initial_concurrency,
+                        min_limit=self.min_concurrency,
+                        max_limit=self.max_concurrency,
+                        slow_threshold=self.slow_threshold,
+                    ),
+                )
+            return self._groups[name]
+
+    def call(self, group: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        send() 로 요청을 보내고 결과를 서킷/제한기에 반영합니다.
+        타임아웃, 연결 오류, 5xx 응답을 실패로 봅니다. (4xx 는 호출자 책임이므로 성공으로 취급)
+        """
+        breaker, limiter = self.group(group)
+        retry_after = breaker.allow()
+        if retry_after is not None:
+            metrics.increment("upstream_rejected_total", group=group, reason="circuit_open")
+            raise UpstreamUnavailable(group, "circuit_open", retry_after)
+
+        queue_timeout = self.queue_timeout
+        deadline = current_deadline()
+        if deadline is not None:
+            queue_timeout = min(queue_timeout, deadline.remaining())
+        if not limiter.acquire(queue_timeout):
+            breaker.release_probe()
+            metrics.increment("upstream_rejected_total", group=group, reason="overloaded")
+            raise UpstreamUnavailable(group, "overloaded", 1.0)
+
+        started = time.perf_counter()
+        failed = False
+        try:
+            response = send()
+            failed = response.status_code >= 500
+            return response
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            # 요청 마감 시간 때문에 짧아진 타임아웃은 상대 서버 탓이 아니므로 실패로 세지 않습니다.
+            failed = deadline is None or not deadline.expired
+            raise
+        finally:
+            latency = time.perf_counter() - started
+            limiter.release(latency, overloaded=failed)
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            metrics.increment("upstream_requests_total", group=group, outcome="failure" if failed else "success")
+            metrics.observe("upstream_latency_seconds", latency, group=group)
+
+
+UPSTREAM_GUARD = UpstreamGuard.from_env()
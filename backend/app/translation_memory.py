@@ -0,0 +1,424 @@
+"""
+요리 용어 번역 메모리(한국어 ↔ 영어 ↔ 일본어)입니다.
+
+"음료수", "과일", "냉동식품" 같은 카테고리 이름, 재료 이름, 단위, 레시피 제목은 같은 번역을 계속 반복하므로
+확인된 번역을 용어 묶음({ko, en, ja})으로 저장해 두고
+- 짧은 글(용어) 번역은 LLM 호출 없이 바로 돌려주고,
+- 레시피 번역/생성 프롬프트에는 본문에 나오는 용어의 번역을 용어집으로 붙여 같은 용어를 항상 같게 번역합니다.
+
+조회
+- 정확히 일치: 저장된 원문과 같은 글
+- 정규화 일치: 유니코드 NFKC, 대소문자, 앞뒤 문장 부호/따옴표, 공백(한국어/일본어는 모든 공백) 차이를 무시
+용어 출처 (앞선 것이 우선하며, 이미 있는 번역은 덮어쓰지 않음)
+1. 기본 용어집 (SEED_GLOSSARY)                                        ─┐ 검증된 용어: 모든 사용자가 공유
+2. TRANSLATION_GLOSSARY_PATH YAML 파일의 용어 목록 (- {ko: 음료수, en: Beverages, ja: 飲み物}) ─┘
+3. 성공한 번역에서 수집한 용어: 수집한 사용자에게만 적용 (SQLite 파일에 저장되어 재시작 후에도 유지)
+   사용자가 설정된 채팅 도구(레시피 수정, 카테고리 추가/수정)의 번역만 수집합니다.
+   인증된 사용자가 없는 /api/recipe/* 엔드포인트와 작업은 공용 용어만 쓰고 수집하지 않습니다.
+   사용자 입력이나 LLM 출력이 다른 사용자의 번역을 바꾸지 않도록 공용 용어집으로 자동 승격하지 않습니다.
+   여러 사용자에게 쓸 용어는 검토 후 YAML 용어집에 추가합니다.
+   사용자별로 최근 용어 TRANSLATION_MEMORY_MAX_USER_TERMS 개만 보관하고(오래된 것부터 삭제),
+   메모리에는 최근 사용한 TRANSLATION_MEMORY_MAX_USERS 명의 용어만 올려 둡니다. (나머지는 필요할 때 SQLite 에서 불러옴)
+
+용어집 검색은 용어의 첫 두 글자(영어는 첫 단어) 색인으로 본문에 나오는 위치의 후보만 확인합니다.
+
+환경 변수
+- TRANSLATION_MEMORY_PATH: 수집한 용어를 저장할 SQLite 파일 (기본 translation_memory.sqlite3, 빈 값이면 메모리만 사용)
+- TRANSLATION_GLOSSARY_PATH: 추가 용어집 YAML 파일 (선택)
+- TRANSLATION_MEMORY_MAX_TERM_LENGTH: 용어로 수집할 최대 글자 수 (기본 40)
+- TRANSLATION_MEMORY_MAX_USER_TERMS: 사용자별 최대 수집 용어 수 (기본 500)
+- TRANSLATION_MEMORY_MAX_USERS: 메모리에 올려 두는 최대 사용자 수 (기본 1000)
+- TRANSLATION_GLOSSARY_MAX_TERMS: 프롬프트에 붙이는 최대 용어 수 (기본 30)
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ("ko", "en", "ja")
+
+# 기본 용어집: 냉장고 카테고리, 단위, 레시피 섹션 제목, 자주 쓰는 재료
+SEED_GLOSSARY: List[Dict[str, str]] = [
+    {"ko": "음료수", "en": "Beverages", "ja": "飲み物"},
+    {"ko": "과일", "en": "Fruits", "ja": "果物"},
+    {"ko": "채소", "en": "Vegetables", "ja": "野菜"},
+    {"ko": "냉동식품", "en": "Frozen Foods", "ja": "冷凍食品"},
+    {"ko": "육류", "en": "Meat", "ja": "肉類"},
+    {"ko": "해산물", "en": "Seafood", "ja": "魚介類"},
+    {"ko": "유제품", "en": "Dairy", "ja": "乳製品"},
+    {"ko": "조미료", "en": "Seasonings", "ja": "調味料"},
+    {"ko": "소스", "en": "Sauces", "ja": "ソース"},
+    {"ko": "반찬", "en": "Side Dishes", "ja": "おかず"},
+    {"ko": "곡물", "en": "Grains", "ja": "穀物"},
+    {"ko": "간식", "en": "Snacks", "ja": "お菓子"},
+    {"ko": "기타", "en": "Others", "ja": "その他"},
+    {"ko": "큰술", "en": "tbsp", "ja": "大さじ"},
+    {"ko": "작은술", "en": "tsp", "ja": "小さじ"},
+    {"ko": "컵", "en": "cup", "ja": "カップ"},
+    {"ko": "꼬집", "en": "pinch", "ja": "ひとつまみ"},
+    {"ko": "재료", "en": "Ingredients", "ja": "材料"},
+    {"ko": "조리 방법", "en": "Instructions", "ja": "作り方"},
+    {"ko": "조리 팁", "en": "Cooking Tips", "ja": "調理のコツ"},
+    {"ko": "김치", "en": "Kimchi", "ja": "キムチ"},
+    {"ko": "두부", "en": "Tofu", "ja": "豆腐"},
+    {"ko": "대파", "en": "Green Onion", "ja": "長ネギ"},
+    {"ko": "마늘", "en": "Garlic", "ja": "にんにく"},
+    {"ko": "양파", "en": "Onion", "ja": "玉ねぎ"},
+    {"ko": "간장", "en": "Soy Sauce", "ja": "醤油"},
+    {"ko": "고추장", "en": "Gochujang", "ja": "コチュジャン"},
+    {"ko": "고춧가루", "en": "Gochugaru", "ja": "粉唐辛子"},
+    {"ko": "된장", "en": "Doenjang", "ja": "テンジャン"},
+    {"ko": "참기름", "en": "Sesame Oil", "ja": "ごま油"},
+    {"ko": "설탕", "en": "Sugar", "ja": "砂糖"},
+    {"ko": "소금", "en": "Salt", "ja": "塩"},
+    {"ko": "계란", "en": "Egg", "ja": "卵"},
+    {"ko": "돼지고기", "en": "Pork", "ja": "豚肉"},
+    {"ko": "소고기", "en": "Beef", "ja": "牛肉"},
+    {"ko": "닭고기", "en": "Chicken", "ja": "鶏肉"},
+]
+
+_EDGE_CHARACTERS = " \t\"'`.,!?;:()[]{}<>「」『』【】。、・"
+_WORD_SEPARATOR = re.compile(r"[^\w]+")
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
+_KANA = re.compile(r"[぀-ヿ]")
+_KANJI = re.compile(r"[一-鿿]")
+_LATIN = re.compile(r"[A-Za-z]")
+
+
+def normalize_term(text: str, language: str) -> str:
+    """조회 키: NFKC + 대소문자 무시 + 앞뒤 문장 부호 제거 + 공백 정리 (한국어/일본어는 공백 제거)"""
+    text = unicodedata.normalize("NFKC", text).casefold().strip(_EDGE_CHARACTERS)
+    if language in ("ko", "ja"):
+        return "".join(text.split())
+    return " ".join(text.split())
+
+
+def _head(language: str, term: str) -> str:
+    """용어집 검색 색인 키: 영어는 첫 단어, 한국어/일본어는 첫 두 글자"""
+    return term.split(" ", 1)[0] if language == "en" else term[:2]
+
+
+def _haystacks(text: str) -> Dict[str, str]:
+    """용어집 검색 대상: 한국어/일본어는 공백을 없앤 글, 영어는 앞뒤에 공백을 붙인 단어 나열"""
+    return {
+        "ko": normalize_term(text, "ko"),
+        "ja": normalize_term(text, "ja"),
+        "en": " " + " ".join(_WORD_SEPARATOR.split(unicodedata.normalize("NFKC", text).casefold())) + " ",
+    }
+
+
+def detect_language(text: str) -> Optional[str]:
+    """문자 종류로 언어를 추정합니다. (한글 → ko, 가나/한자 → ja, 로마자 → en)"""
+    if _HANGUL.search(text):
+        return "ko"
+    if _KANA.search(text) or _KANJI.search(text):
+        return "ja"
+    if _LATIN.search(text):
+        return "en"
+    return None
+
+
+class TermIndex:
+    """
+    용어 묶음({언어: 용어}) 색인 (잠금은 TranslationMemory 가 담당)
+    - (언어, 정규화 용어) → 묶음 (같은 묶음 객체를 여러 키가 공유)
+    - (언어, 첫 두 글자/첫 단어) → 정규화 용어 목록 (용어집 검색용)
+    max_entries 를 넘으면 먼저 넣은 묶음부터 지웁니다.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self._terms: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._heads: Dict[Tuple[str, str], Set[str]] = {}
+        # 묶음 id → (묶음, 묶음을 가리키는 키 목록), 넣은 순서
+        self._entries: "OrderedDict[int, Tuple[Dict[str, str], List[Tuple[str, str]]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, language: str, term: str) -> Optional[Dict[str, str]]:
+        return self._terms.get((language, term))
+
+    def merge(self, entry: Dict[str, Optional[str]]) -> bool:
+        """용어 묶음을 합칩니다. 이미 있는 번역은 바꾸지 않고, 새로 알게 된 것이 있으면 True"""
+        terms = {
+            language: text.strip() for language, text in entry.items()
+            if language in LANGUAGES and isinstance(text, str) and normalize_term(text, language)
+        }
+        if len(terms) < 2:
+            return False
+        keys = {language: (language, normalize_term(text, language)) for language, text in terms.items()}
+        target = next((self._terms[key] for key in keys.values() if key in self._terms), None)
+        if target is None:
+            target = {}
+            self._entries[id(target)] = (target, [])
+        learned = False
+        for language, text in terms.items():
+            if language not in target:
+                target[language] = text
+                learned = True
+            key = keys[language]
+            if key not in self._terms:
+                # 다른 표기(띄어쓰기, 대소문자 등)도 같은 묶음을 가리키게 합니다.
+                self._terms[key] = target
+                self._entries[id(target)][1].append(key)
+                self._heads.setdefault((language, _head(*key)), set()).add(key[1])
+                learned = True
+        while self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._evict_oldest()
+        return learned
+
+    def _evict_oldest(self) -> None:
+        _, (_, keys) = self._entries.popitem(last=False)
+        for language, term in keys:
+            del self._terms[(language, term)]
+            head = (language, _head(language, term))
+            self._heads[head].discard(term)
+            if not self._heads[head]:
+                del self._heads[head]
+
+    def find(
+        self,
+        haystacks: Dict[str, str],
+        languages: Iterable[str],
+        target_languages: Tuple[str, ...],
+        found: Dict[int, Tuple[int, Dict[str, str]]],
+    ) -> None:
+        """haystacks 에 나오는 용어의 묶음을 found(묶음 id → (용어 길이, 묶음))에 더합니다."""
+        for language in languages:
+            haystack = haystacks.get(language)
+            if not haystack:
+                continue
+            # 본문의 단어(영어) 또는 두 글자 조각마다 그것으로 시작하는 용어만 확인합니다.
+            if language == "en":
+                heads = set(haystack.split())
+            else:
+                heads = {haystack[i:i + 2] for i in range(len(haystack) - 1)}
+            for head in heads:
+                for term in self._heads.get((language, head), ()):
+                    entry = self._terms[(language, term)]
+                    if id(entry) in found or len(term) < 2:
+                        continue
+                    if not any(target in entry and target != language for target in target_languages):
+                        continue
+                    needle = f" {term} " if language == "en" else term
+                    if needle in haystack:
+                        found[id(entry)] = (len(term), entry)
+
+
+class TranslationMemory:
+    """검증된 공용 용어 색인과 사용자별 수집 용어 색인 (스레드 안전)"""
+
+    def __init__(
+        self,
+        path: Optional[str] = "translation_memory.sqlite3",
+        glossary_path: Optional[str] = None,
+        max_term_length: int = 40,
+        max_glossary_terms: int = 30,
+        max_user_terms: int = 500,
+        max_users: int = 1000,
+        seed: Iterable[Dict[str, str]] = SEED_GLOSSARY,
+    ):
+        self.max_term_length = max_term_length
+        self.max_glossary_terms = max_glossary_terms
+        self.max_user_terms = max(1, max_user_terms)
+        self.max_users = max(1, max_users)
+        self._lock = threading.Lock()
+        self._global = TermIndex()
+        # 사용자 ID → 수집 용어 색인 (최근 사용 순, max_users 명까지)
+        self._users: "OrderedDict[str, TermIndex]" = OrderedDict()
+
+        for entry in seed:
+            self._global.merge(entry)
+        if glossary_path:
+            for entry in self._load_glossary(glossary_path):
+                self._global.merge(entry)
+
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_terms ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, ko TEXT, en TEXT, ja TEXT, "
+                "origin TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS user_terms_user ON user_terms (user_id, id)")
+            self._conn.commit()
+        metrics.set_gauge("translation_memory_entries", len(self._global), scope="global")
+
+    @classmethod
+    def from_env(cls) -> "TranslationMemory":
+        return cls(
+            path=os.getenv("TRANSLATION_MEMORY_PATH", "translation_memory.sqlite3") or None,
+            glossary_path=os.getenv("TRANSLATION_GLOSSARY_PATH") or None,
+            max_term_length=int(os.getenv("TRANSLATION_MEMORY_MAX_TERM_LENGTH", "40")),
+            max_glossary_terms=int(os.getenv("TRANSLATION_GLOSSARY_MAX_TERMS", "30")),
+            max_user_terms=int(os.getenv("TRANSLATION_MEMORY_MAX_USER_TERMS", "500")),
+            max_users=int(os.getenv("TRANSLATION_MEMORY_MAX_USERS", "1000")),
+        )
+
+    @staticmethod
+    def _load_glossary(path: str) -> List[Dict[str, str]]:
+        import yaml
+
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or []
+        if isinstance(data, dict):
+            data = data.get("terms") or []
+        return [entry for entry in data if isinstance(entry, dict)]
+
+    def _user_index(self, user_id: str) -> TermIndex:
+        """사용자의 수집 용어 색인 (메모리에 없으면 SQLite 에서 최근 용어를 불러옴, 잠금 안에서 호출)"""
+        index = self._users.get(user_id)
+        if index is not None:
+            self._users.move_to_end(user_id)
+            return index
+        index = TermIndex(self.max_user_terms)
+        if self._conn is not None:
+            rows = self._conn.execute(
+                "SELECT ko, en, ja FROM user_terms WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (user_id, self.max_user_terms),
+            ).fetchall()
+            # 저장 순서대로 다시 합쳐 재시작 전과 같은 색인을 만듭니다.
+            for ko, en, ja in reversed(rows):
+                index.merge({"ko": ko, "en": en, "ja": ja})
+        self._users[user_id] = index
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return index
+
+    def __len__(self) -> int:
+        """공용 용어 묶음 수"""
+        return len(self._global)
+
+    def lookup(
+        self,
+        text: str,
+        target_language: str,
+        source_language: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        저장된 번역을 찾습니다. 공용 용어를 먼저 보고, user_id 가 있으면 그 사용자가 수집한 용어를 봅니다.
+        (source_language 가 없으면 모든 언어에서 찾음)
+        """
+        languages = (source_language,) if source_language else LANGUAGES
+        with self._lock:
+            indexes = [self._global] + ([self._user_index(user_id)] if user_id else [])
+            for language in languages:
+                if language == target_language:
+                    continue
+                term = normalize_term(text, language)
+                for index in indexes:
+                    entry = index.get(language, term)
+                    translated = entry.get(target_language) if entry is not None else None
+                    if translated is not None:
+                        exact = entry.get(language) == text.strip()
+                        metrics.increment("translation_memory_lookups_total", result="exact" if exact else "normalized")
+                        return translated
+        metrics.increment("translation_memory_lookups_total", result="miss")
+        return None
+
+    def is_term(self, text: str) -> bool:
+        """용어로 저장할 만큼 짧은 한 줄 글인지"""
+        text = text.strip()
+        return bool(text) and "\n" not in text and len(text) <= self.max_term_length
+
+    def learn(self, entry: Dict[str, Optional[str]], user_id: Optional[str], origin: str = "harvest") -> bool:
+        """
+        성공한 번역에서 user_id 사용자의 용어 묶음을 수집합니다.
+        (사용자가 없거나 긴 글, 공용 용어와 같은 번역은 무시하고 새로 알게 된 것만 저장)
+        """
+        if not user_id:
+            return False
+        entry = {
+            language: text for language, text in entry.items()
+            if language in LANGUAGES and isinstance(text, str) and self.is_term(text)
+        }
+        with self._lock:
+            known = next(
+                (found for found in (
+                    self._global.get(language, normalize_term(text, language)) for language, text in entry.items()
+                ) if found is not None),
+                None,
+            )
+            if known is not None and all(known.get(language) is not None for language in entry):
+                return False
+            index = self._user_index(user_id)
+            if not index.merge(entry):
+                return False
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT INTO user_terms (user_id, ko, en, ja, origin, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (user_id, entry.get("ko"), entry.get("en"), entry.get("ja"), origin, time.time()),
+                )
+                # 사용자별 보관 한도를 넘은 오래된 용어를 지웁니다.
+                self._conn.execute(
+                    "DELETE FROM user_terms WHERE user_id = ? AND id NOT IN "
+                    "(SELECT id FROM user_terms WHERE user_id = ? ORDER BY id DESC LIMIT ?)",
+                    (user_id, user_id, self.max_user_terms),
+                )
+                self._conn.commit()
+            entries = sum(len(index) for index in self._users.values())
+        metrics.increment("translation_memory_learned_total", origin=origin)
+        metrics.set_gauge("translation_memory_entries", entries, scope="user")
+        return True
+
+    def glossary(
+        self,
+        text: str,
+        target_languages: Iterable[str],
+        source_language: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        text 에 나오는 용어(공용 + user_id 사용자의 수집 용어)의 묶음을 긴 용어부터 max_glossary_terms 개까지 반환합니다.
+        (영어는 단어 단위로, 한국어/일본어는 공백을 무시한 부분 문자열로 찾음)
+        """
+        target_languages = tuple(target_languages)
+        languages = (source_language,) if source_language else LANGUAGES
+        haystacks = _haystacks(text)
+        found: Dict[int, Tuple[int, Dict[str, str]]] = {}
+        with self._lock:
+            self._global.find(haystacks, languages, target_languages, found)
+            if user_id:
+                self._user_index(user_id).find(haystacks, languages, target_languages, found)
+            ranked = sorted(found.values(), key=lambda item: item[0], reverse=True)
+            return [dict(entry) for _, entry in ranked[:self.max_glossary_terms]]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> TranslationMemory:
+    """프로세스 전체에서 공유하는 번역 메모리 (처음 사용할 때 생성)"""
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory.from_env()
+        return _memory
+
+
+def close_translation_memory() -> None:
+    global _memory
+    with _memory_lock:
+        memory, _memory = _memory, None
+    if memory is not None:
+        memory.close()
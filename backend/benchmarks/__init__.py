@@ -0,0 +1,6 @@
+"""
+백엔드 성능 측정용 벤치마크 패키지입니다.
+
+OpenAI 호출과 Next.js API 없이 FastAPI 앱 자체의 오버헤드를 측정하기 위한
+가짜 LLM, 스텁 API 서버, 부하 테스트 스크립트를 제공합니다.
+"""
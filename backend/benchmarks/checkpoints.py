@@ -0,0 +1,109 @@
+"""
+체크포인트 저장소 크기 벤치마크
+
+가짜 LLM 과 Next.js 스텁으로 서브 어시스턴트를 오가는 대화를 여러 턴 실행한 뒤
+- 기본 MemorySaver
+- CompactingMemorySaver (메시지 공유 저장) 정리 전/후
+의 직렬화 바이트 수를 비교합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.checkpoints
+    python -m benchmarks.checkpoints --turns 40 --keep-last 5 --json checkpoints.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from . import fake_llm
+from .stub_next_api import StubNextApi
+
+# 냉장고 조회 / 레시피 검색 / 일반 질문을 번갈아 보냅니다.
+_MESSAGES = ["냉장고 목록 보여줘", "김치 레시피 찾아줘", "오늘 뭐 먹지?"]
+
+
+def saver_bytes(saver) -> int:
+    total = sum(len(c[1]) + len(m[1]) for thread in saver.storage.values() for ns in thread.values() for c, m, _ in ns.values())
+    total += sum(len(b[1]) for b in saver.blobs.values())
+    total += sum(len(w[2][1]) for ws in saver.writes.values() for w in ws.values())
+    store = getattr(getattr(saver, "serde", None), "messages", None)
+    if store is not None:
+        total += sum(len(m[1]) for m in store.values())
+    return total
+
+
+def run_turns(graph, turns: int, thread_id: str) -> None:
+    from app.conversation_runner import run_conversation
+
+    config = {"configurable": {"thread_id": thread_id, "user_id": "bench-user", "page": "home", "user_language": "ko"}}
+    for i in range(turns):
+        result = run_conversation(graph, _MESSAGES[i % len(_MESSAGES)], {}, config)
+        if result.get("type") == "error":
+            raise RuntimeError(result)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="체크포인트 저장소 크기 벤치마크")
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--keep-last", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    stub = StubNextApi().start()
+    os.environ["NEXT_API_URL"] = stub.url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ.setdefault("INTERNAL_API_KEY", "bench-key")
+    fake_llm.install()
+
+    import logging
+    logging.disable(logging.INFO)
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from app.checkpoints import CompactingMemorySaver
+    from app.graph_definition import build_graph
+
+    report: Dict[str, Any] = {"turns": args.turns, "threads": args.threads, "keep_last": args.keep_last}
+    try:
+        for name, saver in (("memory_saver", MemorySaver()), ("compacting", CompactingMemorySaver(args.keep_last))):
+            graph = build_graph().compile(checkpointer=saver)
+            started = time.perf_counter()
+            for t in range(args.threads):
+                run_turns(graph, args.turns, f"bench-{t}")
+            elapsed = time.perf_counter() - started
+            entry = {
+                "checkpoints": sum(len(ns) for thread in saver.storage.values() for ns in thread.values()),
+                "bytes": saver_bytes(saver),
+                "run_seconds": round(elapsed, 2),
+            }
+            if isinstance(saver, CompactingMemorySaver):
+                started = time.perf_counter()
+                reclaimed = saver.compact()
+                entry["compact_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                entry["reclaimed_bytes"] = reclaimed
+                entry["bytes_after_compaction"] = saver_bytes(saver)
+                entry["checkpoints_after_compaction"] = saver.stats()["checkpoints"]
+                entry["unique_messages"] = saver.stats()["messages"]
+                # 정리 후에도 대화를 이어갈 수 있어야 합니다.
+                run_turns(graph, 1, "bench-0")
+            report[name] = entry
+    finally:
+        stub.stop()
+
+    baseline = report["memory_saver"]["bytes"]
+    report["reduction"] = {
+        "dedup_only": round(1 - report["compacting"]["bytes"] / baseline, 3),
+        "after_compaction": round(1 - report["compacting"]["bytes_after_compaction"] / baseline, 3),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
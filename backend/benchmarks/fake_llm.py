@@ -0,0 +1,154 @@
+"""
+부하 테스트용 스크립트 기반 가짜 채팅 모델입니다.
+
+바인딩된 도구 이름으로 어떤 어시스턴트인지 판별하고, 마지막 메시지를 보고
+항상 같은 순서의 도구 호출을 생성합니다.
+예: ToRefrigeratorAssistant → get_refrigerators → CompleteOrEscalate → 최종 답변
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# 빈 출력 재시도 시 Assistant가 덧붙이는 메시지
+_NUDGE = "실제 출력으로 응답해주세요."
+
+_call_ids = itertools.count(1)
+_call_ids_lock = threading.Lock()
+
+
+def _next_call_id() -> str:
+    with _call_ids_lock:
+        return f"call_bench_{next(_call_ids):08d}"
+
+
+def _intent(text: str) -> str:
+    """사용자 메시지에서 시나리오 의도를 추출합니다."""
+    lowered = text.lower()
+    if "completeorescalate" in lowered:
+        return "cancel"
+    if "계획" in text or "plan" in lowered:
+        return "plan"
+    if "레시피" in text or "recipe" in lowered:
+        return "recipe"
+    if "만들" in text or "create" in lowered:
+        return "create"
+    if "냉장고" in text or "fridge" in lowered:
+        return "list"
+    return "qa"
+
+
+# 계획 승인 모드 시나리오: 냉장고 → 카테고리 2개 → 재료 3개 (일반 모드라면 승인 6번)
+_FRIDGE_SETUP_PLAN = {
+    "summary": "벤치 냉장고를 만들고 카테고리와 재료를 추가합니다",
+    "steps": [
+        {"id": "s1", "tool": "create_refrigerator", "args": {"name": "벤치 냉장고", "description": None}},
+        {"id": "s2", "tool": "add_refrigerator_multiple_categories",
+         "args": {"refrigerator_id": "$s1.id", "icon": None, "categories": ["과일", "음료"]}},
+        {"id": "s3", "tool": "add_ingredient",
+         "args": {"refrigerator_id": "$s1.id", "category_id": "$s2.id.과일", "data": {"name": "사과", "quantity": "3", "unit": "개"}}},
+        {"id": "s4", "tool": "add_ingredient",
+         "args": {"refrigerator_id": "$s1.id", "category_id": "$s2.id.과일", "data": {"name": "배", "quantity": "2", "unit": "개"}}},
+        {"id": "s5", "tool": "add_ingredient",
+         "args": {"refrigerator_id": "$s1.id", "category_id": "$s2.id.음료", "data": {"name": "우유", "quantity": "1", "unit": "l"}}},
+    ],
+}
+
+
+def _last_user_text(messages: Sequence[BaseMessage]) -> str:
+    for m in reversed(messages):
+        if isinstance(m, HumanMessage) and m.content != _NUDGE:
+            return m.content if isinstance(m.content, str) else str(m.content)
+    return ""
+
+
+class ScriptedChatModel(BaseChatModel):
+    """결정적인 도구 호출 시퀀스를 내보내는 가짜 채팅 모델"""
+
+    tool_names: List[str] = []
+    latency_s: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-bench"
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[str] = None, **kwargs: Any):
+        names = [convert_to_openai_tool(t)["function"]["name"] for t in tools]
+        return self.model_copy(update={"tool_names": names})
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        message = self._script(messages)
+        prompt_chars = sum(len(str(m.content)) for m in messages)
+        output_chars = len(str(message.content)) + sum(len(str(tc["args"])) for tc in message.tool_calls)
+        message.usage_metadata = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": output_chars // 4,
+            "total_tokens": (prompt_chars + output_chars) // 4,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _tool_call(self, name: str, args: dict) -> AIMessage:
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": args, "id": _next_call_id(), "type": "tool_call"}],
+        )
+
+    def _script(self, messages: List[BaseMessage]) -> AIMessage:
+        last = messages[-1] if messages else None
+        user_text = _last_user_text(messages)
+        intent = _intent(user_text)
+
+        # 1) 메인 어시스턴트
+        if "ToRefrigeratorAssistant" in self.tool_names:
+            if isinstance(last, HumanMessage):
+                if intent in ("list", "create", "plan"):
+                    return self._tool_call("ToRefrigeratorAssistant", {"request": user_text})
+                if intent == "recipe":
+                    return self._tool_call("ToRecipeAssistant", {"request": user_text})
+                return AIMessage(content=f"일반 답변입니다: {user_text}")
+            return AIMessage(content="요청하신 작업을 마쳤습니다.")
+
+        # 2) 서브 어시스턴트 (냉장고/레시피)
+        if isinstance(last, HumanMessage) and intent == "cancel":
+            return self._tool_call("CompleteOrEscalate", {"cancel": True, "reason": "사용자가 취소했습니다."})
+
+        entering = isinstance(last, ToolMessage) and str(last.content).startswith("The assistant is now")
+        if isinstance(last, HumanMessage) or entering:
+            if "get_refrigerators" in self.tool_names:
+                if intent == "plan" and "SubmitPlan" in self.tool_names:
+                    return self._tool_call("SubmitPlan", _FRIDGE_SETUP_PLAN)
+                if intent == "create":
+                    return self._tool_call("create_refrigerator", {"name": "벤치 냉장고", "description": None})
+                return self._tool_call("get_refrigerators", {})
+            if "get_recipe_with_keyword" in self.tool_names:
+                return self._tool_call("get_recipe_with_keyword", {"keyword": "김치", "language": "ko"})
+
+        # 도구 실행 결과를 받았으면 상위로 복귀
+        return self._tool_call("CompleteOrEscalate", {"cancel": False, "reason": "작업을 완료했습니다."})
+
+
+def install(latency_s: float = 0.0) -> None:
+    """
+    langchain_openai.ChatOpenAI를 가짜 모델로 교체합니다.
+    app 모듈을 임포트하기 전에 호출해야 합니다.
+    """
+    import langchain_openai
+
+    def fake_chat_openai(*args: Any, **kwargs: Any) -> ScriptedChatModel:
+        return ScriptedChatModel(latency_s=latency_s)
+
+    langchain_openai.ChatOpenAI = fake_chat_openai
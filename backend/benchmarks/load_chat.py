@@ -0,0 +1,205 @@
+"""
+/api/chat 오프라인 부하 테스트
+
+실제 FastAPI 앱을 가짜 LLM(fake_llm)과 Next.js 스텁 서버(stub_next_api)에 연결한 뒤
+여러 세션을 동시에 실행하고 처리량, 지연 시간(p50/p95/p99), 메모리 증가량을 보고합니다.
+OpenAI API 키나 데이터베이스가 필요하지 않습니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.load_chat --sessions 50 --concurrency 10 --turns 4
+    python -m benchmarks.load_chat --llm-latency-ms 200 --json bench_output.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from . import fake_llm
+from .stub_next_api import StubNextApi
+
+# 시나리오: (이름, [(메시지, 기대 응답 타입), ...])
+SCENARIOS: List[Tuple[str, List[Tuple[str, str]]]] = [
+    ("list", [("내 냉장고 목록 보여줘", "message")]),
+    ("create_approve", [("새 냉장고 만들어줘", "tool_approval"), ("y", "message")]),
+    ("qa", [("채소는 어떻게 보관하나요?", "message")]),
+    ("create_reject", [("새 냉장고 만들어줘", "tool_approval"), ("n", "message")]),
+    ("recipe", [("김치 레시피 찾아줘", "message")]),
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 방식 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def rss_bytes() -> int:
+    """현재 프로세스의 RSS(바이트)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoadResult:
+    """요청별 측정값 수집기"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: List[str] = []
+        self.requests = 0
+
+    def record(self, step: str, latency: float) -> None:
+        self.requests += 1
+        self.latencies[step].append(latency)
+        self.latencies["all"].append(latency)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            step: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2),
+            }
+            for step, values in sorted(self.latencies.items())
+        }
+
+
+async def run_session(
+    client: httpx.AsyncClient,
+    run_id: str,
+    session_index: int,
+    turns: int,
+    result: LoadResult,
+) -> None:
+    """하나의 thread_id로 여러 시나리오를 순서대로 실행합니다."""
+    thread_id = f"bench-{run_id}-{session_index}"
+    context = {"userId": f"bench-user-{session_index}", "page": "refrigerator", "userLanguage": "ko"}
+
+    for turn in range(turns):
+        name, steps = SCENARIOS[(session_index + turn) % len(SCENARIOS)]
+        for step_index, (message, expected) in enumerate(steps):
+            step = f"{name}[{step_index}]"
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/chat",
+                json={"message": message, "context": context, "thread_id": thread_id},
+            )
+            result.record(step, time.perf_counter() - started)
+
+            if response.status_code != 200:
+                result.errors.append(f"{thread_id} {step}: HTTP {response.status_code}")
+                return
+            body = response.json()
+            if body.get("type") != expected:
+                result.errors.append(f"{thread_id} {step}: expected {expected}, got {body.get('type')} ({body.get('message')})")
+                return
+
+
+async def run_load(app: Any, run_id: str, sessions: int, concurrency: int, turns: int) -> Tuple[LoadResult, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    result = LoadResult()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def bounded(index: int):
+            async with semaphore:
+                await run_session(client, run_id, index, turns, result)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(i) for i in range(sessions)))
+        elapsed = time.perf_counter() - started
+
+    return result, elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="/api/chat 오프라인 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=50, help="동시에 진행할 대화 세션 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="최대 동시 세션 수")
+    parser.add_argument("--turns", type=int, default=4, help="세션당 시나리오 수")
+    parser.add_argument("--warmup", type=int, default=5, help="측정 전 워밍업 세션 수")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="가짜 LLM 호출당 지연 시간")
+    parser.add_argument("--tracemalloc", action="store_true", help="파이썬 힙 증가량도 측정 (느려짐)")
+    parser.add_argument("--log-level", default="WARNING", help="앱 로그 레벨 (운영과 같게 하려면 INFO)")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    # 앱 임포트 전에 가짜 LLM과 스텁 서버를 연결해야 합니다.
+    stub = StubNextApi().start()
+    os.environ["NEXT_API_URL"] = stub.url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ.setdefault("INTERNAL_API_KEY", "bench-key")
+    fake_llm.install(latency_s=args.llm_latency_ms / 1000)
+
+    from app.main import app
+
+    logging.getLogger().setLevel(args.log_level)
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("app"):
+            logging.getLogger(name).setLevel(args.log_level)
+
+    try:
+        asyncio.run(run_load(app, "warmup", args.warmup, args.concurrency, args.turns))
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        rss_before = rss_bytes()
+        result, elapsed = asyncio.run(run_load(app, "run", args.sessions, args.concurrency, args.turns))
+        rss_after = rss_bytes()
+
+        report: Dict[str, Any] = {
+            "config": {
+                "sessions": args.sessions,
+                "concurrency": args.concurrency,
+                "turns": args.turns,
+                "llm_latency_ms": args.llm_latency_ms,
+            },
+            "requests": result.requests,
+            "errors": len(result.errors),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(result.requests / elapsed, 2) if elapsed else 0.0,
+            "latency": result.summary(),
+            "memory": {
+                "rss_before_mb": round(rss_before / 2**20, 2),
+                "rss_after_mb": round(rss_after / 2**20, 2),
+                "rss_growth_mb": round((rss_after - rss_before) / 2**20, 2),
+            },
+            "upstream_calls": dict(stub.calls),
+        }
+        if args.tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report["memory"]["heap_growth_mb"] = round(current / 2**20, 2)
+            report["memory"]["heap_peak_mb"] = round(peak / 2**20, 2)
+    finally:
+        stub.stop()
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    for error in result.errors[:10]:
+        print(f"[error] {error}", file=sys.stderr)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
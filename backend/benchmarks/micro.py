@@ -0,0 +1,212 @@
+"""
+요청마다 실행되는 핫 패스 마이크로 벤치마크
+
+대상:
+- conversation_runner._extract_responses (메시지 10/100/1000개 히스토리)
+- graph.helpers.update_dialog_stack
+- route_primary_assistant / route_assistant
+- recipes.markdown.parse_recipe_content (큰 마크다운)
+- main.ChatResponse 직렬화
+
+결과는 JSON으로 저장되며, 커밋된 기준값(baseline_micro.json)과 비교해
+허용 오차를 넘으면 실패 코드(1)로 종료합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.micro                      # 측정 후 기준값과 비교
+    python -m benchmarks.micro --json micro.json    # 결과 저장
+    python -m benchmarks.micro --update-baseline    # 기준값 갱신
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline_micro.json")
+
+
+def _synthetic_history(size: int) -> List[Any]:
+    """Human → AI(tool call) → Tool → AI 패턴을 반복하는 대화 히스토리"""
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+    messages: List[Any] = []
+    for i in range(size):
+        kind = i % 4
+        if kind == 0:
+            messages.append(HumanMessage(content=f"냉장고 {i} 보여줘"))
+        elif kind == 1:
+            messages.append(AIMessage(
+                content="",
+                tool_calls=[{"name": "get_refrigerators", "args": {"page": i}, "id": f"call_{i}"}],
+            ))
+        elif kind == 2:
+            messages.append(ToolMessage(
+                content=f"- 냉장고 {i} (ID: {i}, 멤버: 1명, 재료: {i}개)",
+                tool_call_id=f"call_{i - 1}",
+                name="get_refrigerators",
+            ))
+        else:
+            messages.append(AIMessage(content=f"냉장고 {i}개를 찾았습니다."))
+    return messages
+
+
+def _large_recipe_markdown(steps: int = 500) -> str:
+    lines = ["# 김치찌개", "집에서 만드는 얼큰한 김치찌개", "", "## 재료"]
+    lines += [f"- 재료 {i} {i * 10}g" for i in range(steps)]
+    lines += ["", "## 조리 방법"]
+    lines += [f"{i + 1}. {i + 1}번째 단계를 진행합니다. 중불에서 {i % 7 + 1}분간 끓입니다." for i in range(steps)]
+    lines += ["", "## 조리 팁"]
+    lines += [f"- 팁 {i}" for i in range(steps // 5)]
+    return "\n".join(lines)
+
+
+def build_cases() -> Dict[str, Tuple[Callable[[], Any], int]]:
+    """벤치마크 케이스: 이름 → (함수, 1회 측정당 반복 횟수)"""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+    from langchain_core.messages import AIMessage
+    from app.conversation_runner import _extract_responses
+    from app.graph import (
+        SUB_ASSISTANTS,
+        register_sub_assistants,
+        update_dialog_stack,
+        create_route_assistant,
+        create_route_primary_assistant,
+    )
+    from app.main import ChatResponse
+    from app.recipes.markdown import parse_recipe_content
+
+    register_sub_assistants()
+    route_primary_assistant = create_route_primary_assistant(SUB_ASSISTANTS)
+    refrigerator_config = next(c for c in SUB_ASSISTANTS if c.id == "refrigerator")
+    route_assistant = create_route_assistant(refrigerator_config)
+
+    cases: Dict[str, Tuple[Callable[[], Any], int]] = {}
+
+    for size in (10, 100, 1000):
+        event = {"messages": _synthetic_history(size), "dialog_state": ["refrigerator"]}
+        cases[f"extract_responses_{size}"] = (lambda ev=event: _extract_responses(ev), max(1, 2000 // size))
+
+    def dialog_stack():
+        stack: List[str] = []
+        for name in ("refrigerator", "recipe", "pop", "refrigerator", "pop", "pop", None):
+            stack = update_dialog_stack(stack, name)
+        return stack
+    cases["update_dialog_stack"] = (dialog_stack, 2000)
+
+    primary_state = {"messages": [AIMessage(
+        content="",
+        tool_calls=[{"name": "ToRefrigeratorAssistant", "args": {"request": "냉장고"}, "id": "call_p"}],
+    )]}
+    cases["route_primary_assistant"] = (lambda: route_primary_assistant(primary_state), 2000)
+
+    sub_state = {"messages": [AIMessage(
+        content="",
+        tool_calls=[{"name": "get_refrigerators", "args": {}, "id": "call_s"}],
+    )]}
+    cases["route_assistant"] = (lambda: route_assistant(sub_state), 2000)
+
+    markdown = _large_recipe_markdown()
+    cases["parse_recipe_content_large"] = (lambda: parse_recipe_content(markdown), 50)
+
+    payload = {
+        "type": "message",
+        "responses": [
+            {
+                "type": "thinking",
+                "content": f"도구 호출 준비 중: create_recipe\n인자: {json.dumps({'content': markdown[:2000]}, ensure_ascii=False, indent=2)}",
+                "current_state": "recipe",
+                "tool_info": {"name": "create_recipe", "args": {"content": markdown[:2000]}},
+            }
+            for _ in range(40)
+        ],
+        "complete": True,
+        "thread_id": "bench-thread",
+    }
+    cases["chat_response_serialization"] = (lambda: ChatResponse(**payload).model_dump_json(), 50)
+
+    return cases
+
+
+def measure(func: Callable[[], Any], loops: int, repeat: int) -> Dict[str, float]:
+    """repeat번 측정한 1회 실행 시간(µs)의 중앙값과 최솟값"""
+    func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops * 1e6)
+    return {"median_us": round(statistics.median(samples), 3), "min_us": round(min(samples), 3)}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준값 대비 허용 오차를 넘은 케이스 목록"""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        limit = base["median_us"] * (1 + tolerance)
+        if stats["median_us"] > limit:
+            regressions.append(
+                f"{name}: {stats['median_us']:.1f}µs > {base['median_us']:.1f}µs (+{tolerance:.0%} 허용)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="핫 패스 마이크로 벤치마크")
+    parser.add_argument("--repeat", type=int, default=7, help="케이스당 측정 횟수")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="기준값 대비 허용 증가율 (0.5 = +50%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 JSON 파일 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과로 기준값 파일을 덮어씀")
+    parser.add_argument("--only", help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    # 운영과 같은 로그 포맷팅 비용은 유지하되 출력은 막습니다.
+    logging.disable(logging.CRITICAL)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (func, loops) in build_cases().items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(func, loops, args.repeat)
+        print(f"{name:32s} {results[name]['median_us']:12.2f} µs")
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": results,
+    }
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준값 갱신: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"기준값 파일이 없습니다: {args.baseline}", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"[regression] {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+응답 직렬화/압축 벤치마크
+
+여러 단계의 도구 호출이 포함된 큰 채팅 턴(ChatResponse)을 기준으로
+- FastAPI 기본 경로 (response_model 재검증 + json.dumps) 와
+- FastJSONResponse + model_response (orjson, 재검증 생략)
+의 요청당 처리 시간을 ASGI 앱을 직접 호출해 비교하고,
+identity / gzip / br 인코딩별 전송 크기와 압축 시간을 측정합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --entries 80 --json serialization.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .micro import _large_recipe_markdown
+
+
+def build_payload(entries: int) -> Dict[str, Any]:
+    """도구 호출 준비/결과 메시지가 반복되는 큰 채팅 응답"""
+    markdown = _large_recipe_markdown(60)
+    responses: List[Dict[str, Any]] = []
+    for i in range(entries):
+        if i % 2 == 0:
+            args = {"content": markdown, "recipe_id": i}
+            responses.append({
+                "type": "thinking",
+                "content": f"도구 호출 준비 중: update_recipe\n인자: {json.dumps(args, ensure_ascii=False, indent=2)}",
+                "current_state": "recipe",
+                "tool_info": {"name": "update_recipe", "args": args},
+            })
+        else:
+            responses.append({"type": "message", "content": markdown, "current_state": "recipe"})
+    return {"type": "message", "responses": responses, "complete": True, "thread_id": "bench-thread"}
+
+
+def build_apps(payload: Dict[str, Any]):
+    from fastapi import FastAPI
+
+    from app.main import ChatResponse
+    from app.responses import FastJSONResponse, model_response
+
+    default_app = FastAPI()
+
+    @default_app.post("/api/chat", response_model=ChatResponse)
+    async def default_chat() -> ChatResponse:
+        return ChatResponse(**payload)
+
+    fast_app = FastAPI(default_response_class=FastJSONResponse)
+
+    @fast_app.post("/api/chat", response_model=ChatResponse)
+    async def fast_chat() -> ChatResponse:
+        return model_response(ChatResponse(**payload))
+
+    return {"default": default_app, "orjson": fast_app}
+
+
+async def call_asgi(app, headers: Optional[List] = None) -> bytes:
+    """ASGI 앱을 직접 호출하고 응답 본문을 반환합니다."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/chat",
+        "raw_path": b"/api/chat",
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers or [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return bytes(body)
+
+
+def measure(func, loops: int, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops * 1e6)
+    return {"median_us": round(statistics.median(samples), 1), "min_us": round(min(samples), 1)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="응답 직렬화/압축 벤치마크")
+    parser.add_argument("--entries", type=int, default=40, help="responses 항목 수")
+    parser.add_argument("--loops", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    from app.responses import CompressionMiddleware
+
+    payload = build_payload(args.entries)
+    apps = build_apps(payload)
+    loop = asyncio.new_event_loop()
+
+    report: Dict[str, Any] = {"entries": args.entries, "serialization": {}, "wire": {}}
+    bodies: Dict[str, bytes] = {}
+    for name, app in apps.items():
+        bodies[name] = loop.run_until_complete(call_asgi(app))
+        report["serialization"][name] = measure(
+            lambda app=app: loop.run_until_complete(call_asgi(app)), args.loops, args.repeat
+        )
+    assert json.loads(bodies["default"]) == json.loads(bodies["orjson"]), "직렬화 결과가 다릅니다"
+
+    default_us = report["serialization"]["default"]["median_us"]
+    fast_us = report["serialization"]["orjson"]["median_us"]
+    report["serialization"]["speedup"] = round(default_us / fast_us, 2) if fast_us else None
+
+    middleware = CompressionMiddleware(apps["orjson"], **CompressionMiddleware.options_from_env())
+    raw = bodies["orjson"]
+    report["wire"]["identity"] = {"bytes": len(raw)}
+    encodings = ["gzip"]
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        report["wire"]["br"] = "brotli 패키지 없음"
+    for encoding in encodings:
+        compressed = middleware.compress(encoding, raw)
+        timing = measure(lambda encoding=encoding: middleware.compress(encoding, raw), max(1, args.loops // 5), args.repeat)
+        report["wire"][encoding] = {
+            "bytes": len(compressed),
+            "ratio": round(len(compressed) / len(raw), 3),
+            "compress_median_us": timing["median_us"],
+        }
+        # 미들웨어를 거친 실제 응답도 같은 크기인지 확인
+        wire = loop.run_until_complete(call_asgi(middleware, [(b"accept-encoding", encoding.encode())]))
+        assert len(wire) == len(compressed), encoding
+    loop.close()
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+도구들이 호출하는 Next.js API의 인프로세스 스텁 서버입니다.
+
+실제 데이터베이스 없이 고정된 응답을 돌려주며, 엔드포인트별 호출 수를 기록합니다.
+"""
+
+import itertools
+import json
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+
+def _recipe(recipe_id: int) -> Dict[str, Any]:
+    return {
+        "id": recipe_id,
+        "type": "ai",
+        "isPublic": False,
+        "ownerId": "bench-user",
+        "translations": [
+            {
+                "language": "ko",
+                "title": f"김치찌개 {recipe_id}",
+                "description": "벤치마크용 레시피",
+                "content": "## 재료\n- 김치 200g\n- 돼지고기 100g\n\n## 조리 방법\n1. 볶는다\n2. 끓인다",
+            }
+        ],
+        "tags": [],
+    }
+
+
+class StubNextApi:
+    """Next.js API 스텁 서버"""
+
+    def __init__(self, refrigerator_count: int = 5, recipe_count: int = 20):
+        self.refrigerator_count = refrigerator_count
+        self.recipe_count = recipe_count
+        self.calls: Counter = Counter()
+        self._ids = itertools.count(1000)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.routes: List[Tuple[str, "re.Pattern[str]", Callable[..., Any]]] = [
+            ("GET", re.compile(r"^/api/refrigerators$"), self._list_refrigerators),
+            ("POST", re.compile(r"^/api/refrigerators$"), self._create_refrigerator),
+            ("GET", re.compile(r"^/api/refrigerators/(\d+)$"), self._refrigerator_details),
+            ("POST", re.compile(r"^/api/refrigerators/(\d+)/categories/batch$"), self._create_categories),
+            ("POST", re.compile(r"^/api/refrigerators/(\d+)/categories/(\d+)/ingredients$"), self._add_ingredient),
+            ("GET", re.compile(r"^/api/recipes$"), self._list_recipes),
+            ("GET", re.compile(r"^/api/recipes/(?:favorites|shared)$"), self._recipe_pages),
+            ("POST", re.compile(r"^/api/recipes/search$"), self._list_recipes),
+            ("POST", re.compile(r"^/api/recipes/shared/search$"), self._list_recipes),
+        ]
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    # --- 핸들러 ---
+    @staticmethod
+    def _page(items: List[Any], key: str, query: Dict[str, Any]) -> Any:
+        """limit 이 있으면 Next.js API 처럼 한 페이지와 다음 커서를 돌려줍니다."""
+        if "limit" not in query:
+            return items
+        limit, offset = int(query["limit"]), int(query.get("cursor", 0))
+        return {key: items[offset:offset + limit], "nextCursor": str(offset + limit) if offset + limit < len(items) else None}
+
+    def _list_refrigerators(self, body: Dict[str, Any]) -> Any:
+        return self._page(self._refrigerators(), "refrigerators", body)
+
+    def _refrigerators(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": i,
+                "name": f"냉장고 {i}",
+                "description": None,
+                "isOwner": True,
+                "role": "owner",
+                "memberCount": 1,
+                "ingredientCount": i * 3,
+                "createdAt": "2025-01-01T00:00:00.000Z",
+            }
+            for i in range(1, self.refrigerator_count + 1)
+        ]
+
+    def _create_refrigerator(self, body: Dict[str, Any]) -> Any:
+        return {"id": self._next_id(), "name": body.get("name", ""), "description": body.get("description")}
+
+    def _refrigerator_details(self, body: Dict[str, Any], refrigerator_id: str) -> Any:
+        return {
+            **self._refrigerators()[0],
+            "id": int(refrigerator_id),
+        }
+
+    def _create_categories(self, body: Dict[str, Any], refrigerator_id: str) -> Any:
+        created = []
+        for category in body.get("categories", []):
+            category_id = self._next_id()
+            created.append({
+                "id": self._next_id(),
+                "refrigeratorId": int(refrigerator_id),
+                "categoryId": category_id,
+                "category": {"id": category_id, "icon": category.get("icon"), "translations": category.get("translations", [])},
+            })
+        return created
+
+    def _add_ingredient(self, body: Dict[str, Any], refrigerator_id: str, category_id: str) -> Any:
+        return {"id": self._next_id(), "categoryId": int(category_id), **body}
+
+    def _list_recipes(self, body: Dict[str, Any]) -> Any:
+        return self._page([_recipe(i) for i in range(1, self.recipe_count + 1)], "recipes", body)
+
+    def _recipe_pages(self, body: Dict[str, Any]) -> Any:
+        page, limit = int(body.get("page", 1)), int(body.get("limit", 12))
+        offset = (page - 1) * limit
+        return {
+            "recipes": [_recipe(i) for i in range(offset + 1, min(offset + limit, self.recipe_count) + 1)],
+            "pagination": {"total": self.recipe_count, "pageSize": limit, "currentPage": page, "totalPages": -(-self.recipe_count // limit)},
+        }
+
+    # --- 서버 ---
+    def dispatch(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Any]:
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                with self._lock:
+                    self.calls[f"{method} {pattern.pattern}"] += 1
+                return 200, handler(body, *match.groups())
+        with self._lock:
+            self.calls[f"{method} <unmatched>"] += 1
+        return 200, {}
+
+    def start(self) -> "StubNextApi":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else {}
+                path, _, query = self.path.partition("?")
+                if self.command == "GET":
+                    # GET 은 본문이 없으므로 쿼리 파라미터를 핸들러에 넘깁니다.
+                    body = {k: v[0] for k, v in parse_qs(query).items()}
+                status, payload = stub.dispatch(self.command, path, body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
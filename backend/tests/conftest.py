@@ -0,0 +1,16 @@
+"""
+백엔드 테스트 공통 설정
+
+app 패키지는 가져올 때 환경 변수로 LLM 클라이언트와 저장소를 만들므로,
+네트워크와 파일을 쓰지 않는 값으로 먼저 설정합니다.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("INTERNAL_API_KEY", "test")
+os.environ.setdefault("TRANSLATION_MEMORY_PATH", "")
+os.environ.setdefault("EMBEDDER", "hashing")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
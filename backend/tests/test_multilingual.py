@@ -0,0 +1,46 @@
+import json
+
+from langchain_core.messages import AIMessage
+
+from app.recipes.multilingual import generate_multilingual_recipe
+
+TRANSLATIONS = [
+    {"language": "ko", "title": "김치찌개", "description": "", "content": "## 재료\n- 김치"},
+    {"language": "en", "title": "Kimchi Stew", "description": "", "content": "## Ingredients\n- Kimchi"},
+    {"language": "ja", "title": "キムチチゲ", "description": "", "content": "## 材料\n- キムチ"},
+]
+
+
+class FakeLLM:
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = 0
+
+    def bind(self, **kwargs):
+        return self
+
+    def invoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=self.content)
+
+
+def test_structured_reply_without_tags_falls_back_to_tagging_llm(monkeypatch):
+    monkeypatch.setattr("app.recipes.multilingual.MULTILINGUAL_STRUCTURED_OUTPUT", True)
+    llm = FakeLLM(json.dumps({"translations": TRANSLATIONS}))
+    tagging_llm = FakeLLM("김치, 찌개")
+
+    recipe = generate_multilingual_recipe(llm, tagging_llm, "김치찌개 만드는 법")
+
+    assert recipe["tags"] == ["김치", "찌개"]
+    assert tagging_llm.calls == 1
+
+
+def test_structured_reply_with_tags_skips_tagging_llm(monkeypatch):
+    monkeypatch.setattr("app.recipes.multilingual.MULTILINGUAL_STRUCTURED_OUTPUT", True)
+    llm = FakeLLM(json.dumps({"translations": TRANSLATIONS, "tags": ["한식"]}))
+    tagging_llm = FakeLLM("김치, 찌개")
+
+    recipe = generate_multilingual_recipe(llm, tagging_llm, "김치찌개 만드는 법")
+
+    assert recipe["tags"] == ["한식"]
+    assert tagging_llm.calls == 0
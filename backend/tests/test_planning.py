@@ -0,0 +1,71 @@
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+
+from app.graph.planning import PlanExecutor, extract_ids, resolve_args
+
+shared = []
+
+
+@tool
+def create_recipe(title: str, config: RunnableConfig) -> str:
+    """레시피를 생성합니다."""
+    # 실제 도구처럼 API 응답 dict 를 str() 로 돌려줍니다.
+    return str({"id": 12, "translations": [{"language": "ko", "title": title}], "tags": []})
+
+
+@tool
+def share_recipe(recipe_id: int, target_user_id: str, config: RunnableConfig) -> str:
+    """레시피를 공유합니다."""
+    shared.append(recipe_id)
+    return str({"recipeId": recipe_id, "targetUserId": target_user_id})
+
+
+@tool
+def add_categories(names: str, config: RunnableConfig) -> str:
+    """카테고리를 추가합니다."""
+    return "다음 카테고리들이 성공적으로 추가되었습니다: " + ", ".join(
+        f"{name} (ID: {i})" for i, name in enumerate(names.split(","), start=3)
+    )
+
+
+@tool
+def add_ingredient(category_id: int, name: str, config: RunnableConfig) -> str:
+    """재료를 추가합니다."""
+    return f"재료 '{name}'이(가) 카테고리 {category_id}에 추가되었습니다."
+
+
+def test_extract_ids_from_recipe_dict():
+    ids, named = extract_ids("{'id': 12, 'translations': [{'language': 'ko', 'title': '김치찌개'}]}")
+    assert ids == ["12"]
+    assert named == {"김치찌개": "12"}
+
+
+def test_extract_ids_keeps_multi_word_names():
+    _, named = extract_ids("- Green Apple (ID: 3)\n- Red Bean Paste (ID: 4)")
+    assert named == {"Green Apple": "3", "Red Bean Paste": "4"}
+    _, named = extract_ids("냉장고 '우리집'가 생성되었습니다. (ID: 5)")
+    assert named == {"우리집": "5"}
+    assert resolve_args({"category_id": "$s1.id.Green Apple"}, {"s1": (["3"], {"Green Apple": "3"})}) == {"category_id": 3}
+
+
+def test_create_then_share_recipe_plan():
+    shared.clear()
+    executor = PlanExecutor([create_recipe, share_recipe], name="recipe")
+    plan = {"steps": [
+        {"id": "s1", "tool": "create_recipe", "args": {"title": "김치찌개"}},
+        {"id": "s2", "tool": "share_recipe", "args": {"recipe_id": "$s1.id", "target_user_id": "7"}},
+    ]}
+    results = executor.execute(plan, {"configurable": {}})
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert shared == [12]
+
+
+def test_multi_word_category_plan():
+    executor = PlanExecutor([add_categories, add_ingredient], name="refrigerator")
+    plan = {"steps": [
+        {"id": "s1", "tool": "add_categories", "args": {"names": "과일,Green Apple"}},
+        {"id": "s2", "tool": "add_ingredient", "args": {"category_id": "$s1.id.Green Apple", "name": "사과"}},
+    ]}
+    results = executor.execute(plan, {"configurable": {}})
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert "카테고리 4" in results[1]["result"]
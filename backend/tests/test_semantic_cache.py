@@ -0,0 +1,54 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.embeddings import HashingEmbedder
+from app.graph.models import Assistant, EmptyOutputRetryPolicy
+from app.graph.semantic_cache import SemanticCache, SemanticCacheNode
+
+CONFIG = {"configurable": {"user_language": "ko", "user_id": "1"}}
+
+
+class ScriptedRunnable:
+    """정해 둔 응답을 차례로 돌려주는 LLM 대역"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def invoke(self, state):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def _node(runnable):
+    assistant = Assistant(runnable, retry_policy=EmptyOutputRetryPolicy(max_attempts=2, base_delay=0))
+    cache = SemanticCache(HashingEmbedder(dimensions=64), threshold=0.9)
+    return SemanticCacheNode(assistant, cache), cache
+
+
+def _ask(node, question="김치찌개 만드는 법 알려줘"):
+    return node({"messages": [HumanMessage(content=question)]}, CONFIG)["messages"]
+
+
+def test_fallback_answer_is_not_cached():
+    runnable = ScriptedRunnable(AIMessage(content=""), AIMessage(content=""), AIMessage(content="물을 끓이세요."))
+    node, cache = _node(runnable)
+
+    fallback = _ask(node)
+    assert fallback.response_metadata.get("fallback") is True
+    assert runnable.calls == 2
+
+    # 같은 질문은 캐시된 대체 응답이 아니라 다시 LLM 으로 답합니다.
+    answer = _ask(node)
+    assert answer.content == "물을 끓이세요."
+    assert runnable.calls == 3
+
+
+def test_real_answer_is_cached():
+    runnable = ScriptedRunnable(AIMessage(content="물을 끓이세요."))
+    node, cache = _node(runnable)
+
+    _ask(node)
+    cached = _ask(node)
+    assert cached.content == "물을 끓이세요."
+    assert "semantic_cache" in cached.response_metadata
+    assert runnable.calls == 1
@@ -0,0 +1,36 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.llm.tokens import TokenBudget
+
+
+def _history(tool_output: str):
+    return [
+        HumanMessage(content="냉장고 보여줘"),
+        AIMessage(content="", tool_calls=[{"name": "get_refrigerators", "args": {}, "id": "call-1"}]),
+        ToolMessage(content=tool_output, tool_call_id="call-1"),
+        HumanMessage(content="첫 번째 냉장고 상태는?"),
+    ]
+
+
+def test_fit_history_keeps_long_tool_output_under_budget():
+    budget = TokenBudget(max_tool_output_tokens=10)
+    messages = _history("냉장고 " * 200)
+
+    fitted, stats = budget.fit_history(messages, max_tokens=100_000)
+
+    assert fitted == messages
+    assert stats["truncated_tool_outputs"] == 0
+    assert stats["dropped_messages"] == 0
+
+
+def test_fit_history_truncates_tool_output_when_over_budget():
+    budget = TokenBudget(max_tool_output_tokens=10)
+    messages = _history("냉장고 " * 200)
+    _, full = budget.fit_history(messages, max_tokens=100_000)
+
+    fitted, stats = budget.fit_history(messages, max_tokens=full["tokens"] - 1)
+
+    assert stats["truncated_tool_outputs"] == 1
+    assert stats["dropped_messages"] == 0
+    assert stats["tokens"] < full["tokens"]
+    assert len(fitted[2].content) < len(messages[2].content)